@@ -1,7 +1,7 @@
 # app/api/__init__.py
 from fastapi import APIRouter
 
-from app.api import breakdown, auth, users, briefings, feedback
+from app.api import breakdown, auth, users, briefings, feedback, media
 
 api_router = APIRouter()
 api_router.include_router(breakdown.router, prefix="/breakdown", tags=["breakdown"])
@@ -9,9 +9,4 @@ api_router.include_router(auth.router, prefix="/auth", tags=["auth"])
 api_router.include_router(users.router, prefix="/users", tags=["users"])
 api_router.include_router(briefings.router, prefix="/briefings", tags=["briefings"])
 api_router.include_router(feedback.router, prefix="/feedback", tags=["feedback"])
-
-
-
-
-
-
+api_router.include_router(media.router, prefix="/media", tags=["media"])
@@ -10,7 +10,12 @@ from sqlmodel import select
 from datetime import timedelta
 
 from app.core.db import get_db
-from app.core.security import hash_password, verify_password, create_access_token
+from app.core.security import (
+    PasswordHasherBusy,
+    create_access_token,
+    hash_password_async,
+    verify_and_update_password,
+)
 from app.models.user import User
 from app.core.config import settings
 
@@ -42,6 +47,14 @@ class SignupResponse(BaseModel):
 # ----- Routes -----
 
 
+def _auth_busy() -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+        detail="Too many sign-in attempts right now. Please try again in a moment.",
+        headers={"Retry-After": "2"},
+    )
+
+
 @router.post("/signup", response_model=SignupResponse, status_code=201)
 async def signup(payload: SignupRequest, db: AsyncSession = Depends(get_db)):
     # Check if user exists
@@ -51,9 +64,14 @@ async def signup(payload: SignupRequest, db: AsyncSession = Depends(get_db)):
     if existing:
         raise HTTPException(status_code=400, detail="Email already registered")
 
+    try:
+        hashed_password = await hash_password_async(payload.password)
+    except PasswordHasherBusy:
+        raise _auth_busy()
+
     user = User(
         email=payload.email,
-        hashed_password=hash_password(payload.password),
+        hashed_password=hashed_password,
     )
     db.add(user)
     await db.commit()
@@ -73,12 +91,25 @@ async def login(
     result = await db.execute(stmt)
     user: User | None = result.scalar_one_or_none()
 
-    if not user or not verify_password(form_data.password, user.hashed_password):
+    verified, new_hash = False, None
+    if user and user.hashed_password:
+        try:
+            verified, new_hash = await verify_and_update_password(form_data.password, user.hashed_password)
+        except PasswordHasherBusy:
+            raise _auth_busy()
+
+    if not verified:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Incorrect email or password",
             headers={"WWW-Authenticate": "Bearer"},
         )
 
+    if new_hash is not None:
+        # Stored hash used an old BCRYPT_ROUNDS; upgrade it transparently
+        user.hashed_password = new_hash
+        db.add(user)
+        await db.commit()
+
     token = create_access_token(subject=str(user.id), expires_delta=timedelta(hours=settings.ACCESS_TOKEN_EXPIRE))
     return TokenResponse(access_token=token)
@@ -1,47 +1,76 @@
 # app/api/breakdown.py
 from __future__ import annotations
 
-from fastapi import APIRouter, Depends, HTTPException
-from elevenlabs.core.api_error import ApiError as ElevenLabsApiError
+import asyncio
+import json
+import logging
+import uuid
+from dataclasses import dataclass
+
+from fastapi import APIRouter, Depends, HTTPException, Request
+from fastapi.responses import StreamingResponse
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, func
 from datetime import datetime
 
-from app.core.db import get_db
+from app.core.db import get_db, async_session_factory
+from app.core.metrics import register_stats
+from app.core.singleflight import SingleFlight
 
 from app.models.user import User
 from app.schemas.intent import IntentRequest, Intent
 from app.models.news_article import Article
 from app.models.persona import PERSONAS
 from app.models.audio_briefing import AudioBriefing
+from app.models.audio_job import AudioJob
 
-FREE_BRIEFING_LIMIT = 3  # applies only to audio briefings; summaries are always free
-
-from app.services.intent_service import build_intent_and_log
+from app.services.intent_service import log_search_history
 from app.services.intent_creator import create_intent_from_query
 from app.services.news_service import fetch_articles_for_intent
-from app.services.briefing_service import build_brief_intro, build_narration_text
-from app.services.voice_service import synthesize_briefing_to_bytes, make_briefing_filename
-from app.services.storage_service import upload_audio_and_get_signed_url
-
+from app.services.briefing_service import build_brief_intro, build_narration_text, stream_narration_text
+from app.services.storage_service import get_audio_signed_url
+from app.services.audio_cache import audio_blob_name, find_cached_audio
+from app.services.audio_stream import start_live_audio
+from app.services.audio_jobs import enqueue_audio_job, start_live_audio_job
+from app.services.quota_service import (
+    AUDIO_BRIEFINGS, Quota, QuotaExceeded, QuotaReservation,
+    consume_quota, release_quota, reserve_quota,
+)
+from app.services.pipeline import PipelineStats, Stage, run_pipeline
+from app.services.dedup import collapse_near_duplicates
+from app.services.ranking import rank_articles
+
+from app.api.briefings import audio_stream_url
 from app.api.deps import get_current_user
 
 
 router = APIRouter()
-
-
-def select_top_articles(articles: list[Article], max_count: int = 10) -> list[Article]:
-    sorted_by_time = sorted(
-        articles,
-        key=lambda a: a.published_at,
-        reverse=True,
-    )
+logger = logging.getLogger(__name__)
+
+
+def select_top_articles(
+    articles: list[Article],
+    intent: Intent | None = None,
+    max_count: int = 10,
+) -> list[Article]:
+    # Syndicated copies of one story carry different URLs, so exact-URL
+    # dedup below doesn't catch them
+    unique_stories = collapse_near_duplicates(articles)
+
+    # Most relevant to the intent first; plain recency without one
+    if intent is not None:
+        ranked = rank_articles(unique_stories, intent)
+    else:
+        ranked = sorted(
+            unique_stories,
+            key=lambda a: a.published_at,
+            reverse=True,
+        )
 
     seen_urls = set()
     seen_sources: dict[str, int] = {}
     selected: list[Article] = []
 
-    for art in sorted_by_time:
+    for art in ranked:
         if art.url in seen_urls:
             continue
         seen_urls.add(art.url)
@@ -64,109 +93,390 @@ def select_top_articles(articles: list[Article], max_count: int = 10) -> list[Ar
     return selected
 
 
+def _quota_message(quota: Quota) -> str:
+    if quota.period == "day":
+        used_up = f"You've reached today's limit of {quota.limit} audio briefings."
+    elif quota.period == "month":
+        used_up = f"You've reached this month's limit of {quota.limit} audio briefings."
+    else:
+        used_up = f"You've used all {quota.limit} free audio briefings."
+    return f"{used_up} Switch to 'Summary' mode to keep reading for free."
+
+
+async def _reserve_audio_quota(user: User, output_mode: str) -> QuotaReservation | None:
+    """
+    Hold one audio credit for this request (summary-only briefings are
+    always free). Consume it when saving the briefing; release it if the
+    request fails.
+    """
+    if output_mode not in ("audio", "both"):
+        return None
+    try:
+        return await reserve_quota(user.id, AUDIO_BRIEFINGS)
+    except QuotaExceeded as e:
+        raise HTTPException(status_code=403, detail=_quota_message(e.quota))
+
+
+@dataclass
+class AudioPlan:
+    # None (no audio), "done" (identical clip already stored),
+    # "streaming" (rendered live) or "queued" (rendered by a worker)
+    status: str | None
+    # Only set for a stored clip: what the briefing row may record
+    audio_url: str | None = None
+    filename: str | None = None
+    # Live stream for this request's response; never persisted
+    stream_url: str | None = None
+
+
+async def _plan_audio(
+    request: Request,
+    briefing_id: uuid.UUID,
+    full_script: str,
+    persona_cfg,
+    wants_audio: bool,
+    stream_audio: bool,
+) -> AudioPlan:
+    """
+    Audio is rendered outside the request: live (stream_audio) or by an
+    audio worker (python -m app.worker) picking up a queued job.
+    """
+    if not wants_audio:
+        return AudioPlan(None)
+    if not stream_audio:
+        # The worker checks the audio cache itself
+        return AudioPlan("queued")
+
+    voice_id = persona_cfg.elevenlabs_voice_id
+    cached = await find_cached_audio(full_script, voice_id)
+    if cached is not None:
+        return AudioPlan("done", get_audio_signed_url(cached), cached)
+    # The blob name is recorded on the briefing by the producer once the
+    # upload has finished, never before
+    return AudioPlan("streaming", stream_url=audio_stream_url(request, briefing_id))
+
+
+def _add_audio_job(db: AsyncSession, briefing_id: uuid.UUID, status: str | None) -> AudioJob | None:
+    """
+    The job that tracks the briefing's audio until it is stored. A live
+    render's job starts out running, so other processes report it as
+    pending and a worker takes over if this one dies.
+    """
+    if status == "queued":
+        return enqueue_audio_job(db, briefing_id)
+    if status == "streaming":
+        return start_live_audio_job(db, briefing_id)
+    return None
+
+
+def _briefing_response(
+    audio_briefing: AudioBriefing,
+    persona_cfg,
+    wants_audio: bool,
+    *,
+    audio_status: str | None = None,
+    audio_job: AudioJob | None = None,
+    stream_url: str | None = None,
+) -> dict:
+    return {
+        "id": str(audio_briefing.id),
+        "query": audio_briefing.query,
+        "persona": audio_briefing.persona,
+        "persona_name": persona_cfg.display_name,
+        "output_mode": audio_briefing.output_mode,
+        "script": audio_briefing.script,
+        "city": audio_briefing.city,
+        "country": audio_briefing.country,
+        "audio_url": stream_url or audio_briefing.audio_url,
+        "audio_filename": audio_briefing.audio_filename,
+        "created_at": audio_briefing.created_at.isoformat() + "Z",
+        "has_audio": wants_audio,
+        # "streaming": audio_url plays while TTS runs; "queued": poll
+        # GET /briefings/{id} until the job is done and audio_url is set
+        "audio_status": audio_status,
+        "audio_job_id": str(audio_job.id) if audio_job is not None else None,
+    }
+
+
+# Scripts being generated right now, by _script_key
+_script_flight: SingleFlight[tuple, str] = SingleFlight()
+_intro_flight: SingleFlight[tuple, str] = SingleFlight()
+register_stats("script_flight", _script_flight.stats)
+register_stats("intro_flight", _intro_flight.stats)
+
+
+def _script_key(intent: Intent, persona: str, output_mode: str) -> tuple:
+    """
+    What a generated script depends on: the parsed intent (not the exact
+    wording, so "What's new in Lagos?" and "lagos news" match), persona
+    and output mode.
+    """
+    return (
+        intent.intent_label,
+        intent.focus,
+        (intent.city or "").casefold(),
+        (intent.country_code or intent.country or "").casefold(),
+        intent.timeframe,
+        (intent.topic or "").casefold(),
+        tuple(t.casefold() for t in intent.tags or []),
+        persona,
+        output_mode,
+    )
+
+
+# Stage latencies of the non-streaming narration pipeline
+_pipeline_stats = PipelineStats()
+register_stats("narration_pipeline", _pipeline_stats.stats)
+
+
+async def _generate_script(intent: Intent, persona_cfg) -> str:
+    """Intro + narration for an intent; the intro is written while news is fetched."""
+
+    # ---- Pipeline stages (each runs as soon as its deps are done) ----
+
+    async def news_stage():
+        # fetch_articles_for_intent normalizes intent.timeframe in place,
+        # so hand it a copy while the other stages read the original
+        return await fetch_articles_for_intent(intent.model_copy())
+
+    async def intro_stage() -> str:
+        return await build_brief_intro(intent, persona_cfg)
+
+    async def narration_stage(news) -> str:
+        top_articles = select_top_articles(news.articles, intent)
+        return await build_narration_text(intent, top_articles, persona_cfg)
+
+    run = await run_pipeline([
+        Stage("news", news_stage),
+        Stage("intro", intro_stage),
+        Stage("narration", narration_stage, deps=("news",)),
+    ], stats=_pipeline_stats)
+    logger.debug("Narration pipeline: total=%sms stages=%s", run.total_ms, run.timings)
+
+    return f"{run.results['intro'].strip()}\n\n{run.results['narration'].strip()}"
+
+
+def _validated_query(payload: IntentRequest) -> str:
+    query = payload.query.strip()
+    if not query:
+        raise HTTPException(status_code=400, detail="Query cannot be empty")
+    return query
+
+
 @router.post("/narration")
 async def intent_to_voice(
     payload: IntentRequest,
+    request: Request,
     db: AsyncSession = Depends(get_db),
     current_user: User = Depends(get_current_user),
 ):
     
-    print("THIS IS THE CURRENT USER:", current_user)
-    query = payload.query.strip()
-    if not query:
-        raise HTTPException(status_code=400, detail="Query cannot be empty")
+    logger.debug("Narration requested by user %s", current_user.id)
+    query = _validated_query(payload)
 
-    # Enforce free audio limit — summary-only briefings are always free
     output_mode = payload.output_mode
-    if output_mode in ("audio", "both"):
-        count_result = await db.execute(
-            select(func.count()).select_from(AudioBriefing).where(
-                AudioBriefing.user_id == current_user.id,
-                AudioBriefing.output_mode.in_(["audio", "both"]),
-            )
+    reservation = await _reserve_audio_quota(current_user, output_mode)
+
+    try:
+        user_id = str(current_user.id)
+        persona_cfg = PERSONAS[payload.persona]
+        wants_audio = output_mode in ("audio", "both")
+        stream_audio = wants_audio and payload.stream_audio
+        briefing_id = uuid.uuid4()
+
+        intent = await create_intent_from_query(query)
+        logger.info("Intent: %s", intent)
+
+        # Duplicates in flight (same intent, persona and mode) share one
+        # script; each still gets its own briefing row below
+        full_script = await _script_flight.do(
+            _script_key(intent, payload.persona, output_mode),
+            lambda: _generate_script(intent, persona_cfg),
+        )
+        audio = await _plan_audio(request, briefing_id, full_script, persona_cfg, wants_audio, stream_audio)
+
+        # All of the request's writes go out in one transaction at the end,
+        # so no connection sits idle in a transaction during the LLM stages
+        search_history_id = await log_search_history(db=db, intent=intent, user_id=user_id)
+        audio_briefing = AudioBriefing(
+            id=briefing_id,
+            query=query,
+            user_id=current_user.id,
+            persona=payload.persona,
+            output_mode=output_mode,
+            city=intent.city,
+            country=intent.country,
+            audio_url=audio.audio_url,
+            audio_filename=audio.filename,
+            script=full_script,
+            search_history_id=search_history_id
         )
-        audio_count = count_result.scalar() or 0
-        if audio_count >= FREE_BRIEFING_LIMIT:
-            raise HTTPException(
-                status_code=403,
-                detail=f"You've used all {FREE_BRIEFING_LIMIT} free audio briefings. Switch to 'Summary' mode to keep reading for free.",
-            )
 
-    user_id = str(current_user.id)
+        db.add(audio_briefing)
+        # The models have no relationship()s, so the unit of work won't
+        # order INSERTs by foreign key: write the briefing before its job
+        await db.flush()
+        audio_job = _add_audio_job(db, briefing_id, audio.status)
+        if reservation is not None:
+            await consume_quota(db, reservation)
+        await db.commit()
+
+        if audio.status == "streaming":
+            voice_id = persona_cfg.elevenlabs_voice_id
+            start_live_audio(
+                briefing_id, full_script, voice_id, audio_blob_name(full_script, voice_id)
+            )
 
-    intent, search_history_id = await build_intent_and_log(
-        db=db,
-        raw_query=query,
-        user_id=user_id,
-        create_intent_from_query=create_intent_from_query,
-    )
+        return _briefing_response(
+            audio_briefing, persona_cfg, wants_audio,
+            audio_status=audio.status,
+            audio_job=audio_job,
+            stream_url=audio.stream_url,
+        )
+    finally:
+        if reservation is not None:
+            # No-op once consumed along with the saved briefing
+            await release_quota(reservation)
 
-    news_response = await fetch_articles_for_intent(intent)
 
-    top_articles = select_top_articles(news_response.articles)
-    
-    print(top_articles)
-    print(payload.persona)
-    persona_cfg = PERSONAS[payload.persona]
+def _sse(event: str, data) -> str:
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n"
 
-    intro = build_brief_intro(intent, persona_cfg)
-    narration = build_narration_text(intent, top_articles, persona_cfg)
 
-    full_script = f"{intro.strip()}\n\n{narration.strip()}"
+@router.post("/narration/stream")
+async def intent_to_voice_stream(
+    payload: IntentRequest,
+    request: Request,
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+):
+    """
+    Streaming variant of /narration using Server-Sent Events.
+
+    Events, in order of availability:
+      intent    -> the parsed Intent
+      intro     -> {"text": ...}  (generated while news is being fetched)
+      articles  -> the selected articles
+      narration -> {"delta": ...}  one per streamed chunk of the script
+      audio     -> {"audio_url": ..., "audio_filename": ...}  (stream_audio only,
+                   right after the briefing is saved; otherwise audio is
+                   rendered by a queued job, see audio_status in done)
+      done      -> the persisted briefing, same shape as /narration
+      error     -> {"status_code": ..., "detail": ...}, e.g. 403 when the
+                   audio quota is used up; the stream ends
+    """
+    query = _validated_query(payload)
+    output_mode = payload.output_mode
 
+    user_id = current_user.id
+    persona_cfg = PERSONAS[payload.persona]
     wants_audio = output_mode in ("audio", "both")
-
-    audio_url = None
-    filename = None
-
-    if wants_audio:
-        try:
-            audio_bytes = synthesize_briefing_to_bytes(
-                full_script=full_script,
-                voice_id=persona_cfg.elevenlabs_voice_id,
-            )
-            filename = make_briefing_filename()
-            audio_url = await upload_audio_and_get_signed_url(audio_bytes, filename)
-        except ElevenLabsApiError as exc:
-            if exc.status_code == 402:
-                raise HTTPException(
-                    status_code=503,
-                    detail="Audio generation requires a paid ElevenLabs plan. Switch to 'Summary' mode to get a written briefing instead.",
+    stream_audio = wants_audio and payload.stream_audio
+    briefing_id = uuid.uuid4()
+
+    async def events():
+        # The request-scoped session isn't guaranteed to outlive the
+        # handler once the response starts streaming, so use our own
+        async with async_session_factory() as session:
+            pending: list[asyncio.Task] = []
+            reservation: QuotaReservation | None = None
+            try:
+                # Reserved here rather than in the handler: a client gone
+                # before the body is iterated never runs this generator,
+                # so nothing would release it
+                reservation = await _reserve_audio_quota(current_user, output_mode)
+
+                intent = await create_intent_from_query(query)
+                yield _sse("intent", intent.model_dump(mode="json"))
+
+                # The narration is streamed per request, but concurrent
+                # duplicates share the intent, news fetch and intro
+                intro_task = asyncio.create_task(_intro_flight.do(
+                    _script_key(intent, payload.persona, output_mode),
+                    lambda: build_brief_intro(intent, persona_cfg),
+                ))
+                news_task = asyncio.create_task(fetch_articles_for_intent(intent.model_copy()))
+                pending = [intro_task, news_task]
+
+                # Emit intro and articles in whichever order they finish
+                waiting = {intro_task, news_task}
+                while waiting:
+                    done, waiting = await asyncio.wait(waiting, return_when=asyncio.FIRST_COMPLETED)
+                    if intro_task in done:
+                        yield _sse("intro", {"text": intro_task.result().strip()})
+                    if news_task in done:
+                        top_articles = select_top_articles(news_task.result().articles, intent)
+                        yield _sse("articles", [
+                            {
+                                "title": a.title,
+                                "source": a.source,
+                                "url": a.url,
+                                "published_at": a.published_at.isoformat(),
+                            }
+                            for a in top_articles
+                        ])
+
+                parts: list[str] = []
+                async for delta in stream_narration_text(intent, top_articles, persona_cfg):
+                    parts.append(delta)
+                    yield _sse("narration", {"delta": delta})
+
+                full_script = f"{intro_task.result().strip()}\n\n{''.join(parts).strip()}"
+
+                audio = await _plan_audio(request, briefing_id, full_script, persona_cfg, wants_audio, stream_audio)
+
+                audio_briefing = AudioBriefing(
+                    id=briefing_id,
+                    query=query,
+                    user_id=user_id,
+                    persona=payload.persona,
+                    output_mode=output_mode,
+                    city=intent.city,
+                    country=intent.country,
+                    audio_url=audio.audio_url,
+                    audio_filename=audio.filename,
+                    script=full_script,
+                    search_history_id=await log_search_history(db=session, intent=intent, user_id=str(user_id)),
                 )
-            raise HTTPException(
-                status_code=503,
-                detail="Audio generation failed. Try again, or switch to 'Summary' mode.",
-            )
-
-    audio_briefing = AudioBriefing(
-        query=query,
-        user_id=current_user.id,
-        persona=payload.persona,
-        output_mode=output_mode,
-        city=intent.city,
-        country=intent.country,
-        audio_url=audio_url,
-        audio_filename=filename,
-        script=full_script,
-        search_history_id=search_history_id
+                session.add(audio_briefing)
+                await session.flush()  # before the job that references it
+                audio_job = _add_audio_job(session, briefing_id, audio.status)
+                if reservation is not None:
+                    await consume_quota(session, reservation)
+                # Search log, briefing, audio job and usage in one transaction
+                await session.commit()
+
+                if audio.status == "streaming":
+                    voice_id = persona_cfg.elevenlabs_voice_id
+                    start_live_audio(
+                        briefing_id, full_script, voice_id, audio_blob_name(full_script, voice_id)
+                    )
+                if audio.stream_url or audio.audio_url:
+                    yield _sse("audio", {
+                        "audio_url": audio.stream_url or audio.audio_url,
+                        "audio_filename": audio.filename,
+                    })
+
+                yield _sse("done", _briefing_response(
+                    audio_briefing, persona_cfg, wants_audio,
+                    audio_status=audio.status,
+                    audio_job=audio_job,
+                    stream_url=audio.stream_url,
+                ))
+
+            except HTTPException as exc:
+                yield _sse("error", {"status_code": exc.status_code, "detail": exc.detail})
+            except Exception as exc:
+                logger.error("Streaming narration failed: %s: %s", type(exc).__name__, exc)
+                yield _sse("error", {"status_code": 500, "detail": "Briefing generation failed. Please try again."})
+            finally:
+                for task in pending:
+                    task.cancel()
+                if reservation is not None:
+                    await release_quota(reservation)
+
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
     )
-
-    db.add(audio_briefing)
-    await db.commit()
-    await db.refresh(audio_briefing)
-
-    return {
-        "id": str(audio_briefing.id),
-        "query": audio_briefing.query,
-        "persona": audio_briefing.persona,
-        "persona_name": persona_cfg.display_name,
-        "output_mode": output_mode,
-        "script": full_script,
-        "city": audio_briefing.city,
-        "country": audio_briefing.country,
-        "audio_url": audio_url,
-        "audio_filename": filename,
-        "created_at": audio_briefing.created_at.isoformat() + "Z",
-        "has_audio": wants_audio,
-    }
-
@@ -1,54 +1,119 @@
 # app/api/briefings.py
 from __future__ import annotations
 
-from datetime import datetime, timezone, timedelta
+import logging
+import uuid
 
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
+from fastapi.responses import RedirectResponse, StreamingResponse
+from jose import JWTError
 from sqlalchemy.ext.asyncio import AsyncSession
-from google.cloud import storage
-from google.oauth2 import service_account
 
-from app.core.db import get_db
+from app.core.db import async_session_factory, get_db, get_read_db, has_read_replica
 from app.core.config import settings
+from app.core.security import AUDIO_STREAM_SCOPE, create_audio_stream_token, decode_token
 from app.models.user import User
 from app.models.audio_briefing import AudioBriefing
+from app.models.audio_job import AudioJob
+from app.services.audio_stream import live_audio_chunks
+from app.services.audio_jobs import get_audio_job
+from app.services.storage_service import get_audio_signed_url
 from app.api.deps import get_current_user
 
 
 router = APIRouter()
+logger = logging.getLogger(__name__)
 
+# Seconds a player should wait before retrying audio that isn't stored yet
+_AUDIO_PENDING_RETRY_AFTER = 5
 
-def generate_gcs_signed_url(
-    bucket_name: str,
-    blob_name: str,
-    minutes_valid: int = 15,
-) -> str:
-    credentials = service_account.Credentials.from_service_account_file(
-        settings.GCS_SERVICE_ACCOUNT_KEY_PATH
-    )
 
-    storage_client = storage.Client(
-        project=settings.GCP_PROJECT_ID,
-        credentials=credentials,
-    )
-    bucket = storage_client.bucket(bucket_name)
-    blob = bucket.blob(blob_name)
+def audio_stream_url(request: Request, briefing_id: uuid.UUID) -> str:
+    """Signed URL that plays the briefing's audio while it is synthesized."""
+    url = request.url_for("stream_briefing_audio", id=str(briefing_id))
+    return str(url.include_query_params(token=create_audio_stream_token(str(briefing_id))))
 
-    url = blob.generate_signed_url(
-        version="v4",
-        expiration=datetime.now(timezone.utc) + timedelta(minutes=minutes_valid),
-        method="GET",
-    )
-    return url
+
+@router.get("/{id}")
+async def get_briefing(
+    id: uuid.UUID,
+    request: Request,
+    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db),
+):
+    """
+    A briefing plus the state of its audio. Poll this after /breakdown/narration
+    returns audio_status "queued": audio_url is filled in once the job is done.
+    Audio rendered live by this process is "streaming" (audio_url plays it);
+    rendered anywhere else it reads "running" until the clip is stored.
+    """
+    audio_briefing = await db.get(AudioBriefing, id)
+
+    if audio_briefing is None:
+        raise HTTPException(status_code=404, detail="Briefing not found")
+
+    if current_user.id != audio_briefing.user_id:
+        raise HTTPException(status_code=400, detail="You don't have access to this briefing")
+
+    job = await get_audio_job(db, id)
+    has_audio = audio_briefing.output_mode in ("audio", "both")
+
+    audio_url = None
+    if job is not None:
+        # queued | running | done | failed
+        audio_status = job.status
+        if audio_status == "running" and live_audio_chunks(id) is not None:
+            audio_status = "streaming"
+            audio_url = audio_stream_url(request, id)
+    elif audio_briefing.audio_filename:
+        audio_status = "done"
+    else:
+        audio_status = "failed" if has_audio else None
+
+    if audio_status == "done" and audio_briefing.audio_filename:
+        # The URL stored at render time may have expired
+        audio_url = get_audio_signed_url(audio_briefing.audio_filename, minutes_valid=15)
+
+    return {
+        "id": str(audio_briefing.id),
+        "query": audio_briefing.query,
+        "persona": audio_briefing.persona,
+        "output_mode": audio_briefing.output_mode,
+        "script": audio_briefing.script,
+        "city": audio_briefing.city,
+        "country": audio_briefing.country,
+        "audio_url": audio_url,
+        "audio_filename": audio_briefing.audio_filename if audio_url else None,
+        "created_at": audio_briefing.created_at.isoformat() + "Z",
+        "has_audio": has_audio,
+        "audio_status": audio_status,
+        "audio_job_id": str(job.id) if job is not None else None,
+        "audio_error": job.error if job is not None and job.status == "failed" else None,
+    }
+
+
+async def _briefing_with_pending_job(
+    session: AsyncSession, id
+) -> tuple[AudioBriefing | None, AudioJob | None]:
+    """The briefing and, while it has no stored audio, its audio job."""
+    audio_briefing = await session.get(AudioBriefing, id)
+    if audio_briefing is None or audio_briefing.audio_filename:
+        return audio_briefing, None
+    return audio_briefing, await get_audio_job(session, audio_briefing.id)
 
 
 @router.get("/{id}/audio-url")
 async def get_signed_url(
     id: str,
     current_user: User = Depends(get_current_user),
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
 ):
-    audio_briefing = await db.get(AudioBriefing, id)
+    audio_briefing, job = await _briefing_with_pending_job(db, id)
+    if has_read_replica and (audio_briefing is None or not audio_briefing.audio_filename):
+        # Replica may lag a just-created briefing, its job or a
+        # just-finished render: read both from the primary together
+        async with async_session_factory() as primary:
+            audio_briefing, job = await _briefing_with_pending_job(primary, id)
 
     if audio_briefing is None:
         raise HTTPException(status_code=404, detail="Briefing not found")
@@ -56,21 +121,60 @@ async def get_signed_url(
     if current_user.id != audio_briefing.user_id:
         raise HTTPException(status_code=400, detail="You don't have access to this briefing")
 
-    print("BRIEFING audio_filename:", audio_briefing.audio_filename)
-    print("BRIEFING audio_url:", audio_briefing.audio_url)
-
     if not audio_briefing.audio_filename:
+        if job is not None and job.status in ("queued", "running"):
+            raise HTTPException(status_code=409, detail="Audio is still being generated")
         raise HTTPException(status_code=400, detail="No audio file stored for this briefing")
 
-    signed_url = generate_gcs_signed_url(
-        bucket_name=settings.GCS_BUCKET_NAME,
-        blob_name=audio_briefing.audio_filename,
-        minutes_valid=15,
-    )
-
-    print("SIGNED bucket:", settings.GCS_BUCKET_NAME)
-    print("SIGNED blob:", audio_briefing.audio_filename)
-    print("SIGNED url:", signed_url)
+    signed_url = get_audio_signed_url(audio_briefing.audio_filename, minutes_valid=15)
+    logger.debug("Signed audio URL for briefing %s: %s/%s",
+                 audio_briefing.id, settings.GCS_BUCKET_NAME, audio_briefing.audio_filename)
 
     return {"signed_url": signed_url}
 
+
+
+@router.get("/{id}/audio/stream", name="stream_briefing_audio")
+async def get_audio_stream(
+    id: uuid.UUID,
+    token: str = Query(...),
+    db: AsyncSession = Depends(get_db),
+):
+    """
+    Play a briefing's audio while it is still being synthesized.
+
+    Authorized by the signed token in the URL (see create_audio_stream_token)
+    rather than a bearer header, so it works as an <audio> src. Once the
+    clip is stored, redirects to its signed storage URL instead; until
+    then, on a process that isn't rendering it, answers 503 + Retry-After.
+    """
+    try:
+        claims = decode_token(token)
+    except JWTError:
+        raise HTTPException(status_code=401, detail="Invalid or expired audio link")
+    if claims.get("scope") != AUDIO_STREAM_SCOPE or claims.get("sub") != str(id):
+        raise HTTPException(status_code=401, detail="Invalid or expired audio link")
+
+    chunks = live_audio_chunks(id)
+    if chunks is not None:
+        return StreamingResponse(
+            chunks,
+            media_type="audio/mpeg",
+            headers={"Cache-Control": "no-store", "X-Accel-Buffering": "no"},
+        )
+
+    audio_briefing = await db.get(AudioBriefing, id)
+    if audio_briefing is None:
+        raise HTTPException(status_code=404, detail="No audio for this briefing")
+    if not audio_briefing.audio_filename:
+        job = await get_audio_job(db, id)
+        if job is not None and job.status in ("queued", "running"):
+            raise HTTPException(
+                status_code=503,
+                detail="Audio is still being generated",
+                headers={"Retry-After": str(_AUDIO_PENDING_RETRY_AFTER)},
+            )
+        raise HTTPException(status_code=404, detail="No audio for this briefing")
+
+    signed_url = get_audio_signed_url(audio_briefing.audio_filename, minutes_valid=15)
+    return RedirectResponse(signed_url, status_code=307)
@@ -1,37 +1,122 @@
 # app/api/deps.py
-from fastapi import Depends, HTTPException, status
+import secrets
+import time
+
+from fastapi import Depends, Header, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
 from jose import JWTError, jwt
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlmodel import select
 
+from app.core.cache import TTLCache
 from app.core.config import settings
-from app.core.db import get_db
+from app.core.db import async_session_factory, get_read_db, has_read_replica
+from app.core.metrics import register_stats
 from app.models.user import User
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/auth/login")
 
+# Verified session token -> its "sub", for the TTL or until the token's
+# exp, whichever is sooner
+_token_cache: TTLCache[str, str] = TTLCache(
+    maxsize=settings.AUTH_TOKEN_CACHE_MAX_ENTRIES,
+    ttl=settings.AUTH_USER_CACHE_TTL_SECONDS,
+)
+# sub -> User loaded from the DB (detached; treat as read-only)
+_user_cache: TTLCache[str, User] = TTLCache(
+    maxsize=settings.AUTH_USER_CACHE_MAX_ENTRIES,
+    ttl=settings.AUTH_USER_CACHE_TTL_SECONDS,
+)
+
+register_stats("auth_token_cache", _token_cache.stats)
+register_stats("auth_user_cache", _user_cache.stats)
+
+
+def invalidate_cached_user(user_id) -> None:
+    """
+    Drop a user's cached record after changing it (profile edits,
+    deactivation). Other workers pick the change up within
+    AUTH_USER_CACHE_TTL_SECONDS.
+    """
+    _user_cache.pop(str(user_id))
+
+
+def _verify_token(token: str) -> str | None:
+    """The token's sub if it is a valid session token, else None."""
+    user_id = _token_cache.get(token)
+    if user_id is not None:
+        return user_id
+
+    try:
+        payload = jwt.decode(token, settings.JWT_SECRET_KEY, algorithms=["HS256"])
+    except JWTError:
+        return None
+
+    user_id = payload.get("sub")
+    # Scoped tokens (e.g. audio stream links) aren't session tokens
+    if user_id is None or payload.get("scope") is not None:
+        return None
+
+    exp = payload.get("exp")
+    if exp is not None:
+        remaining = exp - time.time()
+        if remaining > 0:
+            ttl = min(remaining, settings.AUTH_USER_CACHE_TTL_SECONDS)
+            _token_cache.set(token, user_id, ttl=ttl)
+    return user_id
+
 
 async def get_current_user(
     token: str = Depends(oauth2_scheme),
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
 ) -> User:
+    """
+    The authenticated user. Repeat calls with the same token skip JWT
+    verification, and the user record is cached briefly, so most
+    requests don't touch the DB here; misses read from the replica.
+    is_active is checked on every call, against a record at most
+    AUTH_USER_CACHE_TTL_SECONDS old. The returned User may be shared
+    between requests: re-load it before modifying it.
+    """
     credentials_exception = HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
         detail="Not authenticated",
         headers={"WWW-Authenticate": "Bearer"},
     )
 
-    try:
-        payload = jwt.decode(token, settings.JWT_SECRET_KEY, algorithms=["HS256"])
-        user_id: str | None = payload.get("sub")
-        if user_id is None:
-            raise credentials_exception
-    except JWTError:
+    user_id = _verify_token(token)
+    if user_id is None:
         raise credentials_exception
 
-    user = await db.get(User, str(user_id))
+    user = _user_cache.get(str(user_id))
     if user is None:
+        user = await db.get(User, str(user_id))
+        if user is None and has_read_replica:
+            # Just signed up: the replica may not have the row yet
+            async with async_session_factory() as primary:
+                user = await primary.get(User, str(user_id))
+                if user is not None:
+                    primary.expunge(user)
+        elif user is not None:
+            # Keep the shared instance out of this request's session
+            db.expunge(user)
+        if user is None:
+            raise credentials_exception
+        _user_cache.set(str(user_id), user)
+
+    if not user.is_active:
         raise credentials_exception
 
     return user
+
+
+def require_stats_token(x_stats_token: str | None = Header(default=None)) -> None:
+    """
+    Guard for internal endpoints (GET /health/stats): the X-Stats-Token
+    header must match STATS_TOKEN. Without a configured token they don't
+    exist as far as clients can tell.
+    """
+    if not settings.STATS_TOKEN:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Not Found")
+    if x_stats_token is None or not secrets.compare_digest(x_stats_token, settings.STATS_TOKEN):
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Forbidden")
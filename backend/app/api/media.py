@@ -0,0 +1,49 @@
+# app/api/media.py
+from __future__ import annotations
+
+import asyncio
+import mimetypes
+import os
+
+from fastapi import APIRouter, HTTPException, Query, Request
+
+from app.core.range_response import RangeFileResponse
+from app.services.storage_service import LocalStorageBackend, get_storage
+
+
+router = APIRouter()
+
+
+@router.api_route("/{name:path}", methods=["GET", "HEAD"])
+async def get_media(
+    name: str,
+    request: Request,
+    expires: int = Query(...),
+    sig: str = Query(...),
+):
+    """
+    Serve an object from the local storage backend, with Range support so
+    the player can seek. URLs come from storage_service.get_audio_signed_url.
+    """
+    storage = get_storage()
+    if not isinstance(storage, LocalStorageBackend):
+        raise HTTPException(status_code=404, detail="Not found")
+
+    if not storage.verify(name, expires, sig):
+        raise HTTPException(status_code=403, detail="Invalid or expired media link")
+
+    try:
+        path = storage.path_for(name)
+        stat_result = await asyncio.to_thread(os.stat, path)
+    except (ValueError, FileNotFoundError):
+        raise HTTPException(status_code=404, detail="Not found")
+
+    return RangeFileResponse(
+        str(path),
+        stat_result,
+        media_type=mimetypes.guess_type(name)[0] or "application/octet-stream",
+        range_header=request.headers.get("range"),
+        if_range=request.headers.get("if-range"),
+        # Contents never change under a name (audio is content-addressed)
+        headers={"cache-control": "private, max-age=86400"},
+    )
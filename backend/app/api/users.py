@@ -1,18 +1,22 @@
 #app/api/users.py
 
-from fastapi import APIRouter, Depends, HTTPException, status, Path
+import base64
+from fastapi import APIRouter, Depends, HTTPException, status, Path, Query
+from sqlalchemy import func, tuple_
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlmodel import select
-from datetime import timedelta
+from datetime import datetime, timedelta
+from typing import Optional
 from uuid import UUID
 
 
-from app.core.db import get_db
+from app.core.db import get_db, get_read_db
 from app.models.user import User
 from app.models.audio_briefing import AudioBriefing
 from app.core.config import settings
-from app.schemas.user import UserInfoRequest, UserUpdateModel, UserHistoryResponse
-from app.api.deps import get_current_user
+from app.schemas.user import UserInfoRequest, UserUpdateModel, UserHistoryResponse, BriefingSummary
+from app.services.quota_service import AUDIO_BRIEFINGS, get_usage, quotas_for
+from app.api.deps import get_current_user, invalidate_cached_user
 
 
 router = APIRouter()
@@ -47,21 +51,81 @@ async def edit_user_info(
     :return current_user
     """
 
+    # current_user may be the shared cached instance; edit a fresh copy
+    user = await db.get(User, current_user.id)
+    if user is None:
+        raise HTTPException(status_code=404, detail="User not found")
+
     for class_field, user_value in request.model_dump(exclude_unset=True).items():
-        setattr(current_user, class_field, user_value)
+        setattr(user, class_field, user_value)
 
 
-    db.add(current_user)
+    db.add(user)
     await db.commit()
-    await db.refresh(current_user)
-    return current_user
+    await db.refresh(user)
+    invalidate_cached_user(user.id)
+    return user
 
 
-@router.get('/{id}/briefings')
+@router.get('/me/usage')
+async def get_user_usage(
+    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_read_db)
+):
+    """
+    Audio briefings used under each quota that applies (lifetime free
+    tier, plus any daily/monthly caps), from the usage counters.
+    """
+    return {
+        "audio_briefings": [
+            {
+                "period": quota.period,
+                "limit": quota.limit,
+                "used": await get_usage(db, current_user.id, quota),
+            }
+            for quota in quotas_for(AUDIO_BRIEFINGS)
+        ]
+    }
+
+
+# Everything the history list shows; the full script stays in the DB
+_HISTORY_COLUMNS = (
+    AudioBriefing.id,
+    AudioBriefing.user_id,
+    AudioBriefing.search_history_id,
+    AudioBriefing.query,
+    AudioBriefing.persona,
+    AudioBriefing.city,
+    AudioBriefing.country,
+    AudioBriefing.output_mode,
+    AudioBriefing.audio_url,
+    AudioBriefing.audio_filename,
+    AudioBriefing.created_at,
+)
+
+
+def _encode_cursor(created_at: datetime, briefing_id: UUID) -> str:
+    raw = f"{created_at.isoformat()}|{briefing_id}".encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def _decode_cursor(cursor: str) -> tuple[datetime, UUID]:
+    """Raises ValueError for anything _encode_cursor didn't produce."""
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)).decode()
+        created_at, briefing_id = raw.split("|")
+        return datetime.fromisoformat(created_at), UUID(briefing_id)
+    except Exception as e:
+        raise ValueError("Invalid cursor") from e
+
+
+@router.get('/{id}/briefings', response_model=UserHistoryResponse)
 async def get_user_briefings(
     id: UUID = Path(..., description="User ID", example="550e8400-e29b-41d4-a716-446655440000"),
+    limit: int = Query(settings.HISTORY_PAGE_SIZE, ge=1, le=settings.HISTORY_MAX_PAGE_SIZE),
+    cursor: Optional[str] = Query(None, description="next_cursor from the previous page"),
     current_user: User = Depends(get_current_user),
-    db: AsyncSession = Depends(get_db)
+    db: AsyncSession = Depends(get_read_db)
 ):
     
     """    
@@ -70,17 +134,45 @@ async def get_user_briefings(
     :param db: connection to database
     :type db: AsyncSession
 
-    :return UserHistoryModel:/ a list of all searches/ audio briefings to users name
+    :return UserHistoryModel:/ one page of the user's briefings, newest first,
+        without full scripts (GET /briefings/{id} has the script)
     """
     
 
     if id != current_user.id:
         raise HTTPException(status_code=403, detail="Not authorized for this user")
     
-    stmt = select(AudioBriefing).where(AudioBriefing.user_id == id)
-    result = await db.execute(stmt)
-    briefings_list = result.scalars().all()
-    
-    return UserHistoryResponse(briefings=briefings_list)
+    # Keyset pagination on (created_at, id): served by the composite index,
+    # so every page costs the same however long the history is
+    stmt = (
+        select(
+            *_HISTORY_COLUMNS,
+            func.substr(AudioBriefing.script, 1, settings.HISTORY_PREVIEW_CHARS).label("preview"),
+        )
+        .where(AudioBriefing.user_id == id)
+        .order_by(AudioBriefing.created_at.desc(), AudioBriefing.id.desc())
+        .limit(limit + 1)
+    )
+    if cursor:
+        try:
+            after_created_at, after_id = _decode_cursor(cursor)
+        except ValueError:
+            raise HTTPException(status_code=400, detail="Invalid cursor")
+        stmt = stmt.where(
+            tuple_(AudioBriefing.created_at, AudioBriefing.id) < tuple_(after_created_at, after_id)
+        )
+
+    rows = (await db.execute(stmt)).all()
+    page = rows[:limit]
+
+    next_cursor = None
+    if len(rows) > limit:
+        last = page[-1]
+        next_cursor = _encode_cursor(last.created_at, last.id)
+
+    return UserHistoryResponse(
+        briefings=[BriefingSummary.model_validate(row._mapping) for row in page],
+        next_cursor=next_cursor,
+    )
 
 
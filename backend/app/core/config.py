@@ -2,17 +2,22 @@
 from __future__ import annotations
 import os
 import base64
+import logging
 import json
+from functools import cached_property
 from pydantic_settings import BaseSettings, SettingsConfigDict
 from google.oauth2 import service_account
 
 class Settings(BaseSettings):
 
-    @property
+    @cached_property
     def gcs_credentials(self):
-        """Get GCS credentials - supports local file OR Vercel base64 env var"""
+        """
+        Get GCS credentials - supports local file OR Vercel base64 env var.
+        Loaded once per process; the google-auth object refreshes itself.
+        """
         # Vercel base64 key (priority)
-        b64_key = os.getenv("GCS_SERVICE_ACCOUNT_KEY_B64")
+        b64_key = self.GCS_SERVICE_ACCOUNT_KEY_B64
         if b64_key:
             try:
                 key_data = base64.b64decode(b64_key)
@@ -20,10 +25,10 @@ class Settings(BaseSettings):
                     json.loads(key_data)
                 )
             except Exception as e:
-                print(f"GCS base64 decode failed: {e}")
+                logging.getLogger(__name__).warning("GCS base64 decode failed: %s", e)
         
         # Local file fallback (development)
-        if os.path.exists(self.GCS_SERVICE_ACCOUNT_KEY_PATH):
+        if self.GCS_SERVICE_ACCOUNT_KEY_PATH and os.path.exists(self.GCS_SERVICE_ACCOUNT_KEY_PATH):
             return service_account.Credentials.from_service_account_file(
                 self.GCS_SERVICE_ACCOUNT_KEY_PATH
             )
@@ -37,6 +42,11 @@ class Settings(BaseSettings):
     
     # ---------General-----------
     ENVIRONMENT: str = "development"
+    # Level for the app's loggers (API and audio worker)
+    LOG_LEVEL: str = "INFO"
+    # Shared secret for GET /health/stats (sent as X-Stats-Token); the
+    # endpoint answers 404 while this is unset
+    STATS_TOKEN: str | None = None
 
     # --- Security ---
     # Used to sign the JWT tokens (your app's session wristband)
@@ -44,20 +54,166 @@ class Settings(BaseSettings):
     JWT_SECRET_KEY: str 
     JWT_ALGORITHM: str = "HS256"
     ACCESS_TOKEN_EXPIRE: int = 24 # 24 hours
+    # bcrypt cost; existing hashes are upgraded on the user's next login
+    BCRYPT_ROUNDS: int = 12
+    # Threads hashing passwords at once per worker, and how many more
+    # hashes may wait before signup/login return 503
+    PASSWORD_HASH_WORKERS: int = 2
+    PASSWORD_HASH_MAX_QUEUE: int = 32
+    # Verified tokens and user records are remembered for TTL seconds
+    # (tokens never past their exp). It is the longest a change made on
+    # another worker, e.g. a deactivation, can go unnoticed
+    AUTH_USER_CACHE_TTL_SECONDS: int = 60
+    AUTH_USER_CACHE_MAX_ENTRIES: int = 10000
+    AUTH_TOKEN_CACHE_MAX_ENTRIES: int = 10000
 
     #database for storage
     DATABASE_URL: str
+    # Optional read replica for read-only endpoints (history, profile)
+    DATABASE_REPLICA_URL: str | None = None
+
+    # ---------DB connection pool (per engine, per worker)-----------
+    DB_POOL_SIZE: int = 10
+    DB_MAX_OVERFLOW: int = 20
+    DB_POOL_TIMEOUT_SECONDS: float = 30.0
+    # Recycle connections older than this, before the server/LB drops them
+    DB_POOL_RECYCLE_SECONDS: int = 1800
+    DB_POOL_PRE_PING: bool = True
+    # asyncpg prepared statements cached per connection; 0 for pgbouncer
+    DB_STATEMENT_CACHE_SIZE: int = 100
+    # Log every SQL statement (separate from DEBUG; noisy)
+    SQL_ECHO: bool = False
 
     DEBUG: bool = True
 
     GEMINI_API_KEY: str
     GEMINI_MODEL_NAME: str = "gemini-2.5-flash" 
 
+    # ---------Usage quotas-----------
+    # Audio briefings per user, ever (summaries are always free)
+    FREE_AUDIO_BRIEFING_LIMIT: int = 3
+    # Optional extra caps per calendar day / month (UTC); None = no cap
+    AUDIO_BRIEFINGS_PER_DAY: int | None = None
+    AUDIO_BRIEFINGS_PER_MONTH: int | None = None
+    # A credit held by a request that never finished is freed after this
+    QUOTA_RESERVATION_TTL_SECONDS: int = 600
+
+    # ---------Briefing history-----------
+    HISTORY_PAGE_SIZE: int = 20
+    HISTORY_MAX_PAGE_SIZE: int = 100
+    # Script characters sent with each history item (full script via /briefings/{id})
+    HISTORY_PREVIEW_CHARS: int = 160
+
+    # ---------LLM client-----------
+    # Per-call timeout (seconds) and max in-flight Gemini calls per worker
+    LLM_TIMEOUT_SECONDS: float = 30.0
+    LLM_MAX_CONCURRENCY: int = 32
+
+    # ---------Intent cache-----------
+    INTENT_CACHE_TTL_SECONDS: int = 3600
+    INTENT_CACHE_MAX_ENTRIES: int = 2048
+    # Local rule-based parse is used instead of Gemini at or above this
+    # confidence (0-1); set above 1 to always use Gemini
+    INTENT_FAST_PATH_MIN_CONFIDENCE: float = 0.9
+
+    # ---------Outbound HTTP-----------
+    HTTP_TIMEOUT_SECONDS: float = 10.0
+    HTTP_MAX_CONNECTIONS: int = 100
+    HTTP_MAX_KEEPALIVE_CONNECTIONS: int = 20
+
+    # ---------News search-----------
+    # Timeout for a single Google News RSS request
+    NEWS_HTTP_TIMEOUT_SECONDS: float = 6.0
+    # A search returning fewer entries than this counts as sparse; sparse
+    # queries race their fallback variants next time instead of waiting
+    NEWS_SPARSE_RESULT_THRESHOLD: int = 5
+
+    # ---------News search cache-----------
+    # Seconds a cached search stays fresh, per Google News timeframe
+    NEWS_CACHE_FRESH_SECONDS: dict[str, int] = {"1h": 120, "1d": 600, "7d": 1800, "1m": 3600}
+    NEWS_CACHE_DEFAULT_FRESH_SECONDS: int = 900
+    # Extra seconds a stale entry is still served while it refreshes in the background
+    NEWS_CACHE_STALE_SECONDS: int = 900
+    NEWS_CACHE_MAX_ENTRIES: int = 1024
+
+    # ---------Article store-----------
+    # Answer from stored articles (skipping Google News) when at least this
+    # many match, counting only articles fetched in the last FRESH seconds
+    NEWS_STORE_MIN_ARTICLES: int = 15
+    NEWS_STORE_FRESH_SECONDS: int = 1800
+
+    # ---------Article selection-----------
+    # Estimated Jaccard similarity (0-1) of title+snippet shingles at which
+    # two articles are treated as the same syndicated story
+    NEAR_DUP_SIMILARITY_THRESHOLD: float = 0.5
+    # Share of the ranking score given to recency (0-1); the rest is BM25
+    # relevance to the intent. Recency halves every HALF_LIFE hours.
+    RANKING_RECENCY_WEIGHT: float = 0.3
+    RANKING_RECENCY_HALF_LIFE_HOURS: float = 24.0
+
     ELEVENLABS_API_KEY: str
 
-    GCS_BUCKET_NAME: str
-    GCP_PROJECT_ID: str
+    # ---------TTS-----------
+    # Scripts are synthesized in chunks of at most this many characters,
+    # split at paragraph/sentence boundaries, up to PARALLEL chunks at once
+    TTS_CHUNK_MAX_CHARS: int = 600
+    TTS_MAX_PARALLEL_CHUNKS: int = 4
+
+    # ---------Live audio streaming-----------
+    # Lifetime of the signed URL a player uses to stream a briefing's audio
+    AUDIO_STREAM_TOKEN_MINUTES: int = 60
+    # How long a stream whose clip couldn't be stored stays replayable
+    # from memory (a stored clip is served from storage instead)
+    AUDIO_STREAM_LINGER_SECONDS: int = 120
+    # Memory one live clip may hold. Past it, chunks are dropped from the
+    # front: players joining later get the stored clip (or 503 until it is
+    # stored), and a player lagging this far behind is cut off
+    AUDIO_STREAM_BUFFER_MAX_BYTES: int = 8 * 1024 * 1024
+
+    # ---------Storage-----------
+    # "gcs" or "local"
+    STORAGE_BACKEND: str = "gcs"
+    # Local backend: files live here and are served by this API at
+    # BASE_URL/media/... (must be reachable from the browser)
+    LOCAL_STORAGE_DIR: str = "media"
+    LOCAL_STORAGE_BASE_URL: str = "http://localhost:8000"
+
+    # Required when STORAGE_BACKEND is "gcs"
+    GCS_BUCKET_NAME: str = ""
+    GCP_PROJECT_ID: str = ""
     GCS_SERVICE_ACCOUNT_KEY_PATH: str | None = None
     GCS_SERVICE_ACCOUNT_KEY_B64: str | None = None
 
+    # ---------Audio job queue-----------
+    # Jobs rendered at once per worker process (python -m app.worker)
+    AUDIO_WORKER_CONCURRENCY: int = 4
+    # How often an idle worker checks for new jobs
+    AUDIO_WORKER_POLL_SECONDS: float = 1.0
+    AUDIO_JOB_MAX_ATTEMPTS: int = 3
+    # A job "running" this long is assumed orphaned by a dead worker
+    AUDIO_JOB_STALE_SECONDS: int = 600
+    # A retryable failure waits BASE * 2^(attempt-1) seconds, at most MAX,
+    # before the job can be claimed again
+    AUDIO_JOB_RETRY_BASE_SECONDS: float = 15.0
+    AUDIO_JOB_RETRY_MAX_SECONDS: float = 600.0
+
+    # ---------Audio cache-----------
+    # Rendered audio is stored under PREFIX + sha256(script, voice, TTS
+    # settings), so identical renders are reused instead of re-synthesized
+    AUDIO_CACHE_PREFIX: str = "tts/"
+    # Keys known to exist in storage, remembered to skip the lookup
+    AUDIO_CACHE_MAX_ENTRIES: int = 4096
+    AUDIO_CACHE_TTL_SECONDS: int = 24 * 3600
+
+    # ---------Object storage uploads-----------
+    # Bytes buffered per resumable upload request (rounded down to a
+    # multiple of 256 KiB); bounds upload memory per briefing
+    GCS_UPLOAD_CHUNK_BYTES: int = 1024 * 1024
+    # Signed audio URLs are issued for TTL minutes and reused until less
+    # than the caller's required validity remains
+    SIGNED_URL_TTL_MINUTES: int = 120
+    SIGNED_URL_CACHE_MAX_ENTRIES: int = 4096
+    # e.g. http://localhost:4443 to upload to fake-gcs-server instead of GCS
+    STORAGE_EMULATOR_HOST: str | None = None
+
 settings = Settings()
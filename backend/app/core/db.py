@@ -1,17 +1,35 @@
 from typing import AsyncGenerator
 
+from sqlalchemy import text
 from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, create_async_engine
 from sqlalchemy.orm import sessionmaker
 from sqlmodel import SQLModel
 
 from app.core.config import settings
+from app.core.metrics import register_stats
 
 
-engine: AsyncEngine = create_async_engine(
-    settings.DATABASE_URL,
-    echo=settings.DEBUG,
-    future=True,
-)
+def _create_engine(url: str) -> AsyncEngine:
+    connect_args = {}
+    if "+asyncpg" in url:
+        # 0 disables prepared-statement caching (needed behind pgbouncer
+        # in transaction mode)
+        connect_args["statement_cache_size"] = settings.DB_STATEMENT_CACHE_SIZE
+
+    return create_async_engine(
+        url,
+        echo=settings.SQL_ECHO,
+        future=True,
+        pool_size=settings.DB_POOL_SIZE,
+        max_overflow=settings.DB_MAX_OVERFLOW,
+        pool_timeout=settings.DB_POOL_TIMEOUT_SECONDS,
+        pool_recycle=settings.DB_POOL_RECYCLE_SECONDS,
+        pool_pre_ping=settings.DB_POOL_PRE_PING,
+        connect_args=connect_args,
+    )
+
+
+engine: AsyncEngine = _create_engine(settings.DATABASE_URL)
 
 async_session_factory = sessionmaker(
     engine,
@@ -19,6 +37,32 @@ async_session_factory = sessionmaker(
     expire_on_commit=False,
 )
 
+# Read-only traffic goes to the replica when one is configured
+has_read_replica = bool(settings.DATABASE_REPLICA_URL)
+read_engine: AsyncEngine = (
+    _create_engine(settings.DATABASE_REPLICA_URL) if has_read_replica else engine
+)
+
+read_session_factory = sessionmaker(
+    read_engine,
+    class_=AsyncSession,
+    expire_on_commit=False,
+)
+
+
+def _pool_stats(pool) -> dict:
+    return {
+        "size": pool.size(),
+        "checked_out": pool.checkedout(),
+        "overflow": pool.overflow(),
+    }
+
+
+register_stats("db_pool", lambda: {
+    "primary": _pool_stats(engine.pool),
+    "replica": _pool_stats(read_engine.pool) if has_read_replica else None,
+})
+
 
 async def get_db() -> AsyncGenerator[AsyncSession, None]:
     session: AsyncSession = async_session_factory()
@@ -28,6 +72,41 @@ async def get_db() -> AsyncGenerator[AsyncSession, None]:
         await session.close()
 
 
+async def get_read_db() -> AsyncGenerator[AsyncSession, None]:
+    """
+    Session for endpoints that only read. Uses the read replica if
+    DATABASE_REPLICA_URL is set (so it may lag the primary slightly),
+    otherwise the primary. Never write through it.
+    """
+    session: AsyncSession = read_session_factory()
+    try:
+        yield session
+    finally:
+        await session.close()
+
+
+# create_all only creates missing tables, so columns and indexes added to
+# tables that already exist are applied here. Every statement must be
+# idempotent; they run on each start, after create_all.
+_SCHEMA_UPGRADES = (
+    # Keyset-paginated briefing history
+    "CREATE INDEX IF NOT EXISTS ix_audio_briefings_user_created_id "
+    "ON audio_briefings (user_id, created_at, id)",
+    # Audio job retry backoff
+    "ALTER TABLE audio_jobs ADD COLUMN IF NOT EXISTS run_after TIMESTAMP WITH TIME ZONE",
+    "CREATE INDEX IF NOT EXISTS ix_audio_jobs_run_after ON audio_jobs (run_after)",
+)
+
+
 async def init_db() -> None:
     async with engine.begin() as conn:
         await conn.run_sync(SQLModel.metadata.create_all)
+        if conn.dialect.name == "postgresql":
+            for statement in _SCHEMA_UPGRADES:
+                await conn.execute(text(statement))
+
+
+async def dispose_engines() -> None:
+    await engine.dispose()
+    if read_engine is not engine:
+        await read_engine.dispose()
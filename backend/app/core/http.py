@@ -0,0 +1,36 @@
+# app/core/http.py
+from __future__ import annotations
+
+import httpx
+
+from app.core.config import settings
+
+
+_client: httpx.AsyncClient | None = None
+
+
+def get_http_client() -> httpx.AsyncClient:
+    """
+    Process-wide pooled async HTTP client for outbound calls.
+
+    Reusing one client keeps TCP/TLS connections alive between requests
+    instead of paying a fresh handshake per fetch.
+    """
+    global _client
+    if _client is None:
+        _client = httpx.AsyncClient(
+            timeout=httpx.Timeout(settings.HTTP_TIMEOUT_SECONDS),
+            limits=httpx.Limits(
+                max_connections=settings.HTTP_MAX_CONNECTIONS,
+                max_keepalive_connections=settings.HTTP_MAX_KEEPALIVE_CONNECTIONS,
+            ),
+            follow_redirects=True,
+        )
+    return _client
+
+
+async def close_http_client() -> None:
+    global _client
+    if _client is not None:
+        await _client.aclose()
+        _client = None
@@ -0,0 +1,20 @@
+# app/core/metrics.py
+from __future__ import annotations
+
+from typing import Any, Callable, Dict
+
+# name -> zero-arg callable returning a JSON-serializable dict
+_stats_providers: Dict[str, Callable[[], Dict[str, Any]]] = {}
+
+
+def register_stats(name: str, provider: Callable[[], Dict[str, Any]]) -> None:
+    """
+    Register a stats provider (cache counters, fast-path counts, ...).
+    Everything registered here is reported by GET /health/stats
+    (internal: requires STATS_TOKEN).
+    """
+    _stats_providers[name] = provider
+
+
+def collect_stats() -> Dict[str, Dict[str, Any]]:
+    return {name: provider() for name, provider in _stats_providers.items()}
@@ -0,0 +1,139 @@
+# app/core/range_response.py
+"""
+File response with single byte-range support (what <audio> seeking
+needs) that hands the transfer to the server as a zero-copy sendfile
+when it supports the ASGI pathsend/zerocopysend extensions, and
+otherwise reads fixed-size chunks off the event loop.
+"""
+from __future__ import annotations
+
+import os
+import re
+from email.utils import formatdate
+from typing import Optional, Tuple
+
+import anyio
+from starlette.background import BackgroundTask
+from starlette.responses import Response
+from starlette.types import Receive, Scope, Send
+
+
+_RANGE = re.compile(r"^bytes=(\d*)-(\d*)$")
+_CHUNK_BYTES = 256 * 1024
+
+
+def parse_range(header: Optional[str], size: int) -> Optional[Tuple[int, int]]:
+    """
+    (start, end) inclusive for a single "bytes=" range, None to send the
+    whole file (no header, or multiple ranges, which servers may ignore).
+    Raises ValueError when the range can't be satisfied.
+    """
+    if not header or "," in header:
+        return None
+    match = _RANGE.match(header.strip())
+    if match is None:
+        return None
+
+    first, last = match.groups()
+    if first:
+        start = int(first)
+        end = min(int(last), size - 1) if last else size - 1
+    elif last:
+        # Suffix range: the final N bytes
+        start = max(size - int(last), 0)
+        end = size - 1
+    else:
+        return None
+
+    if start >= size or start > end:
+        raise ValueError("Range not satisfiable")
+    return start, end
+
+
+class RangeFileResponse(Response):
+
+    def __init__(
+        self,
+        path: str,
+        stat_result: os.stat_result,
+        *,
+        media_type: str,
+        range_header: Optional[str] = None,
+        if_range: Optional[str] = None,
+        headers: Optional[dict] = None,
+        background: Optional[BackgroundTask] = None,
+    ) -> None:
+        self.path = path
+        self.size = stat_result.st_size
+        self.media_type = media_type
+        self.background = background
+
+        etag = f'"{stat_result.st_mtime_ns:x}-{self.size:x}"'
+        if if_range is not None and if_range != etag:
+            # The client's partial copy is of another version
+            range_header = None
+
+        self.status_code = 200
+        self.start, self.end = 0, self.size - 1
+        extra = {}
+        try:
+            byte_range = parse_range(range_header, self.size)
+        except ValueError:
+            self.status_code = 416
+            self.start, self.end = 0, -1
+            extra["content-range"] = f"bytes */{self.size}"
+        else:
+            if byte_range is not None:
+                self.status_code = 206
+                self.start, self.end = byte_range
+                extra["content-range"] = f"bytes {self.start}-{self.end}/{self.size}"
+
+        self.init_headers({
+            **(headers or {}),
+            **extra,
+            "accept-ranges": "bytes",
+            "content-length": str(self.end - self.start + 1),
+            "etag": etag,
+            "last-modified": formatdate(stat_result.st_mtime, usegmt=True),
+        })
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        await send({
+            "type": "http.response.start",
+            "status": self.status_code,
+            "headers": self.raw_headers,
+        })
+
+        count = self.end - self.start + 1
+        if scope["method"].upper() == "HEAD" or count <= 0:
+            await send({"type": "http.response.body", "body": b"", "more_body": False})
+        elif self.status_code == 200 and "http.response.pathsend" in scope.get("extensions", {}):
+            await send({"type": "http.response.pathsend", "path": self.path})
+        elif "http.response.zerocopysend" in scope.get("extensions", {}):
+            with open(self.path, "rb") as f:
+                await send({
+                    "type": "http.response.zerocopysend",
+                    "file": f,
+                    "offset": self.start,
+                    "count": count,
+                    "more_body": False,
+                })
+        else:
+            f = await anyio.to_thread.run_sync(open, self.path, "rb")
+            try:
+                await anyio.to_thread.run_sync(f.seek, self.start)
+                remaining = count
+                while remaining > 0:
+                    data = await anyio.to_thread.run_sync(f.read, min(_CHUNK_BYTES, remaining))
+                    if not data:
+                        break
+                    remaining -= len(data)
+                    await send({"type": "http.response.body", "body": data, "more_body": remaining > 0})
+                if remaining > 0:
+                    # File shrank under us; end the body anyway
+                    await send({"type": "http.response.body", "body": b"", "more_body": False})
+            finally:
+                f.close()
+
+        if self.background is not None:
+            await self.background()
@@ -1,13 +1,27 @@
+import asyncio
+import threading
+import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta, timezone
-from typing import Any, Dict
+from typing import Any, Dict, Optional, Tuple
 
 from jose import jwt
 from passlib.context import CryptContext
 
 from app.core.config import settings
+from app.core.metrics import register_stats
 
 
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+# Pinning min = max = default makes any hash with a different cost
+# "need update", so changing BCRYPT_ROUNDS rehashes users on next login
+pwd_context = CryptContext(
+    schemes=["bcrypt"],
+    deprecated="auto",
+    bcrypt__default_rounds=settings.BCRYPT_ROUNDS,
+    bcrypt__min_rounds=settings.BCRYPT_ROUNDS,
+    bcrypt__max_rounds=settings.BCRYPT_ROUNDS,
+)
 
 
 def hash_password(password: str) -> str:
@@ -18,6 +32,76 @@ def verify_password(password: str, hashed: str) -> bool:
     return pwd_context.verify(password, hashed)
 
 
+# ---- Password hashing off the event loop ----
+
+class PasswordHasherBusy(Exception):
+    """Too many password hashes already running or queued."""
+
+
+# bcrypt releases the GIL, so these threads really run in parallel; the
+# pool size caps how many cores auth can take from briefing traffic
+_hash_executor = ThreadPoolExecutor(
+    max_workers=settings.PASSWORD_HASH_WORKERS,
+    thread_name_prefix="password-hash",
+)
+_hash_slots = threading.BoundedSemaphore(
+    settings.PASSWORD_HASH_WORKERS + settings.PASSWORD_HASH_MAX_QUEUE
+)
+_hash_counts: Counter[str] = Counter()
+_hash_in_flight = 0
+
+
+def _password_hash_stats() -> dict:
+    completed = _hash_counts["completed"]
+    return {
+        "workers": settings.PASSWORD_HASH_WORKERS,
+        "in_flight": _hash_in_flight,
+        "completed": completed,
+        "rejected": _hash_counts["rejected"],
+        "rehashed": _hash_counts["rehashed"],
+        "avg_ms": round(_hash_counts["total_ms"] / completed, 1) if completed else 0.0,
+    }
+
+
+register_stats("password_hashing", _password_hash_stats)
+
+
+async def _run_hash_job(func, *args):
+    global _hash_in_flight
+    # Fail fast instead of letting a login burst queue up without bound
+    if not _hash_slots.acquire(blocking=False):
+        _hash_counts["rejected"] += 1
+        raise PasswordHasherBusy()
+
+    _hash_in_flight += 1
+    started = time.perf_counter()
+    try:
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(_hash_executor, func, *args)
+    finally:
+        _hash_in_flight -= 1
+        _hash_slots.release()
+        _hash_counts["completed"] += 1
+        _hash_counts["total_ms"] += int((time.perf_counter() - started) * 1000)
+
+
+async def hash_password_async(password: str) -> str:
+    """hash_password in the password-hash pool. Raises PasswordHasherBusy."""
+    return await _run_hash_job(pwd_context.hash, password)
+
+
+async def verify_and_update_password(password: str, hashed: str) -> Tuple[bool, Optional[str]]:
+    """
+    Verify in the password-hash pool. Returns (ok, new_hash); new_hash is
+    set when the stored hash used another cost and should be replaced.
+    Raises PasswordHasherBusy.
+    """
+    ok, new_hash = await _run_hash_job(pwd_context.verify_and_update, password, hashed)
+    if new_hash is not None:
+        _hash_counts["rehashed"] += 1
+    return ok, new_hash
+
+
 def create_access_token(subject: str, expires_delta: timedelta | None = None) -> str:
     if expires_delta is None:
         expires_delta = timedelta(hours=12)
@@ -42,3 +126,26 @@ def decode_token(token: str) -> dict[str, Any]:
         settings.JWT_SECRET_KEY,
         algorithms=[settings.JWT_ALGORITHM],
     )
+
+
+AUDIO_STREAM_SCOPE = "audio_stream"
+
+
+def create_audio_stream_token(briefing_id: str) -> str:
+    """
+    Short-lived token carried in an audio stream URL, so <audio src> can
+    play it without an Authorization header. Only valid for that briefing.
+    """
+    now = datetime.now(timezone.utc)
+    payload: Dict[str, Any] = {
+        "sub": briefing_id,
+        "scope": AUDIO_STREAM_SCOPE,
+        "iat": int(now.timestamp()),
+        "exp": int((now + timedelta(minutes=settings.AUDIO_STREAM_TOKEN_MINUTES)).timestamp()),
+    }
+
+    return jwt.encode(
+        payload,
+        settings.JWT_SECRET_KEY,
+        algorithm=settings.JWT_ALGORITHM,
+    )
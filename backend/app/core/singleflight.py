@@ -0,0 +1,56 @@
+# app/core/singleflight.py
+from __future__ import annotations
+
+import asyncio
+from typing import Awaitable, Callable, Dict, Generic, Hashable, TypeVar
+
+K = TypeVar("K", bound=Hashable)
+V = TypeVar("V")
+
+
+class SingleFlight(Generic[K, V]):
+    """
+    Coalesces concurrent calls with the same key: the first caller starts
+    the work, callers arriving while it runs await the same result (or
+    exception). Nothing is kept once it finishes; pair with a cache for
+    that.
+
+    The work runs as its own task, so a caller that is cancelled (client
+    disconnect) doesn't cancel it for the others. Per-worker, like
+    TTLCache: share it between coroutines on one event loop.
+    """
+
+    def __init__(self) -> None:
+        self._calls: Dict[K, asyncio.Task] = {}
+        self.executions = 0
+        self.coalesced = 0
+
+    def __len__(self) -> int:
+        return len(self._calls)
+
+    async def do(self, key: K, fn: Callable[[], Awaitable[V]]) -> V:
+        task = self._calls.get(key)
+        if task is None:
+            task = asyncio.ensure_future(fn())
+            self._calls[key] = task
+            task.add_done_callback(lambda t: self._finished(key, t))
+            self.executions += 1
+        else:
+            self.coalesced += 1
+        return await asyncio.shield(task)
+
+    def _finished(self, key: K, task: asyncio.Task) -> None:
+        if self._calls.get(key) is task:
+            del self._calls[key]
+        # Every caller may have gone away; don't warn about an unread error
+        if not task.cancelled():
+            task.exception()
+
+    def stats(self) -> dict:
+        total = self.executions + self.coalesced
+        return {
+            "in_flight": len(self._calls),
+            "executions": self.executions,
+            "coalesced": self.coalesced,
+            "coalesced_share": round(self.coalesced / total, 4) if total else 0.0,
+        }
@@ -1,10 +1,18 @@
 # app/main.py
-from fastapi import FastAPI
+import logging
+
+from fastapi import Depends, FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 import app.core.event_loop
 
-from app.core.db import init_db
+from app.core.config import settings
+from app.core.db import dispose_engines, init_db
+from app.core.http import close_http_client
+from app.core.metrics import collect_stats
 from app.api import api_router
+from app.api.deps import require_stats_token
+
+logging.basicConfig(level=settings.LOG_LEVEL, format="%(asctime)s %(levelname)s %(name)s: %(message)s")
 
 app = FastAPI(title="briefly API")
 
@@ -26,8 +34,18 @@ app.add_middleware(
 async def on_startup():
     await init_db()
 
+
+@app.on_event("shutdown")
+async def on_shutdown():
+    await close_http_client()
+    await dispose_engines()
+
 @app.get("/health")
 async def health():
     return {"status": "ok"}
 
+@app.get("/health/stats", dependencies=[Depends(require_stats_token)])
+async def health_stats():
+    return collect_stats()
+
 app.include_router(api_router)
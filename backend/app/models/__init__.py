@@ -3,3 +3,5 @@ from .search_history import SearchHistory
 from .news_article import Article
 from .user import User
 from .feedback import Feedback
+from .audio_job import AudioJob
+from .user_usage import UserUsage
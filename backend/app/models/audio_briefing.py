@@ -5,11 +5,16 @@ from datetime import datetime, timezone
 import uuid
 from typing import Optional
 
+from sqlalchemy import Index
 from sqlmodel import SQLModel, Field
 
 
 class AudioBriefing(SQLModel, table=True):
     __tablename__ = "audio_briefings"
+    __table_args__ = (
+        # Newest-first history pages: WHERE user_id = ? AND (created_at, id) < cursor
+        Index("ix_audio_briefings_user_created_id", "user_id", "created_at", "id"),
+    )
 
     id: uuid.UUID = Field(default_factory=uuid.uuid4, primary_key=True, index=True)
     user_id: uuid.UUID = Field(foreign_key="users.id", index=True, nullable=False)
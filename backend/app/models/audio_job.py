@@ -0,0 +1,33 @@
+# app/models/audio_job.py
+from __future__ import annotations
+
+from datetime import datetime, timezone
+import uuid
+from typing import Optional
+
+from sqlmodel import SQLModel, Field
+
+
+class AudioJob(SQLModel, table=True):
+    """
+    Audio rendering (TTS + upload) for one briefing, queued by the API and
+    picked up by a worker process (python -m app.worker).
+    """
+    __tablename__ = "audio_jobs"
+
+    id: uuid.UUID = Field(default_factory=uuid.uuid4, primary_key=True, index=True)
+    briefing_id: uuid.UUID = Field(
+        foreign_key="audio_briefings.id", unique=True, index=True, nullable=False
+    )
+
+    # "queued" -> "running" -> "done" | "failed" (back to "queued" on retry)
+    status: str = Field(default="queued", index=True, nullable=False)
+    attempts: int = Field(default=0, nullable=False)
+    # User-facing reason when status is "failed"
+    error: Optional[str] = Field(default=None, nullable=True)
+
+    created_at: datetime = Field(default_factory=lambda: datetime.now(timezone.utc), nullable=False, index=True)
+    started_at: Optional[datetime] = Field(default=None, nullable=True)
+    # Not claimable before this (retry backoff); None means right away
+    run_after: Optional[datetime] = Field(default=None, nullable=True, index=True)
+    finished_at: Optional[datetime] = Field(default=None, nullable=True)
@@ -1,17 +1,28 @@
-from datetime import datetime
+from datetime import datetime, timezone
 from typing import Optional, List
 import uuid
+from sqlalchemy import Column, DateTime, Index, text
 from sqlmodel import SQLModel, Field
 
 
-class Article(SQLModel):
+# Full-text document for an article. Queries must use this exact expression
+# (including the regconfig cast) for Postgres to pick the GIN index.
+ARTICLE_SEARCH_VECTOR_SQL = "to_tsvector('english'::regconfig, title || ' ' || snippet)"
+
+
+class Article(SQLModel, table=True):
 
     """
     Search tool browses the internet and find articles related to user search
     it makes an Article model for each article it finds..
+    Fetched articles are also kept in the articles table (unique by url)
+    so later searches can be answered locally.
     """
 
     __tablename__ = "articles"
+    __table_args__ = (
+        Index("ix_articles_search_vector", text(ARTICLE_SEARCH_VECTOR_SQL), postgresql_using="gin"),
+    )
 
     id: uuid.UUID = Field(
         default_factory=uuid.uuid4,
@@ -21,11 +32,18 @@ class Article(SQLModel):
     )
 
     title: str = Field(nullable=False)
-    url: str = Field(nullable=False)
-    source: str = Field(nullable=False)
-    published_at: datetime = Field(nullable=False)
+    url: str = Field(nullable=False, unique=True)
+    source: str = Field(nullable=False, index=True)
+    published_at: datetime = Field(
+        sa_column=Column(DateTime(timezone=True), nullable=False, index=True)
+    )
     snippet: str = Field(nullable=False)
 
+    fetched_at: datetime = Field(
+        default_factory=lambda: datetime.now(timezone.utc),
+        sa_column=Column(DateTime(timezone=True), nullable=False, index=True),
+    )
+
 
 
 
@@ -35,8 +53,8 @@ class NewsSearchResponse(SQLModel):
     and passes it to breakdown
     """
     city: Optional[str] = None
-    country: str 
-    timeframe: str 
+    country: str
+    timeframe: str
     focus: str
     query_used: str
-    articles: List[Article] 
+    articles: List[Article]
@@ -0,0 +1,28 @@
+# app/models/user_usage.py
+from __future__ import annotations
+
+from datetime import datetime
+import uuid
+from typing import Optional
+
+from sqlmodel import SQLModel, Field
+
+
+class UserUsage(SQLModel, table=True):
+    """
+    How much of a metered thing (e.g. audio briefings) a user has used in
+    one quota period. Quota checks read and bump this row instead of
+    counting the user's history.
+    """
+    __tablename__ = "user_usage"
+
+    user_id: uuid.UUID = Field(foreign_key="users.id", primary_key=True)
+    metric: str = Field(primary_key=True)   # e.g. "audio_briefings"
+    period: str = Field(primary_key=True)   # "all", "2026-10" (month) or "2026-10-18" (day)
+
+    used: int = Field(default=0, nullable=False)
+    # Held by requests still generating; turned into `used` on success
+    reserved: int = Field(default=0, nullable=False)
+    # Last reservation; reservations older than the TTL are ignored, so a
+    # crashed request can't hold a credit forever
+    reserved_at: Optional[datetime] = Field(default=None, nullable=True)
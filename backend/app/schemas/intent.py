@@ -1,18 +1,46 @@
 from __future__ import annotations
 
 from datetime import datetime, timezone
+from enum import Enum
 from typing import Optional
 import uuid
 
 from sqlmodel import SQLModel, Field
 
 
+# ---- Enums (single source of truth) ----
+
+class FocusType(str, Enum):
+    general = "general"
+    politics = "politics"
+    economy = "economy"
+    crime = "crime"
+    weather = "weather"
+    local_life = "local_life"                # weather, traffic, services
+    sports_entertainment = "sports_entertainment"
+    mixed = "mixed"
+
+
+class IntentLabel(str, Enum):
+    local_news_overview = "local_news_overview"
+    crime_and_security = "crime_and_security"
+    economy_and_jobs = "economy_and_jobs"
+    politics_and_governance = "politics_and_governance"
+    events_and_fun = "events_and_fun"
+    sports_updates = "sports_updates"
+    weather = "weather"
+    other = "other"
+
+
 class IntentRequest(SQLModel):
     """What the client sends to /api/intent."""
     query: str
     persona: str
     # "audio" = voice only, "summary" = text only, "both" = text + voice
     output_mode: str = "both"
+    # Return a URL that plays while TTS is still running, instead of
+    # waiting for the full clip to be synthesized and uploaded
+    stream_audio: bool = False
 
 
 class Intent(SQLModel):
@@ -32,4 +60,4 @@ class Intent(SQLModel):
     topic: str | None = None 
     tags: list[str] | None = None
     raw_query: str
-    intent_label: str
\ No newline at end of file
+    intent_label: str
@@ -1,7 +1,7 @@
 from pydantic import BaseModel, EmailStr
 from typing import Optional, List
 from uuid import UUID
-from app.models.audio_briefing import AudioBriefing
+from datetime import datetime
 
 
 
@@ -25,5 +25,27 @@ class UserUpdateModel(BaseModel):
 
 
 
+class BriefingSummary(BaseModel):
+    """A history list item: the briefing without its full script."""
+    id: UUID
+    user_id: UUID
+    search_history_id: Optional[UUID] = None
+    query: str
+    persona: str
+    city: Optional[str] = None
+    country: Optional[str] = None
+    output_mode: str
+    audio_url: Optional[str] = None
+    audio_filename: Optional[str] = None
+    created_at: datetime
+    # Start of the script, for list previews
+    preview: str = ""
+
+    class Config:
+        from_attributes = True
+
+
 class UserHistoryResponse(BaseModel):
-    briefings: List[AudioBriefing] = []
+    briefings: List[BriefingSummary] = []
+    # Pass as ?cursor= for the next (older) page; None on the last page
+    next_cursor: Optional[str] = None
@@ -0,0 +1,95 @@
+# app/services/article_store.py
+from __future__ import annotations
+
+from datetime import datetime, timedelta, timezone
+from typing import List, Optional
+
+from sqlalchemy import text
+from sqlalchemy.dialects.postgresql import insert
+from sqlmodel import select
+
+from app.core.config import settings
+from app.core.db import async_session_factory
+from app.models.news_article import Article, ARTICLE_SEARCH_VECTOR_SQL
+
+
+# How far back a Google News timeframe reaches
+TIMEFRAME_WINDOWS = {
+    "1h": timedelta(hours=1),
+    "1d": timedelta(days=1),
+    "7d": timedelta(days=7),
+    "1m": timedelta(days=30),
+}
+DEFAULT_WINDOW = timedelta(days=30)
+
+
+async def save_articles(articles: List[Article]) -> int:
+    """
+    Upsert fetched articles into the articles table, deduplicated by url.
+    Existing rows only get their fetched_at bumped. Returns rows written.
+
+    Uses its own session so it can run in the background, outside the
+    request's unit of work.
+    """
+    if not articles:
+        return 0
+
+    now = datetime.now(timezone.utc)
+    rows = {}
+    for a in articles:
+        rows[a.url] = {
+            "id": a.id,
+            "title": a.title,
+            "url": a.url,
+            "source": a.source,
+            "published_at": a.published_at,
+            "snippet": a.snippet,
+            "fetched_at": now,
+        }
+
+    stmt = insert(Article).values(list(rows.values()))
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[Article.url],
+        set_={"fetched_at": stmt.excluded.fetched_at},
+    )
+
+    async with async_session_factory() as session:
+        result = await session.execute(stmt)
+        await session.commit()
+    return result.rowcount or 0
+
+
+async def find_recent_articles(
+    *,
+    place: Optional[str],
+    terms: List[str],
+    timeframe: Optional[str],
+    limit: int = 100,
+) -> List[Article]:
+    """
+    Articles about `place` matching any of `terms`, published within the
+    timeframe and fetched from Google News recently enough to still count
+    as current (settings.NEWS_STORE_FRESH_SECONDS). Newest first.
+    """
+    now = datetime.now(timezone.utc)
+    stmt = select(Article).where(
+        Article.published_at >= now - TIMEFRAME_WINDOWS.get(timeframe or "", DEFAULT_WINDOW),
+        Article.fetched_at >= now - timedelta(seconds=settings.NEWS_STORE_FRESH_SECONDS),
+    )
+
+    if place:
+        stmt = stmt.where(
+            text(f"{ARTICLE_SEARCH_VECTOR_SQL} @@ plainto_tsquery('english'::regconfig, :place)")
+            .bindparams(place=place)
+        )
+    if terms:
+        stmt = stmt.where(
+            text(f"{ARTICLE_SEARCH_VECTOR_SQL} @@ websearch_to_tsquery('english'::regconfig, :terms)")
+            .bindparams(terms=" or ".join(terms))
+        )
+
+    stmt = stmt.order_by(Article.published_at.desc()).limit(limit)
+
+    async with async_session_factory() as session:
+        result = await session.execute(stmt)
+        return list(result.scalars().all())
@@ -0,0 +1,106 @@
+# app/services/audio_cache.py
+"""
+Content-addressed audio: a briefing's MP3 is stored under a key derived
+from everything that determines the rendered audio (see
+voice_service.audio_content_key), so an identical script for the same
+voice and settings - including a retry after a failed upload - reuses the
+stored object instead of paying for TTS and storage again.
+"""
+from __future__ import annotations
+
+import logging
+from collections import Counter
+from typing import Optional
+
+from app.core.cache import TTLCache
+from app.core.config import settings
+from app.core.metrics import register_stats
+from app.core.singleflight import SingleFlight
+from app.services.storage_service import get_object_size, upload_audio_stream
+from app.services.voice_service import audio_content_key, stream_briefing_audio
+
+
+logger = logging.getLogger(__name__)
+
+
+# blob name -> size, for objects known to be in storage
+_known_blobs: TTLCache[str, int] = TTLCache(
+    maxsize=settings.AUDIO_CACHE_MAX_ENTRIES,
+    ttl=settings.AUDIO_CACHE_TTL_SECONDS,
+)
+_audio_cache_counts: Counter[str] = Counter()
+
+
+def _audio_cache_stats() -> dict:
+    hits, misses = _audio_cache_counts["hits"], _audio_cache_counts["misses"]
+    return {
+        "hits": hits,
+        "misses": misses,
+        "hit_ratio": round(hits / (hits + misses), 4) if hits + misses else 0.0,
+        "bytes_saved": _audio_cache_counts["bytes_saved"],
+        "bytes_rendered": _audio_cache_counts["bytes_rendered"],
+        "lookup_errors": _audio_cache_counts["lookup_errors"],
+    }
+
+
+register_stats("audio_cache", _audio_cache_stats)
+
+# Jobs in one worker rendering the same clip at once share one TTS run
+_render_flight: SingleFlight[str, str] = SingleFlight()
+register_stats("audio_render_flight", _render_flight.stats)
+
+
+def audio_blob_name(full_script: str, voice_id: str) -> str:
+    return f"{settings.AUDIO_CACHE_PREFIX}{audio_content_key(full_script, voice_id)}.mp3"
+
+
+async def find_cached_audio(full_script: str, voice_id: str) -> Optional[str]:
+    """
+    Blob name of an already rendered identical clip, or None (the caller
+    is expected to render it; counted as a miss).
+    """
+    filename = audio_blob_name(full_script, voice_id)
+
+    size = _known_blobs.get(filename)
+    if size is None:
+        try:
+            size = await get_object_size(filename)
+        except Exception as e:
+            # Treat as a miss: re-rendering is safe, just not free
+            _audio_cache_counts["lookup_errors"] += 1
+            logger.warning("Audio cache lookup failed for %s: %s: %s", filename, type(e).__name__, e)
+        if size is not None:
+            _known_blobs.set(filename, size)
+
+    if size is None:
+        _audio_cache_counts["misses"] += 1
+        return None
+
+    _audio_cache_counts["hits"] += 1
+    _audio_cache_counts["bytes_saved"] += size
+    return filename
+
+
+def remember_audio(filename: str, size: int) -> None:
+    """Record a freshly rendered and stored clip."""
+    _known_blobs.set(filename, size)
+    _audio_cache_counts["bytes_rendered"] += size
+
+
+async def render_audio_cached(full_script: str, voice_id: str) -> str:
+    """
+    Blob name of the clip for this script and voice, rendering and
+    uploading it only if no identical clip is stored yet.
+    """
+    filename = audio_blob_name(full_script, voice_id)
+    return await _render_flight.do(filename, lambda: _render(full_script, voice_id, filename))
+
+
+async def _render(full_script: str, voice_id: str, filename: str) -> str:
+    cached = await find_cached_audio(full_script, voice_id)
+    if cached is not None:
+        return cached
+
+    size = await upload_audio_stream(stream_briefing_audio(full_script, voice_id), filename)
+    remember_audio(filename, size)
+    return filename
@@ -0,0 +1,196 @@
+# app/services/audio_jobs.py
+"""
+DB-backed queue for rendering briefing audio outside the request.
+
+The API enqueues an AudioJob next to the briefing it belongs to; worker
+processes (python -m app.worker) claim jobs with SELECT ... FOR UPDATE
+SKIP LOCKED, so any number of them can share the table without handing
+out the same job twice.
+
+Briefings rendered live by an API process (app.services.audio_stream)
+get a job too, created already running: workers leave it alone unless
+that process dies and the job goes stale, and then render it themselves.
+"""
+from __future__ import annotations
+
+import logging
+from datetime import datetime, timedelta, timezone
+from typing import List, Optional
+
+from elevenlabs.core.api_error import ApiError as ElevenLabsApiError
+from sqlalchemy import and_, or_, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlmodel import select
+
+from app.core.config import settings
+from app.core.db import async_session_factory
+from app.models.audio_briefing import AudioBriefing
+from app.models.audio_job import AudioJob
+from app.models.persona import PERSONAS
+from app.services.audio_cache import render_audio_cached
+from app.services.storage_service import get_audio_signed_url
+
+
+logger = logging.getLogger(__name__)
+
+
+def enqueue_audio_job(db: AsyncSession, briefing_id) -> AudioJob:
+    """Add a job for the briefing to the session; it is queued on commit."""
+    job = AudioJob(briefing_id=briefing_id)
+    db.add(job)
+    return job
+
+
+def start_live_audio_job(db: AsyncSession, briefing_id) -> AudioJob:
+    """
+    Add a job for audio this process renders live (see start_live_audio).
+    It is saved as running, and reclaimed by a worker if it goes stale.
+    """
+    job = AudioJob(
+        briefing_id=briefing_id,
+        status="running",
+        attempts=1,
+        started_at=datetime.now(timezone.utc),
+    )
+    db.add(job)
+    return job
+
+
+async def get_audio_job(db: AsyncSession, briefing_id) -> Optional[AudioJob]:
+    result = await db.execute(select(AudioJob).where(AudioJob.briefing_id == briefing_id))
+    return result.scalars().first()
+
+
+async def claim_audio_job() -> Optional[AudioJob]:
+    """
+    Mark the oldest runnable job as running and return it, or None when
+    the queue is empty. Queued jobs are runnable once their run_after has
+    passed; jobs left "running" longer than AUDIO_JOB_STALE_SECONDS
+    (crashed worker) are runnable again.
+    """
+    now = datetime.now(timezone.utc)
+    stale_before = now - timedelta(seconds=settings.AUDIO_JOB_STALE_SECONDS)
+
+    async with async_session_factory() as session:
+        result = await session.execute(
+            select(AudioJob)
+            .where(or_(
+                and_(
+                    AudioJob.status == "queued",
+                    or_(AudioJob.run_after.is_(None), AudioJob.run_after <= now),
+                ),
+                and_(AudioJob.status == "running", AudioJob.started_at < stale_before),
+            ))
+            .order_by(AudioJob.created_at)
+            .limit(1)
+            .with_for_update(skip_locked=True)
+        )
+        job = result.scalars().first()
+        if job is None:
+            return None
+
+        job.status = "running"
+        job.attempts += 1
+        job.started_at = now
+        job.run_after = None
+        await session.commit()
+        return job
+
+
+def _failure_message(exc: Exception) -> str:
+    if isinstance(exc, ElevenLabsApiError) and exc.status_code == 402:
+        return "Audio generation requires a paid ElevenLabs plan. Switch to 'Summary' mode to get a written briefing instead."
+    return "Audio generation failed. Try again, or switch to 'Summary' mode."
+
+
+def _retry_delay(attempts: int) -> timedelta:
+    seconds = settings.AUDIO_JOB_RETRY_BASE_SECONDS * 2 ** max(attempts - 1, 0)
+    return timedelta(seconds=min(seconds, settings.AUDIO_JOB_RETRY_MAX_SECONDS))
+
+
+def _is_retryable(exc: Exception) -> bool:
+    # Billing and request errors won't go away on their own
+    if isinstance(exc, ElevenLabsApiError) and exc.status_code is not None:
+        return exc.status_code == 429 or exc.status_code >= 500
+    return True
+
+
+def _failure_values(exc: Exception, attempts: int) -> dict:
+    """Job columns after a failed attempt: queued again with backoff, or failed."""
+    now = datetime.now(timezone.utc)
+    if _is_retryable(exc) and attempts < settings.AUDIO_JOB_MAX_ATTEMPTS:
+        return dict(status="queued", error=_failure_message(exc),
+                    run_after=now + _retry_delay(attempts), finished_at=None)
+    return dict(status="failed", error=_failure_message(exc), run_after=None, finished_at=now)
+
+
+async def complete_audio_jobs(
+    briefing_ids: List, audio_url: str, filename: str
+) -> None:
+    """Record a stored clip on the briefings and mark their jobs done."""
+    async with async_session_factory() as session:
+        await session.execute(
+            update(AudioBriefing)
+            .where(AudioBriefing.id.in_(briefing_ids))
+            .values(audio_url=audio_url, audio_filename=filename)
+        )
+        await session.execute(
+            update(AudioJob)
+            .where(AudioJob.briefing_id.in_(briefing_ids))
+            .values(status="done", error=None, run_after=None,
+                    finished_at=datetime.now(timezone.utc))
+        )
+        await session.commit()
+
+
+async def fail_audio_jobs(briefing_ids: List, exc: Exception, attempts: int) -> None:
+    """Requeue (with backoff) or fail the briefings' jobs after `exc`."""
+    async with async_session_factory() as session:
+        await session.execute(
+            update(AudioJob)
+            .where(AudioJob.briefing_id.in_(briefing_ids))
+            .values(**_failure_values(exc, attempts))
+        )
+        await session.commit()
+
+
+async def _finish_job(job: AudioJob, **values) -> None:
+    async with async_session_factory() as session:
+        db_job = await session.get(AudioJob, job.id)
+        if db_job is None:
+            return
+        for name, value in values.items():
+            setattr(db_job, name, value)
+        await session.commit()
+
+
+async def run_audio_job(job: AudioJob) -> None:
+    """TTS + upload for a claimed job, then record the result."""
+    async with async_session_factory() as session:
+        briefing = await session.get(AudioBriefing, job.briefing_id)
+
+    if briefing is None:
+        await _finish_job(job, status="failed", error="Briefing not found",
+                          finished_at=datetime.now(timezone.utc))
+        return
+    if job.attempts > settings.AUDIO_JOB_MAX_ATTEMPTS:
+        # Reclaimed from workers that kept dying on it
+        await _finish_job(job, status="failed", error=_failure_message(RuntimeError()),
+                          finished_at=datetime.now(timezone.utc))
+        return
+
+    try:
+        voice_id = PERSONAS[briefing.persona].elevenlabs_voice_id
+        # Reuses an identical stored clip, e.g. when a retry follows a
+        # render whose bookkeeping failed after the upload
+        filename = await render_audio_cached(briefing.script, voice_id)
+        audio_url = get_audio_signed_url(filename)
+    except Exception as e:
+        values = _failure_values(e, job.attempts)
+        logger.warning("Audio job %s failed (attempt %d, now %s): %s: %s",
+                       job.id, job.attempts, values["status"], type(e).__name__, e)
+        await _finish_job(job, **values)
+        return
+
+    await complete_audio_jobs([job.briefing_id], audio_url, filename)
+    logger.info("Audio job %s done: %s", job.id, filename)
@@ -0,0 +1,265 @@
+# app/services/audio_stream.py
+"""
+Live audio for briefings whose TTS is still running.
+
+A producer task reads the ElevenLabs stream and buffers the MP3 chunks
+in memory for listeners (each listener replays from the start, then
+follows along). The storage upload follows the same buffer, so the clip
+is stored as soon as synthesis finishes, and its URL is recorded on the
+briefing. The producer never depends on a listener, so a client
+disconnecting doesn't cut the stored audio short.
+
+The buffer holds at most AUDIO_STREAM_BUFFER_MAX_BYTES plus whatever the
+upload hasn't read yet. Past that, the oldest chunks are dropped: the
+session stops taking new listeners (they wait for the stored clip), and
+a listener still reading a dropped chunk is disconnected. Once the clip
+is stored, the session is forgotten right away, so later players get
+storage, not memory.
+
+Briefings with an identical script and voice started before that clip
+is stored share its session instead of paying for TTS again: while the
+producer hasn't begun recording the result they are recorded along with
+the others, afterwards they wait for the outcome and record it
+themselves.
+
+Sessions live in this process only. Each briefing's AudioJob stays
+"running" until the clip is stored, so other API processes report the
+audio as pending (and the stream URL answers 503 there) rather than
+handing out a URL for a blob that doesn't exist yet. If this process dies
+first, the job goes stale and an audio worker renders the clip instead.
+"""
+from __future__ import annotations
+
+import asyncio
+import logging
+import uuid
+from collections import Counter
+from typing import AsyncIterator, Dict, List, Optional
+
+from app.core.config import settings
+from app.core.metrics import register_stats
+from app.services.audio_cache import remember_audio
+from app.services.audio_jobs import complete_audio_jobs, fail_audio_jobs
+from app.services.storage_service import get_audio_signed_url, upload_audio_stream
+from app.services.voice_service import stream_briefing_audio
+
+
+logger = logging.getLogger(__name__)
+
+
+class LiveAudio:
+    """MP3 chunks produced so far for one clip, up to a byte budget."""
+
+    def __init__(self, max_bytes: int) -> None:
+        # Briefings playing this clip. The producer records its result on
+        # those attached before `sealed`; later ones await `stored`.
+        self.briefing_ids: List[uuid.UUID] = []
+        self.sealed = False
+        # Resolves to the blob name once stored, or None if that failed
+        self.stored: asyncio.Future[Optional[str]] = asyncio.get_running_loop().create_future()
+        # chunks[i] is chunk number start + i; earlier ones were dropped
+        self.chunks: List[bytes] = []
+        self.start = 0
+        self.size = 0
+        self.max_bytes = max_bytes
+        self.done = False
+        self.failed = False
+        # Next chunk number per reader; required readers (the upload) are
+        # never cut off, so their unread chunks are always kept
+        self._positions: Dict[object, int] = {}
+        self._required: set[object] = set()
+        self._cond = asyncio.Condition()
+
+    @property
+    def complete(self) -> bool:
+        """Whether the clip can still be replayed from its first chunk."""
+        return self.start == 0
+
+    async def append(self, chunk: bytes) -> None:
+        async with self._cond:
+            self.chunks.append(chunk)
+            self.size += len(chunk)
+            self._trim()
+            self._cond.notify_all()
+
+    def _trim(self) -> None:
+        end = self.start + len(self.chunks)
+        floor = min((self._positions[r] for r in self._required), default=end)
+        while self.size > self.max_bytes and self.start < floor:
+            self.size -= len(self.chunks.pop(0))
+            self.start += 1
+
+    async def finish(self, failed: bool = False) -> None:
+        async with self._cond:
+            self.done = True
+            self.failed = failed
+            self._cond.notify_all()
+
+    def follow(self, required: bool = False) -> AsyncIterator[bytes]:
+        """
+        Every chunk from the first one on. Call only while `complete`; the
+        reader holds its place from this call, not from its first read.
+        """
+        reader = object()
+        self._positions[reader] = self.start
+        if required:
+            self._required.add(reader)
+        return self._read(reader)
+
+    async def _read(self, reader: object) -> AsyncIterator[bytes]:
+        try:
+            while True:
+                async with self._cond:
+                    sent = self._positions[reader]
+                    end = lambda: self.start + len(self.chunks)
+                    await self._cond.wait_for(lambda: end() > sent or self.done)
+                    if sent < self.start:
+                        raise RuntimeError("Listener fell too far behind the live audio")
+                    new = self.chunks[sent - self.start:]
+                    self._positions[reader] = sent + len(new)
+                    finished = self.done and self._positions[reader] >= end()
+                    if new and reader in self._required:
+                        # This reader may have been holding the buffer back
+                        self._trim()
+                for chunk in new:
+                    yield chunk
+                if finished:
+                    if self.failed:
+                        raise RuntimeError("Audio synthesis failed mid-stream")
+                    return
+        finally:
+            self._positions.pop(reader, None)
+            self._required.discard(reader)
+
+
+_live: Dict[uuid.UUID, LiveAudio] = {}
+# blob name -> session rendering it
+_live_by_blob: Dict[str, LiveAudio] = {}
+_producers: set[asyncio.Task] = set()
+_live_counts: Counter[str] = Counter()
+
+
+def _live_audio_stats() -> dict:
+    return {
+        "active": len(_live),
+        "buffered_bytes": sum(live.size for live in set(_live.values())),
+        **{k: _live_counts[k] for k in ("started", "shared", "completed", "failed")},
+    }
+
+
+register_stats("live_audio", _live_audio_stats)
+
+
+async def _synthesize(live: LiveAudio, full_script: str, voice_id: str) -> None:
+    try:
+        async for chunk in stream_briefing_audio(full_script, voice_id):
+            await live.append(chunk)
+    except BaseException:
+        await live.finish(failed=True)
+        raise
+    await live.finish()
+
+
+async def _produce(
+    live: LiveAudio,
+    full_script: str,
+    voice_id: str,
+    filename: str,
+) -> None:
+    synthesis = asyncio.create_task(_synthesize(live, full_script, voice_id))
+    stored = False
+    try:
+        # A failed synthesis makes follow() raise, so no truncated clip is stored
+        size = await upload_audio_stream(live.follow(required=True), filename)
+        await synthesis
+        remember_audio(filename, size)
+        # Only now does the briefing point at the blob
+        live.sealed = True
+        await complete_audio_jobs(list(live.briefing_ids), get_audio_signed_url(filename), filename)
+        stored = True
+        _live_counts["completed"] += 1
+    except Exception as e:
+        _live_counts["failed"] += 1
+        logger.error("Live audio failed for %s (briefings %s): %s: %s",
+                     filename, live.briefing_ids, type(e).__name__, e)
+        live.sealed = True
+        try:
+            # Retryable failures go back to the queue for an audio worker
+            await fail_audio_jobs(list(live.briefing_ids), e, attempts=1)
+        except Exception as e:
+            logger.warning("Recording live audio failure for %s failed: %s: %s", filename, type(e).__name__, e)
+    finally:
+        if not live.stored.done():
+            live.stored.set_result(filename if stored else None)
+
+    # Listeners keep playing even if only the upload failed
+    await asyncio.gather(synthesis, return_exceptions=True)
+
+    if not stored:
+        # Nothing to redirect to yet: stay replayable for re-connecting
+        # players for a while. Current listeners finish either way.
+        await asyncio.sleep(settings.AUDIO_STREAM_LINGER_SECONDS)
+    for briefing_id in live.briefing_ids:
+        _live.pop(briefing_id, None)
+    if _live_by_blob.get(filename) is live:
+        del _live_by_blob[filename]
+
+
+def start_live_audio(
+    briefing_id: uuid.UUID,
+    full_script: str,
+    voice_id: str,
+    filename: str,
+) -> None:
+    """
+    Start synthesizing a briefing's audio in the background, or attach it
+    to the session already producing the same clip (until it is stored).
+    """
+    live = _live_by_blob.get(filename)
+    if live is not None and not live.stored.done():
+        live.briefing_ids.append(briefing_id)
+        _live[briefing_id] = live
+        _live_counts["shared"] += 1
+        if live.sealed:
+            # The producer is already recording its result; record ours
+            # once it knows whether the clip was stored
+            _spawn(_record_when_stored(live, briefing_id))
+        return
+
+    live = LiveAudio(settings.AUDIO_STREAM_BUFFER_MAX_BYTES)
+    live.briefing_ids.append(briefing_id)
+    _live[briefing_id] = live
+    _live_by_blob[filename] = live
+    _live_counts["started"] += 1
+
+    _spawn(_produce(live, full_script, voice_id, filename))
+
+
+def _spawn(coro) -> None:
+    task = asyncio.create_task(coro)
+    _producers.add(task)
+    task.add_done_callback(_producers.discard)
+
+
+async def _record_when_stored(live: LiveAudio, briefing_id: uuid.UUID) -> None:
+    """Record the shared session's outcome on a briefing that joined late."""
+    filename = await live.stored
+    try:
+        if filename is not None:
+            await complete_audio_jobs([briefing_id], get_audio_signed_url(filename), filename)
+        else:
+            await fail_audio_jobs([briefing_id], RuntimeError("Shared live audio failed"), attempts=1)
+    except Exception as e:
+        logger.warning("Recording shared live audio for briefing %s failed: %s: %s",
+                       briefing_id, type(e).__name__, e)
+
+
+def live_audio_chunks(briefing_id: uuid.UUID) -> Optional[AsyncIterator[bytes]]:
+    """
+    MP3 chunks for a briefing being synthesized here, or None (also once
+    the start of the clip has been dropped from memory).
+    """
+    live = _live.get(briefing_id)
+    if live is None or not live.complete:
+        return None
+    return live.follow()
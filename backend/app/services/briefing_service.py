@@ -1,10 +1,10 @@
 # app/services/briefing_service.py
 import json
-from typing import List
+from typing import AsyncIterator, List
 
 from app.schemas.intent import Intent
 from app.models.news_article import Article
-from app.services.llm_client import call_llm_text
+from app.services.llm_client import call_llm_text, stream_llm_text
 from app.models.persona import PersonaConfig  # where PERSONAS lives
 
 
@@ -22,7 +22,12 @@ def _articles_to_payload(articles: List[Article]) -> list[dict]:
     ]
 
 
-def build_brief_intro(intent: Intent, persona: PersonaConfig) -> str:
+async def build_brief_intro(intent: Intent, persona: PersonaConfig) -> str:
+    system_prompt, user_prompt = _intro_prompts(intent, persona)
+    return await call_llm_text(system_prompt, user_prompt)
+
+
+def _intro_prompts(intent: Intent, persona: PersonaConfig) -> tuple[str, str]:
     system_prompt = (
         persona.gemini_system_prompt
         + "\n\nYou are generating only a short intro (1–2 sentences) to a news briefing. "
@@ -31,14 +36,34 @@ def build_brief_intro(intent: Intent, persona: PersonaConfig) -> str:
     )
 
     user_prompt = f"Intent:\n{intent.model_dump_json(indent=2)}\n\nWrite the intro."
-    return call_llm_text(system_prompt, user_prompt)
+    return system_prompt, user_prompt
 
 
-def build_narration_text(
+async def build_narration_text(
     intent: Intent,
     articles: List[Article],
     persona: PersonaConfig,
 ) -> str:
+    system_prompt, user_prompt = _narration_prompts(intent, articles, persona)
+    return await call_llm_text(system_prompt, user_prompt)
+
+
+async def stream_narration_text(
+    intent: Intent,
+    articles: List[Article],
+    persona: PersonaConfig,
+) -> AsyncIterator[str]:
+    """Like build_narration_text, but yields the script as Gemini writes it."""
+    system_prompt, user_prompt = _narration_prompts(intent, articles, persona)
+    async for delta in stream_llm_text(system_prompt, user_prompt):
+        yield delta
+
+
+def _narration_prompts(
+    intent: Intent,
+    articles: List[Article],
+    persona: PersonaConfig,
+) -> tuple[str, str]:
     base_style = """
     there has been a short intro, so start this narration like you are continuing what you were saying..
 You are generating an approximately 2 minute spoken news briefing (about 250 words, 5000 characters max).
@@ -76,4 +101,4 @@ If different articles disagree, mention that briefly instead of choosing a side.
         "Write the full spoken narration script."
     )
 
-    return call_llm_text(system_prompt, user_prompt)
+    return system_prompt, user_prompt
@@ -0,0 +1,139 @@
+# app/services/dedup.py
+"""
+Near-duplicate detection for fetched articles.
+
+Google News often returns one wire story syndicated by several outlets,
+each with its own URL and a slightly reworded title. We shingle the title
+and snippet, build a MinHash signature per article, and use LSH banding so
+only articles sharing a band are ever compared. That keeps the whole pass
+linear in the number of articles.
+"""
+from __future__ import annotations
+
+import hashlib
+import html
+import re
+from typing import Dict, List, Optional
+
+from app.core.config import settings
+from app.models.news_article import Article
+
+
+NUM_PERM = 32
+BANDS = 16
+ROWS = NUM_PERM // BANDS
+
+# Each article is compared with at most this many earlier articles per
+# band bucket, so a big cluster of copies can't make the pass quadratic
+_MAX_BUCKET_PEERS = 8
+
+_MASK_64 = (1 << 64) - 1
+
+
+def _seed(label: str) -> int:
+    return int.from_bytes(hashlib.blake2b(label.encode(), digest_size=8).digest(), "big")
+
+
+# Multiply-shift hash family with fixed seeds, so signatures (and thus
+# results) are reproducible across runs; `a` must be odd
+_PERMUTATIONS = [(_seed(f"a{i}") | 1, _seed(f"b{i}")) for i in range(NUM_PERM)]
+
+_TAG_RE = re.compile(r"<[^>]+>")
+_WORD_RE = re.compile(r"[a-z0-9]+")
+
+_STOPWORDS = frozenset({
+    "a", "an", "the", "and", "or", "of", "in", "on", "at", "to", "for", "with",
+    "by", "from", "as", "is", "are", "was", "were", "be", "it", "its", "this",
+    "that", "after", "over", "amid", "says", "said",
+})
+
+
+def article_words(article: Article) -> list[str]:
+    title = article.title or ""
+    # Drop the " - Publisher" suffix Google News adds to titles
+    head, sep, _ = title.rpartition(" - ")
+    if sep and head:
+        title = head
+
+    snippet = html.unescape(_TAG_RE.sub(" ", article.snippet or ""))
+    words = _WORD_RE.findall(f"{title} {snippet}".casefold())
+
+    # Outlet names in the snippet differ between copies of the same story
+    source_words = set(_WORD_RE.findall((article.source or "").casefold()))
+    return [w for w in words if w not in _STOPWORDS and w not in source_words]
+
+
+def _shingles(words: list[str]) -> set[str]:
+    # Single words plus word bigrams: titles are too short for longer shingles
+    return set(words) | {f"{a} {b}" for a, b in zip(words, words[1:])}
+
+
+def _minhash(shingles: set[str]) -> tuple[int, ...]:
+    hashes = [
+        int.from_bytes(hashlib.blake2b(s.encode(), digest_size=8).digest(), "big")
+        for s in shingles
+    ]
+    if not hashes:
+        return ()
+    return tuple(
+        min(((a * h + b) & _MASK_64) >> 32 for h in hashes)
+        for a, b in _PERMUTATIONS
+    )
+
+
+def _similarity(sig_a: tuple[int, ...], sig_b: tuple[int, ...]) -> float:
+    # Fraction of matching slots estimates the Jaccard similarity
+    return sum(x == y for x, y in zip(sig_a, sig_b)) / NUM_PERM
+
+
+def collapse_near_duplicates(
+    articles: List[Article],
+    threshold: Optional[float] = None,
+) -> List[Article]:
+    """
+    Collapse clusters of near-duplicate articles, keeping the freshest
+    article of each cluster. Order of the kept articles is preserved.
+
+    `threshold` is the estimated Jaccard similarity (0-1) over title and
+    snippet shingles at which two articles count as the same story;
+    defaults to settings.NEAR_DUP_SIMILARITY_THRESHOLD.
+    """
+    if len(articles) < 2:
+        return list(articles)
+
+    threshold = settings.NEAR_DUP_SIMILARITY_THRESHOLD if threshold is None else threshold
+
+    signatures = [_minhash(_shingles(article_words(a))) for a in articles]
+
+    parent = list(range(len(articles)))
+
+    def find(i: int) -> int:
+        while parent[i] != i:
+            parent[i] = parent[parent[i]]
+            i = parent[i]
+        return i
+
+    buckets: Dict[tuple, list[int]] = {}
+    for i, sig in enumerate(signatures):
+        if not sig:
+            continue
+        for band in range(BANDS):
+            key = (band, sig[band * ROWS:(band + 1) * ROWS])
+            peers = buckets.setdefault(key, [])
+            for j in peers:
+                root_i, root_j = find(i), find(j)
+                if root_i != root_j and _similarity(sig, signatures[j]) >= threshold:
+                    parent[root_i] = root_j
+            if len(peers) < _MAX_BUCKET_PEERS:
+                peers.append(i)
+
+    # Freshest article represents its cluster (url breaks ties deterministically)
+    best: Dict[int, int] = {}
+    for i, art in enumerate(articles):
+        root = find(i)
+        current = best.get(root)
+        if current is None or (art.published_at, art.url) > (articles[current].published_at, articles[current].url):
+            best[root] = i
+
+    keep = set(best.values())
+    return [art for i, art in enumerate(articles) if i in keep]
@@ -0,0 +1,143 @@
+# app/services/feed_parser.py
+"""
+Google News RSS -> Article parsing on top of fastfeedparser.
+
+Prefetch and cache-fill jobs parse thousands of entries a minute, so this
+skips everything the briefing pipeline doesn't read (content, media,
+enclosures, tags), parses dates without strptime, and builds Articles
+without re-validating fields we already know are well-formed (Article
+is a table model, and SQLModel doesn't validate those on __init__).
+See benchmarks/bench_feed_parser.py for the comparison with feedparser.
+"""
+from __future__ import annotations
+
+from datetime import datetime, timedelta, timezone
+from functools import lru_cache
+from typing import List, Optional
+
+import fastfeedparser
+
+from app.models.news_article import Article
+
+
+_MONTHS = {
+    "jan": 1, "feb": 2, "mar": 3, "apr": 4, "may": 5, "jun": 6,
+    "jul": 7, "aug": 8, "sep": 9, "oct": 10, "nov": 11, "dec": 12,
+}
+
+# Numeric offsets only need a sign; named zones Google News actually uses
+_ZONE_OFFSETS_MIN = {"GMT": 0, "UT": 0, "UTC": 0, "Z": 0, "EST": -300, "EDT": -240,
+                     "CST": -360, "CDT": -300, "MST": -420, "MDT": -360,
+                     "PST": -480, "PDT": -420}
+
+
+def _parse_rfc822(value: str) -> Optional[datetime]:
+    # "Fri, 17 Oct 2026 08:15:00 GMT" / "17 Oct 2026 08:15:00 +0100"
+    parts = value.replace(",", " ").split()
+    if parts and parts[0][:3].lower() not in _MONTHS and not parts[0].isdigit():
+        parts = parts[1:]  # drop weekday
+    if len(parts) < 4:
+        return None
+
+    day, month, year, clock = parts[:4]
+    month_num = _MONTHS.get(month[:3].lower())
+    if month_num is None:
+        return None
+
+    hms = clock.split(":")
+    hour, minute = int(hms[0]), int(hms[1])
+    second = int(hms[2]) if len(hms) > 2 else 0
+
+    year_num = int(year)
+    if year_num < 100:
+        year_num += 2000
+
+    offset_min = 0
+    if len(parts) > 4:
+        zone = parts[4]
+        if zone[:1] in "+-" and len(zone) == 5:
+            offset_min = int(zone[1:3]) * 60 + int(zone[3:5])
+            if zone[0] == "-":
+                offset_min = -offset_min
+        else:
+            offset_min = _ZONE_OFFSETS_MIN.get(zone.upper(), 0)
+
+    dt = datetime(year_num, month_num, int(day), hour, minute, second, tzinfo=timezone.utc)
+    return dt - timedelta(minutes=offset_min) if offset_min else dt
+
+
+@lru_cache(maxsize=4096)
+def parse_feed_date(value: str) -> Optional[datetime]:
+    """
+    Parse an RSS date (RFC 822) or the ISO 8601 form fastfeedparser
+    normalizes to, returning an aware UTC datetime or None.
+
+    Cached because a feed batch repeats the same timestamps a lot.
+    """
+    value = value.strip()
+    if not value:
+        return None
+    try:
+        if value[0].isdigit() and "T" in value:
+            dt = datetime.fromisoformat(value.replace("Z", "+00:00"))
+            if dt.tzinfo is None:
+                return dt.replace(tzinfo=timezone.utc)
+            return dt.astimezone(timezone.utc)
+        return _parse_rfc822(value)
+    except (ValueError, IndexError):
+        return None
+
+
+def _source_from_title(title: str) -> str:
+    # Google News titles end with " - <Publisher>"
+    head, sep, tail = title.rpartition(" - ")
+    return tail.strip() if sep and head and tail.strip() else "Google News"
+
+
+def _make_article(title: str, url: str, source: str, published_at: datetime, snippet: str) -> Article:
+    # Values come straight from the parser with the right types already.
+    # Not model_construct: it bypasses the ORM instrumentation and fails
+    # on attribute access for table models.
+    return Article(
+        title=title,
+        url=url,
+        source=source,
+        published_at=published_at,
+        snippet=snippet,
+    )
+
+
+def parse_google_news_feed(xml: bytes | str) -> List[Article]:
+    """
+    Parse a Google News RSS document into Articles.
+    Entries without a title or link are skipped.
+    """
+    feed = fastfeedparser.parse(
+        xml,
+        include_content=False,
+        include_tags=False,
+        include_media=False,
+        include_enclosures=False,
+    )
+
+    now = datetime.now(timezone.utc)
+    articles: List[Article] = []
+
+    for entry in feed.get("entries", []):
+        title = entry.get("title")
+        url = entry.get("link")
+        if not title or not url:
+            continue
+
+        published_raw = entry.get("published") or entry.get("updated")
+        published_at = (parse_feed_date(published_raw) if published_raw else None) or now
+
+        articles.append(_make_article(
+            title=title,
+            url=url,
+            source=_source_from_title(title),
+            published_at=published_at,
+            snippet=entry.get("description") or "",
+        ))
+
+    return articles
@@ -1,34 +1,17 @@
 from __future__ import annotations
 
+import re
+from collections import Counter
 from enum import Enum
 from typing import TypedDict
 
-from app.schemas.intent import Intent
+from app.core.cache import TTLCache
+from app.core.config import settings
+from app.core.metrics import register_stats
+from app.core.singleflight import SingleFlight
+from app.schemas.intent import Intent, FocusType, IntentLabel
 from app.services.llm_client import call_llm_json
-
-
-# ---- Enums (single source of truth) ----
-
-class FocusType(str, Enum):
-    general = "general"
-    politics = "politics"
-    economy = "economy"
-    crime = "crime"
-    weather = "weather"
-    local_life = "local_life"                # weather, traffic, services
-    sports_entertainment = "sports_entertainment"
-    mixed = "mixed"
-
-
-class IntentLabel(str, Enum):
-    local_news_overview = "local_news_overview"
-    crime_and_security = "crime_and_security"
-    economy_and_jobs = "economy_and_jobs"
-    politics_and_governance = "politics_and_governance"
-    events_and_fun = "events_and_fun"
-    sports_updates = "sports_updates"
-    weather = "weather"
-    other = "other"
+from app.services.intent_parser import parse_intent_locally
 
 
 class IntentLLMResponse(TypedDict):
@@ -128,7 +111,98 @@ Rules:
 
 
 
+# ---- Intent cache ----
+
+# Filler words that don't change what the user is asking for.
+# Keep this conservative: anything that hints at place, topic or
+# timeframe ("today", "crime", "week") must survive normalization.
+QUERY_STOPWORDS = frozenset({
+    "a", "an", "the", "and", "or",
+    "what", "whats", "is", "are", "was", "were", "be",
+    "in", "on", "at", "of", "for", "to", "about", "with", "from", "around",
+    "me", "my", "i", "you", "can", "could", "please", "want", "know",
+    "tell", "give", "show", "any", "anything", "some", "there",
+    "going", "happening", "hey", "hi", "news",
+})
+
+_NON_WORD_RE = re.compile(r"[^\w\s]+")
+_WHITESPACE_RE = re.compile(r"\s+")
+
+
+def normalize_query(raw_query: str) -> str:
+    """
+    Reduce a query to a cache key: case-folded, punctuation and whitespace
+    collapsed, filler words dropped. Word order is kept.
+
+    "What's happening in Lagos?" and "lagos" both normalize to "lagos".
+    """
+    text = raw_query.casefold().replace("'", "").replace("\u2019", "")
+    text = _NON_WORD_RE.sub(" ", text)
+    words = _WHITESPACE_RE.split(text.strip())
+    kept = [w for w in words if w and w not in QUERY_STOPWORDS]
+    # A query made only of filler words still needs a stable key
+    return " ".join(kept) if kept else " ".join(w for w in words if w)
+
+
+_intent_cache: TTLCache[str, Intent] = TTLCache(
+    maxsize=settings.INTENT_CACHE_MAX_ENTRIES,
+    ttl=settings.INTENT_CACHE_TTL_SECONDS,
+)
+register_stats("intent_cache", _intent_cache.stats)
+
+# How each intent was resolved: "cache", "fast_path" (local parser) or "llm"
+_resolution_counts: Counter[str] = Counter()
+
+
+def _resolution_stats() -> dict:
+    total = sum(_resolution_counts.values())
+    return {
+        **{k: _resolution_counts[k] for k in ("cache", "fast_path", "llm")},
+        "llm_share": round(_resolution_counts["llm"] / total, 4) if total else 0.0,
+    }
+
+
+register_stats("intent_resolution", _resolution_stats)
+
+# Identical queries arriving together (a trending topic) share one LLM call
+_intent_flight: SingleFlight[str, Intent] = SingleFlight()
+register_stats("intent_flight", _intent_flight.stats)
+
+
 async def create_intent_from_query(raw_query: str) -> Intent:
+    """
+    Parse a query into an Intent. Repeats of the same normalized query come
+    from the intent cache, and simple "<place> <focus>" queries are handled
+    by the local rule-based parser; only the rest go to Gemini.
+
+    Callers always get their own copy, so mutating the returned Intent
+    (e.g. fetch_articles_for_intent rewriting timeframe) can't leak back
+    into the cache.
+    """
+    cache_key = normalize_query(raw_query)
+
+    cached = _intent_cache.get(cache_key)
+    if cached is not None:
+        _resolution_counts["cache"] += 1
+        return cached.model_copy(deep=True, update={"raw_query": raw_query})
+
+    local = parse_intent_locally(raw_query)
+    if local is not None and local.confidence >= settings.INTENT_FAST_PATH_MIN_CONFIDENCE:
+        _resolution_counts["fast_path"] += 1
+        return local.intent
+
+    intent = await _intent_flight.do(cache_key, lambda: _resolve_with_llm(cache_key, raw_query))
+    return intent.model_copy(deep=True, update={"raw_query": raw_query})
+
+
+async def _resolve_with_llm(cache_key: str, raw_query: str) -> Intent:
+    _resolution_counts["llm"] += 1
+    intent = await _create_intent_with_llm(raw_query)
+    _intent_cache.set(cache_key, intent.model_copy(deep=True))
+    return intent
+
+
+async def _create_intent_with_llm(raw_query: str) -> Intent:
     llm_result: IntentLLMResponse = await call_llm_json(
         system_prompt=INTENT_SYSTEM_PROMPT,
         user_prompt=f"User query: {raw_query}",
@@ -0,0 +1,221 @@
+# app/services/intent_parser.py
+"""
+Deterministic, LLM-free intent parser for the easy queries
+("lagos crime", "weather in Berlin this week", "what's happening in Accra").
+
+It only answers when it is confident; anything it doesn't fully understand
+is left to Gemini via create_intent_from_query.
+"""
+from __future__ import annotations
+
+import json
+import re
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, Optional
+
+from app.schemas.intent import Intent, FocusType, IntentLabel
+
+
+_GAZETTEER_PATH = Path(__file__).resolve().parent.parent / "data" / "gazetteer.json"
+
+_TOKEN_RE = re.compile(r"[a-z0-9]+")
+
+# Longest place name in the gazetteer, in words ("ho chi minh city")
+_MAX_PLACE_WORDS = 4
+
+
+def _tokenize(text: str) -> list[str]:
+    text = text.casefold().replace("'", "").replace("’", "")
+    return _TOKEN_RE.findall(text)
+
+
+@dataclass(frozen=True)
+class Place:
+    city: Optional[str]
+    country: str
+    country_code: str
+
+
+def _load_gazetteer() -> Dict[tuple[str, ...], Place]:
+    with open(_GAZETTEER_PATH, encoding="utf-8") as f:
+        data = json.load(f)
+
+    places: Dict[tuple[str, ...], Place] = {}
+
+    for name, code in data["countries"].items():
+        places[tuple(_tokenize(name))] = Place(city=None, country=name, country_code=code)
+    for alias, name in data["country_aliases"].items():
+        places[tuple(_tokenize(alias))] = places[tuple(_tokenize(name))]
+
+    # Cities win over countries with the same name (Luxembourg, Singapore)
+    for name, info in data["cities"].items():
+        places[tuple(_tokenize(name))] = Place(
+            city=name, country=info["country"], country_code=info["country_code"]
+        )
+    for alias, name in data["city_aliases"].items():
+        places[tuple(_tokenize(alias))] = places[tuple(_tokenize(name))]
+
+    return places
+
+
+GAZETTEER: Dict[tuple[str, ...], Place] = _load_gazetteer()
+
+
+@dataclass(frozen=True)
+class FocusRule:
+    focus: FocusType
+    intent_label: IntentLabel
+    topic: str
+    tags: tuple[str, ...]
+
+
+_FOCUS_RULES = {
+    "crime": FocusRule(FocusType.crime, IntentLabel.crime_and_security, "crime", ("crime", "police", "security")),
+    "weather": FocusRule(FocusType.weather, IntentLabel.weather, "weather", ("weather", "forecast")),
+    "sports": FocusRule(FocusType.sports_entertainment, IntentLabel.sports_updates, "sports", ("sports", "football", "results")),
+    "economy": FocusRule(FocusType.economy, IntentLabel.economy_and_jobs, "economy", ("economy", "jobs", "prices", "business")),
+    "politics": FocusRule(FocusType.politics, IntentLabel.politics_and_governance, "politics", ("politics", "government", "elections")),
+    "events": FocusRule(FocusType.local_life, IntentLabel.events_and_fun, "events", ("events", "concerts", "festivals")),
+    "general": FocusRule(FocusType.general, IntentLabel.local_news_overview, "general", ()),
+}
+
+# keyword -> key into _FOCUS_RULES
+FOCUS_KEYWORDS: Dict[str, str] = {
+    **dict.fromkeys(
+        ["crime", "crimes", "police", "robbery", "robberies", "shooting", "shootings",
+         "security", "safety", "kidnapping", "kidnappings", "violence", "protest", "protests"],
+        "crime",
+    ),
+    **dict.fromkeys(
+        ["weather", "forecast", "rain", "storm", "storms", "flood", "floods",
+         "flooding", "heatwave", "temperature"],
+        "weather",
+    ),
+    **dict.fromkeys(
+        ["sport", "sports", "football", "soccer", "basketball", "match", "matches",
+         "league", "game", "games", "team", "teams"],
+        "sports",
+    ),
+    **dict.fromkeys(
+        ["economy", "economic", "jobs", "job", "inflation", "prices", "business",
+         "markets", "market"],
+        "economy",
+    ),
+    **dict.fromkeys(
+        ["politics", "political", "election", "elections", "government",
+         "governor", "president", "policy", "policies"],
+        "politics",
+    ),
+    **dict.fromkeys(
+        ["events", "concerts", "concert", "festival", "festivals", "nightlife",
+         "parties", "party", "fun"],
+        "events",
+    ),
+    **dict.fromkeys(
+        ["news", "happening", "headlines", "update", "updates", "overview"],
+        "general",
+    ),
+}
+
+# keyword -> Google News "when" value
+TIMEFRAME_KEYWORDS: Dict[str, str] = {
+    "today": "1d", "tonight": "1d", "now": "1d", "yesterday": "1d", "24h": "1d",
+    "week": "7d", "weekly": "7d", "recent": "7d", "recently": "7d", "latest": "7d",
+    "month": "1m", "monthly": "1m",
+}
+DEFAULT_TIMEFRAME = "1m"
+
+# Words that carry no meaning for the parse; anything else we don't
+# recognise lowers confidence.
+_FILLER_WORDS = frozenset({
+    "a", "an", "the", "and", "in", "on", "at", "of", "for", "to", "about",
+    "with", "from", "around", "near", "me", "my", "i", "you", "us", "can",
+    "could", "please", "want", "know", "tell", "give", "show", "any",
+    "anything", "whats", "what", "is", "are", "was", "there", "going",
+    "this", "past", "last", "right", "so", "far", "hey", "hi", "new",
+    "good", "things", "stuff", "some", "todays", "s",
+})
+
+
+@dataclass(frozen=True)
+class LocalParse:
+    intent: Intent
+    confidence: float
+
+
+def parse_intent_locally(raw_query: str) -> Optional[LocalParse]:
+    """
+    Try to parse a query without the LLM.
+
+    Returns None when no known place is mentioned. Otherwise returns the
+    Intent with a confidence in [0, 1]: a place plus exactly one focus and
+    no unrecognised words scores 1.0; each unknown word or a conflicting
+    second focus lowers it.
+    """
+    tokens = _tokenize(raw_query)
+    if not tokens:
+        return None
+
+    place: Optional[Place] = None
+    focus_keys: list[str] = []
+    timeframe: Optional[str] = None
+    unknown = 0
+
+    i = 0
+    while i < len(tokens):
+        # Greedy longest match against the gazetteer ("port harcourt" > "port")
+        matched = False
+        for n in range(min(_MAX_PLACE_WORDS, len(tokens) - i), 0, -1):
+            candidate = GAZETTEER.get(tuple(tokens[i:i + n]))
+            if candidate is None:
+                continue
+            if place is not None and place != candidate:
+                # Two different places: leave it to the LLM
+                return None
+            place = candidate
+            i += n
+            matched = True
+            break
+        if matched:
+            continue
+
+        word = tokens[i]
+        i += 1
+        if word in FOCUS_KEYWORDS:
+            key = FOCUS_KEYWORDS[word]
+            if key not in focus_keys:
+                focus_keys.append(key)
+        elif word in TIMEFRAME_KEYWORDS:
+            timeframe = TIMEFRAME_KEYWORDS[word]
+        elif word not in _FILLER_WORDS:
+            unknown += 1
+
+    if place is None:
+        return None
+
+    # "general" words ("news", "updates") only decide the focus on their own
+    specific = [k for k in focus_keys if k != "general"]
+
+    confidence = 0.5
+    if len(specific) == 1 or (not specific and focus_keys):
+        confidence += 0.4
+    elif len(specific) > 1:
+        confidence -= 0.2
+    confidence += 0.1 if unknown == 0 else -0.15 * unknown
+    confidence = max(0.0, min(1.0, confidence))
+
+    rule = _FOCUS_RULES[specific[0] if specific else "general"]
+
+    intent = Intent(
+        raw_query=raw_query,
+        intent_label=rule.intent_label.value,
+        city=place.city,
+        country=place.country,
+        country_code=place.country_code,
+        timeframe=timeframe or DEFAULT_TIMEFRAME,
+        focus=rule.focus.value,
+        topic=rule.topic,
+        tags=list(rule.tags),
+    )
+    return LocalParse(intent=intent, confidence=round(confidence, 2))
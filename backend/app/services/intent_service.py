@@ -1,19 +1,22 @@
 # app/services/intent_service.py
+import uuid
+
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.schemas.intent import Intent
 from app.models.search_history import SearchHistory
 
 
-async def build_intent_and_log(
+async def log_search_history(
     db: AsyncSession,
-    raw_query: str,
+    intent: Intent,
     user_id: str | None,
-    create_intent_from_query,
-) -> Intent:
-    intent = await create_intent_from_query(raw_query)
-    print(intent) #for log purposes
-
+) -> uuid.UUID:
+    """
+    Write the search into the caller's transaction (flush, no commit), so
+    the briefing that references it can follow in the same commit. The id
+    is generated client-side; there's nothing to refresh.
+    """
     search_history = SearchHistory(
         user_id=user_id,
         raw_query=intent.raw_query,
@@ -25,7 +28,5 @@ async def build_intent_and_log(
         focus=intent.focus,
     )
     db.add(search_history)
-    await db.commit()
-    await db.refresh(search_history)
-
-    return intent, search_history.id
\ No newline at end of file
+    await db.flush()
+    return search_history.id
@@ -1,8 +1,9 @@
 # app/services/llm_client.py
 from __future__ import annotations
 
+import asyncio
 import json
-from typing import Any, Dict
+from typing import Any, AsyncIterator, Dict
 
 from google import genai
 from google.genai import types
@@ -12,32 +13,65 @@ from app.core.config import settings
 
 client = genai.Client(api_key=settings.GEMINI_API_KEY)
 
+# Caps how many Gemini requests this worker keeps in flight at once.
+# Extra callers wait here instead of piling up on the upstream API.
+_llm_semaphore = asyncio.Semaphore(settings.LLM_MAX_CONCURRENCY)
 
-async def call_llm_json(system_prompt: str, user_prompt: str) -> Dict[str, Any]:
+
+def _build_contents(system_prompt: str, user_prompt: str) -> list[types.Content]:
+    return [
+        types.Content(
+            role="user",  # Gemini expects 'user' or 'model'
+            parts=[types.Part(text=system_prompt)],
+        ),
+        types.Content(
+            role="user",
+            parts=[types.Part(text=user_prompt)],
+        ),
+    ]
+
+
+async def _generate(
+    contents: list[types.Content],
+    config: types.GenerateContentConfig,
+    timeout: float | None,
+) -> types.GenerateContentResponse:
+    """
+    Run one non-blocking Gemini call, bounded by the worker-wide
+    concurrency limit and a per-call timeout (seconds).
+    """
+    timeout = settings.LLM_TIMEOUT_SECONDS if timeout is None else timeout
+
+    async with _llm_semaphore:
+        try:
+            return await asyncio.wait_for(
+                client.aio.models.generate_content(
+                    model=settings.GEMINI_MODEL_NAME,
+                    contents=contents,
+                    config=config,
+                ),
+                timeout=timeout,
+            )
+        except asyncio.TimeoutError as e:
+            raise RuntimeError(f"LLM call timed out after {timeout}s") from e
+
+
+async def call_llm_json(
+    system_prompt: str,
+    user_prompt: str,
+    *,
+    timeout: float | None = None,
+) -> Dict[str, Any]:
     """
     Call Gemini and return parsed JSON for the intent.
     Expected JSON keys: intent_label, city, country, timeframe, focus, raw_query, etc.
     """
-    
-    contents = [
-    types.Content(
-        role="user",  # Gemini expects 'user' or 'model'
-        parts=[types.Part(text=system_prompt)],
-    ),
-    types.Content(
-        role="user",
-        parts=[types.Part(text=user_prompt)],
-    ),
-]
-
-
-
-    response = client.models.generate_content(
-        model=settings.GEMINI_MODEL_NAME,
-        contents=contents,
-        config=types.GenerateContentConfig(
+    response = await _generate(
+        _build_contents(system_prompt, user_prompt),
+        types.GenerateContentConfig(
             response_mime_type="application/json",  # tell Gemini to reply with JSON
         ),
+        timeout,
     )
 
     text = response.text or ""
@@ -48,32 +82,69 @@ async def call_llm_json(system_prompt: str, user_prompt: str) -> Dict[str, Any]:
         raise ValueError(f"LLM did not return valid JSON: {e}") from e
 
 
+def _text_config() -> types.GenerateContentConfig:
+    return types.GenerateContentConfig(
+        temperature=0.4,
+        top_p=0.9,
+        candidate_count=1,
+    )
+
 
-def call_llm_text(system_prompt: str, user_prompt: str) -> str:
+async def call_llm_text(
+    system_prompt: str,
+    user_prompt: str,
+    *,
+    timeout: float | None = None,
+) -> str:
     """
     Simple text generation: returns response.text.
     Uses system_prompt + user_prompt as the conversation.
     """
-    contents = [
-    types.Content(
-        role="user",  # Gemini expects 'user' or 'model'
-        parts=[types.Part(text=system_prompt)],
-    ),
-    types.Content(
-        role="user",
-        parts=[types.Part(text=user_prompt)],
-    ),
-]
-
-    resp = client.models.generate_content(
-        model=settings.GEMINI_MODEL_NAME,
-        contents=contents,
-        config=types.GenerateContentConfig(
-            temperature=0.4,
-            top_p=0.9,
-            candidate_count=1,
-        ),
+    resp = await _generate(
+        _build_contents(system_prompt, user_prompt),
+        _text_config(),
+        timeout,
     )
 
     text = getattr(resp, "text", "") or ""
     return text.strip()
+
+
+async def stream_llm_text(
+    system_prompt: str,
+    user_prompt: str,
+    *,
+    timeout: float | None = None,
+) -> AsyncIterator[str]:
+    """
+    Same as call_llm_text, but yields text deltas as Gemini streams them.
+    The timeout covers the whole stream, and the call holds a concurrency
+    slot until the stream is drained or closed.
+    """
+    timeout = settings.LLM_TIMEOUT_SECONDS if timeout is None else timeout
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + timeout
+
+    async with _llm_semaphore:
+        try:
+            stream = await asyncio.wait_for(
+                client.aio.models.generate_content_stream(
+                    model=settings.GEMINI_MODEL_NAME,
+                    contents=_build_contents(system_prompt, user_prompt),
+                    config=_text_config(),
+                ),
+                timeout=timeout,
+            )
+            chunks = stream.__aiter__()
+            while True:
+                try:
+                    # The deadline is absolute: time the consumer spends
+                    # between chunks counts against the timeout too
+                    chunk = await asyncio.wait_for(chunks.__anext__(), deadline - loop.time())
+                except StopAsyncIteration:
+                    break
+                text = getattr(chunk, "text", "") or ""
+                if text:
+                    yield text
+        except asyncio.TimeoutError as e:
+            raise RuntimeError(f"LLM stream timed out after {timeout}s") from e
@@ -0,0 +1,101 @@
+# app/services/mp3.py
+"""
+Just enough MPEG audio parsing to concatenate separately rendered MP3
+clips into one valid file: cut each clip at frame boundaries and drop
+what only makes sense at the start of a standalone file (ID3v2 tags and
+the Xing/Info/VBRI header frame, whose frame count would be wrong for
+the joined file).
+"""
+from __future__ import annotations
+
+from typing import Optional
+
+
+# Layer III bitrates in kbps by bitrate index
+_BITRATES_MPEG1 = (0, 32, 40, 48, 56, 64, 80, 96, 112, 128, 160, 192, 224, 256, 320, 0)
+_BITRATES_MPEG2 = (0, 8, 16, 24, 32, 40, 48, 56, 64, 80, 96, 112, 128, 144, 160, 0)
+
+# Sample rates by version bits (3 = MPEG1, 2 = MPEG2, 0 = MPEG2.5)
+_SAMPLE_RATES = {
+    3: (44100, 48000, 32000),
+    2: (22050, 24000, 16000),
+    0: (11025, 12000, 8000),
+}
+
+_VBR_HEADER_TAGS = (b"Xing", b"Info", b"VBRI")
+
+
+def frame_length(header: bytes) -> Optional[int]:
+    """Length in bytes of the Layer III frame starting with `header` (4 bytes), or None."""
+    if len(header) < 4 or header[0] != 0xFF or header[1] & 0xE0 != 0xE0:
+        return None
+
+    version = (header[1] >> 3) & 0x03
+    layer = (header[1] >> 1) & 0x03
+    if version == 1 or layer != 1:  # reserved version / not Layer III
+        return None
+
+    bitrate_index = header[2] >> 4
+    rate_index = (header[2] >> 2) & 0x03
+    padding = (header[2] >> 1) & 0x01
+    if bitrate_index in (0, 15) or rate_index == 3:
+        return None
+
+    mpeg1 = version == 3
+    bitrate = (_BITRATES_MPEG1 if mpeg1 else _BITRATES_MPEG2)[bitrate_index] * 1000
+    sample_rate = _SAMPLE_RATES[version][rate_index]
+    return (144 if mpeg1 else 72) * bitrate // sample_rate + padding
+
+
+def _id3v2_length(buf: bytes | bytearray) -> int:
+    # 10-byte header, syncsafe size, optional 10-byte footer
+    size = 0
+    for b in buf[6:10]:
+        size = (size << 7) | (b & 0x7F)
+    footer = 10 if buf[5] & 0x10 else 0
+    return 10 + size + footer
+
+
+class Mp3FrameFilter:
+    """
+    Incremental filter: feed it a clip's bytes as they arrive and it
+    returns only whole audio frames, without tags or VBR header frames.
+    Bytes of an incomplete trailing frame are dropped at the end.
+    """
+
+    def __init__(self) -> None:
+        self._buf = bytearray()
+        self._seen_frame = False
+
+    def feed(self, data: bytes) -> bytes:
+        buf = self._buf
+        buf += data
+        out = bytearray()
+
+        while len(buf) >= 4:
+            if not self._seen_frame and buf[:3] == b"ID3":
+                if len(buf) < 10:
+                    break
+                tag_length = _id3v2_length(buf)
+                if len(buf) < tag_length:
+                    break
+                del buf[:tag_length]
+                continue
+
+            length = frame_length(buf[:4])
+            if length is None:
+                # Not at a frame header: resync on the next 0xFF
+                next_sync = buf.find(b"\xff", 1)
+                del buf[:next_sync if next_sync != -1 else len(buf)]
+                continue
+            if len(buf) < length:
+                break
+
+            frame = bytes(buf[:length])
+            del buf[:length]
+            if not self._seen_frame and any(tag in frame[:64] for tag in _VBR_HEADER_TAGS):
+                continue
+            self._seen_frame = True
+            out += frame
+
+        return bytes(out)
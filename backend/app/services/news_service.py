@@ -1,14 +1,24 @@
 # app/services/news_service.py
 from __future__ import annotations
 
-from datetime import datetime, timezone
-from typing import List
-import random
-
-from pygooglenews import GoogleNews
+import asyncio
+import logging
+import time
+from collections import Counter
+from typing import List, Tuple
 
+from app.core.cache import TTLCache
+from app.core.config import settings
+from app.core.http import get_http_client
+from app.core.metrics import register_stats
+from app.core.singleflight import SingleFlight
 from app.schemas.intent import Intent
 from app.models.news_article import NewsSearchResponse, Article
+from app.services.feed_parser import parse_google_news_feed
+from app.services.article_store import find_recent_articles, save_articles
+
+
+logger = logging.getLogger(__name__)
 
 
 FOCUS_KEYWORDS = {
@@ -23,14 +33,6 @@ FOCUS_KEYWORDS = {
 }
 
 
-def pick_random_articles(articles: list[Article], max_count: int = 40) -> list[Article]:
-    if not articles:
-        return []
-    k = min(max_count, len(articles))
-    return random.sample(articles, k=k)
-
-
-
 def _fallback_build_query_from_intent(intent: Intent) -> str:
     parts: list[str] = []
 
@@ -64,82 +66,270 @@ def _fallback_build_query_from_intent(intent: Intent) -> str:
 
 
 
+def _intent_terms(intent: Intent) -> List[str]:
+    """Topic and tags, used to match stored articles."""
+    terms = list(intent.tags or [])
+    if intent.topic and intent.topic != "general":
+        terms.insert(0, intent.topic)
+    return terms
+
+
+# ---- Search result cache ----
+
+# (query, country_code, timeframe) -> (articles, fetched_at). Entries live
+# for fresh + stale seconds; past the fresh window they are still served
+# but trigger a background refresh (stale-while-revalidate).
+NewsCacheKey = Tuple[str, str, str]
+
+_news_cache: TTLCache[NewsCacheKey, Tuple[List[Article], float]] = TTLCache(
+    maxsize=settings.NEWS_CACHE_MAX_ENTRIES,
+    ttl=settings.NEWS_CACHE_DEFAULT_FRESH_SECONDS + settings.NEWS_CACHE_STALE_SECONDS,
+)
+_news_cache_counts: Counter[str] = Counter()
+_refreshing: set[NewsCacheKey] = set()
+_background_tasks: set[asyncio.Task] = set()
+
+
+def _news_cache_stats() -> dict:
+    return {
+        **_news_cache.stats(),
+        **{k: _news_cache_counts[k] for k in (
+            "fresh_hits", "stale_hits", "cold_fetches", "store_hits",
+            "refreshes", "refresh_errors", "store_errors",
+        )},
+    }
+
+
+register_stats("news_cache", _news_cache_stats)
+
+# Concurrent cold misses for one search share a single fetch
+_news_flight: SingleFlight[NewsCacheKey, List[Article]] = SingleFlight()
+register_stats("news_flight", _news_flight.stats)
+
+
+def _fresh_seconds(timeframe: str | None) -> int:
+    return settings.NEWS_CACHE_FRESH_SECONDS.get(
+        timeframe or "", settings.NEWS_CACHE_DEFAULT_FRESH_SECONDS
+    )
+
+
+def _spawn(coro) -> None:
+    task = asyncio.create_task(coro)
+    _background_tasks.add(task)
+    task.add_done_callback(_background_tasks.discard)
+
+
+def _cache_articles(key: NewsCacheKey, articles: List[Article]) -> None:
+    # Don't pin empty results: the next request should try Google News again
+    if not articles:
+        return
+    _news_cache.set(
+        key,
+        (articles, time.monotonic()),
+        ttl=_fresh_seconds(key[2]) + settings.NEWS_CACHE_STALE_SECONDS,
+    )
+
+
+async def _save_in_background(articles: List[Article]) -> None:
+    try:
+        await save_articles(articles)
+    except Exception as e:
+        _news_cache_counts["store_errors"] += 1
+        logger.warning("Saving articles failed: %s: %s", type(e).__name__, e)
+
+
+async def _refresh_in_background(key: NewsCacheKey, city: str | None) -> None:
+    try:
+        articles = await _search_articles(*key, city=city)
+        _cache_articles(key, articles)
+        _spawn(_save_in_background(articles))
+        _news_cache_counts["refreshes"] += 1
+    except Exception as e:
+        _news_cache_counts["refresh_errors"] += 1
+        logger.warning("Background news refresh failed for %s: %s: %s", key, type(e).__name__, e)
+    finally:
+        _refreshing.discard(key)
+
+
+async def _load_articles(
+    key: NewsCacheKey,
+    city: str | None,
+    place: str | None,
+    terms: List[str],
+) -> List[Article]:
+    """
+    Answer from the local article store when it already has enough recent
+    matches; otherwise search Google News, merge in whatever the store had,
+    and save the fetched articles in the background.
+    """
+    stored: List[Article] = []
+    if place:
+        try:
+            stored = await find_recent_articles(place=place, terms=terms, timeframe=key[2] or None)
+        except Exception as e:
+            _news_cache_counts["store_errors"] += 1
+            logger.warning("Article store lookup failed: %s: %s", type(e).__name__, e)
+
+    if len(stored) >= settings.NEWS_STORE_MIN_ARTICLES:
+        _news_cache_counts["store_hits"] += 1
+        return stored
+
+    _news_cache_counts["cold_fetches"] += 1
+    fetched = await _search_articles(*key, city=city)
+    if fetched:
+        _spawn(_save_in_background(fetched))
+
+    seen = {a.url for a in fetched}
+    return fetched + [a for a in stored if a.url not in seen]
+
+
+async def _get_articles_cached(
+    key: NewsCacheKey,
+    city: str | None,
+    place: str | None = None,
+    terms: List[str] | None = None,
+) -> List[Article]:
+    cached = _news_cache.get(key)
+    if cached is not None:
+        articles, fetched_at = cached
+        if time.monotonic() - fetched_at <= _fresh_seconds(key[2]):
+            _news_cache_counts["fresh_hits"] += 1
+        else:
+            _news_cache_counts["stale_hits"] += 1
+            if key not in _refreshing:
+                _refreshing.add(key)
+                _spawn(_refresh_in_background(key, city))
+        return list(articles)
+
+    articles = await _news_flight.do(key, lambda: _load_and_cache(key, city, place, terms or []))
+    return list(articles)
+
+
+async def _load_and_cache(
+    key: NewsCacheKey,
+    city: str | None,
+    place: str | None,
+    terms: List[str],
+) -> List[Article]:
+    articles = await _load_articles(key, city, place, terms)
+    _cache_articles(key, articles)
+    return articles
+
+
+# ---- Google News search ----
+
+GOOGLE_NEWS_SEARCH_URL = "https://news.google.com/rss/search"
+
+# Timeframes narrow enough that the primary query often comes back empty
+_NARROW_TIMEFRAMES = {"1h", "1d"}
+
+# (query, country_code, timeframe) searches that recently came back sparse
+_sparse_searches: TTLCache[NewsCacheKey, bool] = TTLCache(maxsize=2048, ttl=6 * 3600)
+
+
+async def _fetch_entries(query: str, country_code: str, when: str | None) -> List[Article]:
+    """
+    Fetch and parse one Google News RSS search on the shared HTTP client.
+    Same URL scheme as pygooglenews.GoogleNews.search.
+    """
+    q = f"{query} when:{when}" if when else query
+    resp = await get_http_client().get(
+        GOOGLE_NEWS_SEARCH_URL,
+        params={"q": q, "ceid": f"{country_code}:en", "hl": "en", "gl": country_code},
+        timeout=settings.NEWS_HTTP_TIMEOUT_SECONDS,
+    )
+    resp.raise_for_status()
+    return parse_google_news_feed(resp.content)
+
+
+async def _fetch_entries_or_empty(query: str, country_code: str, when: str | None) -> List[Article]:
+    try:
+        return await _fetch_entries(query, country_code, when)
+    except Exception as e:
+        logger.warning("News search failed for %r (when=%s): %s: %s", query, when, type(e).__name__, e)
+        return []
+
+
+async def _first_non_empty(variants: list[Tuple[str, str | None]], country_code: str) -> List[Article]:
+    """
+    Run all search variants concurrently and return the entries of the
+    highest-priority variant that has results, as soon as that is known:
+    a variant wins once it is non-empty and every variant ahead of it has
+    come back empty. Remaining requests are cancelled.
+    """
+    tasks = [
+        asyncio.create_task(_fetch_entries_or_empty(q, country_code, when))
+        for q, when in variants
+    ]
+    try:
+        pending = set(tasks)
+        while pending:
+            _, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for task in tasks:
+                if not task.done():
+                    break
+                if task.result():
+                    return task.result()
+        return []
+    finally:
+        for task in tasks:
+            task.cancel()
+
+
+async def _search_articles(
+    query: str,
+    country_code: str,
+    timeframe: str,
+    *,
+    city: str | None = None,
+) -> List[Article]:
+    timeframe = timeframe or None
+    key = (query, country_code, timeframe or "")
+
+    # In priority order: as asked, without timeframe, then just the city
+    variants: list[Tuple[str, str | None]] = [(query, timeframe)]
+    if timeframe:
+        variants.append((query, None))
+    if city:
+        variants.append((city, None))
+
+    logger.info("Searching: query=%r, country=%s, when=%s", query, country_code, timeframe)
+
+    likely_sparse = timeframe in _NARROW_TIMEFRAMES or _sparse_searches.get(key) is not None
+    if likely_sparse and len(variants) > 1:
+        # Don't wait for the primary to fail before trying the fallbacks
+        entries = await _first_non_empty(variants, country_code)
+    else:
+        entries = await _fetch_entries_or_empty(query, country_code, timeframe)
+        if len(entries) < settings.NEWS_SPARSE_RESULT_THRESHOLD:
+            _sparse_searches.set(key, True)
+        if not entries and len(variants) > 1:
+            logger.info("No results for %r (when=%s), trying fallbacks", query, timeframe)
+            entries = await _first_non_empty(variants[1:], country_code)
+
+    logger.info("Found %d articles", len(entries))
+
+    # Keep every entry (Google News returns at most ~100); ranking picks
+    # what reaches the prompt
+    return entries
+
+
 async def fetch_articles_for_intent(intent: Intent) -> NewsSearchResponse:
     country_code = intent.country_code.upper() if intent.country_code else ""
     
     try:
-        gn = GoogleNews(lang='en', country=country_code)
-        
         query = _fallback_build_query_from_intent(intent)
 
-        # 2) Fallback builder if Gemini didn't provide one
-        if not query:
-            query = _fallback_build_query_from_intent(intent)
-        
-        print(f"🔍 Searching: query='{query}', country={country_code}, when={intent.timeframe}")
-        
         if intent.timeframe == "unspecified":
             intent.timeframe = None
-            
-        # Try with timeframe first
-        search_result = gn.search(query, when=intent.timeframe)
-        entries = search_result.get('entries', [])
-        
-        # If no results with timeframe, try without it
-        if not entries and intent.timeframe:
-            print(f"⚠️ No results with timeframe '{intent.timeframe}', trying without...")
-            search_result = gn.search(query)
-            entries = search_result.get('entries', [])
-        
-        # If still no results, try broader query (just city name)
-        if not entries and intent.city:
-            print(f"⚠️ No results for '{query}', trying just city name...")
-            search_result = gn.search(intent.city)
-            entries = search_result.get('entries', [])
-        
-        print(f"✅ Found {len(entries)} articles")
-        
-        
-        articles: List[Article] = []
-        k = min(60, len(entries))
-        sampled_entries = random.sample(entries, k)
-
-        for entry in sampled_entries:
-            published_raw = getattr(entry, "published", None)
-            published_at = datetime.now(timezone.utc)
-            
-            if published_raw:
-                try:
-                    published_at = datetime.strptime(
-                        published_raw, "%a, %d %b %Y %H:%M:%S %Z"
-                    ).replace(tzinfo=timezone.utc)
-                except Exception as e:
-                    print(f"Date parse error: {e}")
-            
-            # Handle source - it can be a dict or a string
-            source = getattr(entry, 'source', None)
-            if isinstance(source, dict):
-                source_title = source.get('title', 'Google News')
-            elif isinstance(source, str):
-                source_title = source
-            else:
-                source_title = 'Google News'
-            
-            # Get description/summary
-            snippet = (
-                getattr(entry, 'summary', '') or 
-                getattr(entry, 'description', '') or 
-                ''
-            )
-            
-            articles.append(Article(
-                title=entry.title,
-                url=entry.link,
-                source=source_title,
-                published_at=published_at,
-                snippet=snippet
-            ))
-        
+
+        articles = await _get_articles_cached(
+            (query, country_code, intent.timeframe or ""),
+            city=intent.city,
+            place=intent.city or intent.country,
+            terms=_intent_terms(intent),
+        )
+
         return NewsSearchResponse(
             city=intent.city or "",
             country=intent.country or "",
@@ -150,7 +340,7 @@ async def fetch_articles_for_intent(intent: Intent) -> NewsSearchResponse:
         )
     
     except Exception as e:
-        print(f"❌ Error fetching articles: {type(e).__name__}: {e}")
+        logger.error("Error fetching articles: %s: %s", type(e).__name__, e)
         import traceback
         traceback.print_exc()
         
@@ -163,4 +353,3 @@ async def fetch_articles_for_intent(intent: Intent) -> NewsSearchResponse:
             articles=[]
         )
     
-
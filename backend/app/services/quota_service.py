@@ -0,0 +1,240 @@
+# app/services/quota_service.py
+"""
+Per-user quotas backed by UserUsage counters.
+
+A request first reserves a credit (a conditional UPDATE, committed right
+away, so concurrent requests can't both take the last one), then either
+consumes it in the same transaction that saves what it produced, or
+releases it when it fails. Checking a quota never scans history: the
+counter row is only seeded from history the first time a user/period is
+seen.
+
+A counter's holds all expire together, QUOTA_RESERVATION_TTL_SECONDS
+after its latest reservation, and the next reservation then drops them.
+So a reservation older than the TTL may no longer be counted, and giving
+it back could cancel another request's live hold instead. Consuming it
+still counts the usage, but neither path touches `reserved` then.
+"""
+from __future__ import annotations
+
+import logging
+import uuid
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta, timezone
+from typing import Awaitable, Callable, Dict, List, Optional, Tuple
+
+from sqlalchemy import case, func, select, update
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.core.db import async_session_factory
+from app.models.audio_briefing import AudioBriefing
+from app.models.user_usage import UserUsage
+
+
+logger = logging.getLogger(__name__)
+
+
+AUDIO_BRIEFINGS = "audio_briefings"
+
+
+@dataclass(frozen=True)
+class Quota:
+    metric: str
+    limit: int
+    # "all" (lifetime), "month" or "day", in UTC
+    period: str = "all"
+
+
+class QuotaExceeded(Exception):
+    def __init__(self, quota: Quota):
+        super().__init__(f"{quota.metric} quota exceeded ({quota.limit} per {quota.period})")
+        self.quota = quota
+
+
+@dataclass
+class QuotaReservation:
+    user_id: uuid.UUID
+    # (metric, period key) of every counter holding a credit
+    counters: List[Tuple[str, str]] = field(default_factory=list)
+    reserved_at: Optional[datetime] = None
+    settled: bool = False
+
+    def is_live(self, now: Optional[datetime] = None) -> bool:
+        """Whether the held credits are certainly still counted."""
+        if self.reserved_at is None:
+            return False
+        now = now or datetime.now(timezone.utc)
+        # Holds are only dropped once the counter's newest reservation,
+        # which is at least this one, is older than the TTL
+        return now - self.reserved_at < timedelta(seconds=settings.QUOTA_RESERVATION_TTL_SECONDS)
+
+
+def quotas_for(metric: str) -> List[Quota]:
+    if metric != AUDIO_BRIEFINGS:
+        return []
+    quotas = [Quota(AUDIO_BRIEFINGS, settings.FREE_AUDIO_BRIEFING_LIMIT)]
+    if settings.AUDIO_BRIEFINGS_PER_MONTH is not None:
+        quotas.append(Quota(AUDIO_BRIEFINGS, settings.AUDIO_BRIEFINGS_PER_MONTH, "month"))
+    if settings.AUDIO_BRIEFINGS_PER_DAY is not None:
+        quotas.append(Quota(AUDIO_BRIEFINGS, settings.AUDIO_BRIEFINGS_PER_DAY, "day"))
+    return quotas
+
+
+def _period_start(period: str, now: datetime) -> Optional[datetime]:
+    if period == "day":
+        return now.replace(hour=0, minute=0, second=0, microsecond=0)
+    if period == "month":
+        return now.replace(day=1, hour=0, minute=0, second=0, microsecond=0)
+    return None
+
+
+def _period_key(period: str, now: datetime) -> str:
+    if period == "day":
+        return now.strftime("%Y-%m-%d")
+    if period == "month":
+        return now.strftime("%Y-%m")
+    return "all"
+
+
+async def _count_audio_briefings(
+    db: AsyncSession, user_id: uuid.UUID, since: Optional[datetime]
+) -> int:
+    stmt = select(func.count()).select_from(AudioBriefing).where(
+        AudioBriefing.user_id == user_id,
+        AudioBriefing.output_mode.in_(["audio", "both"]),
+    )
+    if since is not None:
+        stmt = stmt.where(AudioBriefing.created_at >= since)
+    return (await db.execute(stmt)).scalar() or 0
+
+
+# metric -> usage already in history, to seed a new counter row
+_HISTORY_COUNTERS: Dict[str, Callable[..., Awaitable[int]]] = {
+    AUDIO_BRIEFINGS: _count_audio_briefings,
+}
+
+
+def _counter(user_id: uuid.UUID, metric: str, period_key: str):
+    return (
+        UserUsage.user_id == user_id,
+        UserUsage.metric == metric,
+        UserUsage.period == period_key,
+    )
+
+
+async def _counter_exists(
+    db: AsyncSession, user_id: uuid.UUID, metric: str, period_key: str
+) -> bool:
+    result = await db.execute(select(UserUsage.used).where(*_counter(user_id, metric, period_key)))
+    return result.first() is not None
+
+
+async def _take_credit(
+    db: AsyncSession, user_id: uuid.UUID, quota: Quota, period_key: str, now: datetime
+) -> bool:
+    stale_before = now - timedelta(seconds=settings.QUOTA_RESERVATION_TTL_SECONDS)
+    live_reserved = case((UserUsage.reserved_at > stale_before, UserUsage.reserved), else_=0)
+
+    # Row lock + re-check: a concurrent request waits here and then sees
+    # this one's reservation
+    result = await db.execute(
+        update(UserUsage)
+        .where(*_counter(user_id, quota.metric, period_key))
+        .where(UserUsage.used + live_reserved < quota.limit)
+        .values(reserved=live_reserved + 1, reserved_at=now)
+        .returning(UserUsage.used)
+    )
+    return result.first() is not None
+
+
+async def reserve_quota(user_id: uuid.UUID, metric: str) -> QuotaReservation:
+    """
+    Hold one credit of `metric` under every quota that applies to it.
+    Raises QuotaExceeded (holding nothing) if any of them is used up.
+    """
+    now = datetime.now(timezone.utc)
+    reservation = QuotaReservation(user_id=user_id, reserved_at=now)
+
+    async with async_session_factory() as session:
+        for quota in quotas_for(metric):
+            period_key = _period_key(quota.period, now)
+
+            taken = await _take_credit(session, user_id, quota, period_key, now)
+            if not taken and not await _counter_exists(session, user_id, metric, period_key):
+                # First use of this user/period: seed the counter from
+                # history once, then retry
+                used = await _HISTORY_COUNTERS[metric](
+                    session, user_id, _period_start(quota.period, now)
+                )
+                await session.execute(
+                    insert(UserUsage)
+                    .values(user_id=user_id, metric=metric, period=period_key, used=used)
+                    .on_conflict_do_nothing()
+                )
+                taken = await _take_credit(session, user_id, quota, period_key, now)
+            if not taken:
+                await session.rollback()
+                raise QuotaExceeded(quota)
+
+            reservation.counters.append((metric, period_key))
+
+        await session.commit()
+
+    return reservation
+
+
+async def consume_quota(db: AsyncSession, reservation: QuotaReservation) -> None:
+    """
+    Turn the reserved credits into usage as part of the caller's
+    transaction; they count once the caller commits. An expired hold only
+    adds the usage (see the module docstring).
+    """
+    values = {"used": UserUsage.used + 1}
+    if reservation.is_live():
+        values["reserved"] = func.greatest(UserUsage.reserved - 1, 0)
+    for metric, period_key in reservation.counters:
+        await db.execute(
+            update(UserUsage)
+            .where(*_counter(reservation.user_id, metric, period_key))
+            .values(**values)
+        )
+    reservation.settled = True
+
+
+async def release_quota(reservation: QuotaReservation) -> None:
+    """
+    Give back credits that weren't consumed. Safe to call more than once.
+    An expired hold has nothing left to give back.
+    """
+    if reservation.settled or not reservation.counters:
+        return
+    reservation.settled = True
+    if not reservation.is_live():
+        return
+
+    try:
+        async with async_session_factory() as session:
+            for metric, period_key in reservation.counters:
+                await session.execute(
+                    update(UserUsage)
+                    .where(*_counter(reservation.user_id, metric, period_key))
+                    .values(reserved=func.greatest(UserUsage.reserved - 1, 0))
+                )
+            await session.commit()
+    except Exception as e:
+        # The reservation expires on its own after QUOTA_RESERVATION_TTL_SECONDS
+        logger.warning("Releasing quota reservation failed: %s: %s", type(e).__name__, e)
+
+
+async def get_usage(db: AsyncSession, user_id: uuid.UUID, quota: Quota) -> int:
+    """Credits used under `quota` in the current period (0 if never used)."""
+    now = datetime.now(timezone.utc)
+    result = await db.execute(
+        select(UserUsage.used).where(*_counter(user_id, quota.metric, _period_key(quota.period, now)))
+    )
+    used = result.scalar()
+    if used is None:
+        used = await _HISTORY_COUNTERS[quota.metric](db, user_id, _period_start(quota.period, now))
+    return used
@@ -0,0 +1,130 @@
+# app/services/ranking.py
+"""
+Relevance ranking of fetched articles against an Intent.
+
+BM25 over each article's title + snippet, scored for all articles at once
+with NumPy, then blended with an exponential recency decay. The result is
+a deterministic order: the same articles and intent always rank the same.
+"""
+from __future__ import annotations
+
+import re
+from collections import Counter
+from datetime import datetime, timezone
+from typing import Dict, List, Optional
+
+import numpy as np
+
+from app.core.config import settings
+from app.models.news_article import Article
+from app.schemas.intent import Intent
+from app.services.dedup import article_words
+from app.services.news_service import FOCUS_KEYWORDS
+
+
+BM25_K1 = 1.2
+BM25_B = 0.75
+
+_WORD_RE = re.compile(r"[a-z0-9]+")
+
+# How much each part of the intent counts towards relevance
+_TOPIC_WEIGHT = 1.5
+_TAG_WEIGHT = 1.0
+_LOCATION_WEIGHT = 1.0
+_FOCUS_WEIGHT = 0.5
+
+
+def _words(text: str) -> list[str]:
+    return _WORD_RE.findall(text.casefold())
+
+
+def intent_query_terms(intent: Intent) -> Dict[str, float]:
+    """Weighted query terms for an intent (term -> weight)."""
+    terms: Dict[str, float] = {}
+
+    def add(text: Optional[str], weight: float) -> None:
+        for word in _words(text or ""):
+            if word != "or":
+                terms[word] = max(terms.get(word, 0.0), weight)
+
+    if intent.topic and intent.topic != "general":
+        add(intent.topic, _TOPIC_WEIGHT)
+    for tag in intent.tags or []:
+        add(tag, _TAG_WEIGHT)
+    add(intent.city, _LOCATION_WEIGHT)
+    add(intent.country, _LOCATION_WEIGHT)
+    add(FOCUS_KEYWORDS.get(intent.focus or "general", ""), _FOCUS_WEIGHT)
+
+    return terms
+
+
+def _as_utc(dt: datetime) -> datetime:
+    return dt.replace(tzinfo=timezone.utc) if dt.tzinfo is None else dt
+
+
+def bm25_scores(docs: List[List[str]], terms: Dict[str, float]) -> np.ndarray:
+    """BM25 score of every doc (list of words) for the weighted query terms."""
+    n_docs = len(docs)
+    if n_docs == 0 or not terms:
+        return np.zeros(n_docs)
+
+    vocab = {term: j for j, term in enumerate(terms)}
+    weights = np.fromiter(terms.values(), dtype=np.float64, count=len(terms))
+
+    tf = np.zeros((n_docs, len(vocab)), dtype=np.float64)
+    for i, words in enumerate(docs):
+        for word, count in Counter(words).items():
+            j = vocab.get(word)
+            if j is not None:
+                tf[i, j] = count
+
+    doc_len = np.fromiter((len(d) for d in docs), dtype=np.float64, count=n_docs)
+    avg_len = doc_len.mean() or 1.0
+
+    df = np.count_nonzero(tf, axis=0)
+    idf = np.log1p((n_docs - df + 0.5) / (df + 0.5))
+
+    norm = BM25_K1 * (1.0 - BM25_B + BM25_B * doc_len / avg_len)
+    tf_part = tf * (BM25_K1 + 1.0) / (tf + norm[:, None])
+    return tf_part @ (idf * weights)
+
+
+def rank_articles(
+    articles: List[Article],
+    intent: Intent,
+    *,
+    now: Optional[datetime] = None,
+) -> List[Article]:
+    """
+    Return articles ordered by blended relevance:
+    (1 - w) * normalized BM25 + w * recency, with
+    w = settings.RANKING_RECENCY_WEIGHT and a recency score that halves
+    every settings.RANKING_RECENCY_HALF_LIFE_HOURS.
+
+    Ties fall back to newest first, then URL, so the order is stable.
+    """
+    if not articles:
+        return []
+
+    now = now or datetime.now(timezone.utc)
+
+    relevance = bm25_scores([article_words(a) for a in articles], intent_query_terms(intent))
+    top = relevance.max()
+    if top > 0:
+        relevance = relevance / top
+
+    published_ts = np.fromiter(
+        (_as_utc(a.published_at).timestamp() for a in articles),
+        dtype=np.float64,
+        count=len(articles),
+    )
+    age_hours = np.clip((now.timestamp() - published_ts) / 3600.0, 0.0, None)
+    recency = np.exp2(-age_hours / settings.RANKING_RECENCY_HALF_LIFE_HOURS)
+
+    w = settings.RANKING_RECENCY_WEIGHT
+    score = (1.0 - w) * relevance + w * recency
+
+    # np.lexsort sorts by the last key first
+    urls = np.array([a.url for a in articles])
+    order = np.lexsort((urls, -published_ts, -score))
+    return [articles[i] for i in order]
@@ -1,14 +1,60 @@
+# app/services/storage_service.py
+"""
+Where rendered audio lives. Callers use the module-level functions, which
+go to the backend picked by settings.STORAGE_BACKEND:
+
+  "gcs"   -> Google Cloud Storage (resumable uploads, V4 signed URLs)
+  "local" -> files under LOCAL_STORAGE_DIR, served by /media with
+             HMAC-signed URLs and byte-range support
+"""
 from __future__ import annotations
 
-from typing import Final
+import asyncio
+import hashlib
+import hmac
+import logging
+import os
+import re
+import tempfile
+import time
+from abc import ABC, abstractmethod
+from pathlib import Path
+from typing import AsyncIterable, Final, Optional
+from urllib.parse import quote, urlencode
 from datetime import datetime, timezone, timedelta
+
+import google.auth.transport.requests
 from google.cloud import storage
 from google.oauth2 import service_account
 
+from app.core.cache import TTLCache
 from app.core.config import settings
+from app.core.http import get_http_client
+from app.core.metrics import register_stats
+
+logger = logging.getLogger(__name__)
 
 _BUCKET_NAME: Final[str] = settings.GCS_BUCKET_NAME
 
+# Resumable upload chunks must be multiples of 256 KiB (except the last)
+_CHUNK_QUANTUM: Final[int] = 256 * 1024
+_CHUNK_BYTES: Final[int] = max(
+    _CHUNK_QUANTUM,
+    settings.GCS_UPLOAD_CHUNK_BYTES // _CHUNK_QUANTUM * _CHUNK_QUANTUM,
+)
+_GCS_SCOPES: Final[list[str]] = ["https://www.googleapis.com/auth/devstorage.read_write"]
+
+_client: storage.Client | None = None
+_credentials = None
+_credentials_lock = asyncio.Lock()
+
+# blob name -> (signed url, wall-clock expiry)
+_signed_urls: TTLCache[str, tuple[str, float]] = TTLCache(
+    maxsize=settings.SIGNED_URL_CACHE_MAX_ENTRIES,
+    ttl=settings.SIGNED_URL_TTL_MINUTES * 60,
+)
+register_stats("signed_urls", _signed_urls.stats)
+
 
 def _get_gcs_client() -> storage.Client:
     global _client
@@ -20,30 +66,284 @@ def _get_gcs_client() -> storage.Client:
     return _client
 
 
-async def upload_audio_and_get_signed_url(data: bytes, filename: str, minutes_valid: int = 60) -> str:
+def _storage_base_url() -> str:
+    # Same variable google-cloud-storage and fake-gcs-server use
+    return (settings.STORAGE_EMULATOR_HOST or "https://storage.googleapis.com").rstrip("/")
+
+
+async def _auth_headers() -> dict[str, str]:
+    if settings.STORAGE_EMULATOR_HOST:
+        return {}
+
+    global _credentials
+    async with _credentials_lock:
+        if _credentials is None:
+            _credentials = settings.gcs_credentials.with_scopes(_GCS_SCOPES)
+        if not _credentials.valid:
+            # Token refresh is a blocking HTTP call; keep it off the loop
+            await asyncio.to_thread(_credentials.refresh, google.auth.transport.requests.Request())
+        return {"Authorization": f"Bearer {_credentials.token}"}
+
+
+async def _start_resumable_upload(filename: str, content_type: str) -> str:
+    """Open a GCS resumable upload session and return its session URI."""
+    resp = await get_http_client().post(
+        f"{_storage_base_url()}/upload/storage/v1/b/{_BUCKET_NAME}/o",
+        params={"uploadType": "resumable", "name": filename},
+        headers={**await _auth_headers(), "X-Upload-Content-Type": content_type},
+        json={"name": filename, "contentType": content_type},
+    )
+    resp.raise_for_status()
+    return resp.headers["Location"]
+
+
+def _persisted_bytes(resp) -> int:
+    # 308 responses report what the server has so far as "Range: bytes=0-N"
+    match = re.match(r"bytes=0-(\d+)", resp.headers.get("Range", ""))
+    return int(match.group(1)) + 1 if match else 0
+
+
+async def _put_chunk(session_uri: str, chunk: bytes, offset: int, total: int | None) -> int:
+    """
+    Send one chunk at `offset`. `total` is the object size on the last
+    chunk and None before it. Returns how many bytes the server now holds.
+    """
+    size = "*" if total is None else str(total)
+    if chunk:
+        content_range = f"bytes {offset}-{offset + len(chunk) - 1}/{size}"
+    else:
+        content_range = f"bytes */{size}"
+
+    resp = await get_http_client().put(
+        session_uri,
+        content=chunk,
+        headers={**await _auth_headers(), "Content-Range": content_range},
+    )
+    if resp.status_code == 308:
+        return _persisted_bytes(resp)
+    resp.raise_for_status()
+    return offset + len(chunk)
+
+
+async def _gcs_upload_stream(
+    chunks: AsyncIterable[bytes],
+    filename: str,
+    content_type: str = "audio/mpeg",
+) -> int:
     """
-    Upload MP3 bytes to GCS and return a signed URL (expires in specified minutes).
+    Upload an async stream of bytes to GCS with a resumable upload,
+    without blocking the event loop or buffering the whole object:
+    at most ~settings.GCS_UPLOAD_CHUNK_BYTES is held at a time.
+    Returns the number of bytes uploaded.
     """
-    if not data:
+    session_uri: str | None = None
+    buf = bytearray()
+    offset = 0  # bytes the server has confirmed
+
+    async for data in chunks:
+        if not data:
+            continue
+        buf += data
+        while len(buf) >= _CHUNK_BYTES:
+            if session_uri is None:
+                session_uri = await _start_resumable_upload(filename, content_type)
+            persisted = await _put_chunk(session_uri, bytes(buf[:_CHUNK_BYTES]), offset, None)
+            # The server may keep less than we sent; resend the rest next time
+            del buf[:persisted - offset]
+            offset = persisted
+
+    total = offset + len(buf)
+    if total == 0:
         raise RuntimeError("No audio data generated (empty bytes)")
-    
-    client = _get_gcs_client()
-    bucket = client.bucket(_BUCKET_NAME)
-    blob = bucket.blob(filename)
 
-    print("UPLOAD bucket:", _BUCKET_NAME)
-    print("UPLOAD filename:", filename)
-    print("UPLOAD size:", len(data))
+    if session_uri is None:
+        session_uri = await _start_resumable_upload(filename, content_type)
+    while True:
+        persisted = await _put_chunk(session_uri, bytes(buf), offset, total)
+        if persisted >= total:
+            break
+        del buf[:persisted - offset]
+        offset = persisted
 
-    # Upload from memory
-    blob.upload_from_string(data, content_type="audio/mpeg")
+    logger.debug("Uploaded gs://%s/%s (%d bytes)", _BUCKET_NAME, filename, total)
+    return total
 
-    # Generate signed URL instead of public URL
-    signed_url = blob.generate_signed_url(
+
+async def _gcs_object_size(filename: str) -> int | None:
+    """Size in bytes of a stored object, or None if it doesn't exist."""
+    resp = await get_http_client().get(
+        f"{_storage_base_url()}/storage/v1/b/{_BUCKET_NAME}/o/{quote(filename, safe='')}",
+        params={"fields": "size"},
+        headers=await _auth_headers(),
+    )
+    if resp.status_code == 404:
+        return None
+    resp.raise_for_status()
+    return int(resp.json()["size"])
+
+
+def _gcs_signed_url(filename: str, minutes_valid: int = 60) -> str:
+    """
+    Signed GET URL for a stored object, valid for at least `minutes_valid`
+    more minutes. URLs are signed for SIGNED_URL_TTL_MINUTES and reused
+    until they get too close to expiry, so repeat calls (e.g. the player
+    polling) cost a dict lookup instead of an RSA signature.
+    """
+    if settings.STORAGE_EMULATOR_HOST:
+        return f"{_storage_base_url()}/storage/v1/b/{_BUCKET_NAME}/o/{quote(filename, safe='')}?alt=media"
+
+    minutes_valid = min(minutes_valid, settings.SIGNED_URL_TTL_MINUTES)
+    cached = _signed_urls.get(filename)
+    if cached is not None and cached[1] - time.time() >= minutes_valid * 60:
+        return cached[0]
+
+    expires_at = datetime.now(timezone.utc) + timedelta(minutes=settings.SIGNED_URL_TTL_MINUTES)
+    blob = _get_gcs_client().bucket(_BUCKET_NAME).blob(filename)
+    url = blob.generate_signed_url(
         version="v4",
-        expiration=datetime.now(timezone.utc) + timedelta(minutes=minutes_valid),
+        expiration=expires_at,
         method="GET",
     )
-    
-    print("SIGNED URL:", signed_url)
-    return signed_url
+    _signed_urls.set(filename, (url, expires_at.timestamp()))
+    return url
+
+
+class StorageBackend(ABC):
+    """Object storage for rendered audio, addressed by object name."""
+
+    @abstractmethod
+    async def upload_stream(self, chunks: AsyncIterable[bytes], name: str, content_type: str) -> int:
+        """Store an async byte stream under `name`; returns bytes written."""
+
+    @abstractmethod
+    async def object_size(self, name: str) -> Optional[int]:
+        """Size of a stored object, or None if it doesn't exist."""
+
+    @abstractmethod
+    def signed_url(self, name: str, minutes_valid: int) -> str:
+        """URL a browser can GET the object from for at least `minutes_valid` minutes."""
+
+
+class GCSStorageBackend(StorageBackend):
+
+    async def upload_stream(self, chunks, name, content_type):
+        return await _gcs_upload_stream(chunks, name, content_type)
+
+    async def object_size(self, name):
+        return await _gcs_object_size(name)
+
+    def signed_url(self, name, minutes_valid):
+        return _gcs_signed_url(name, minutes_valid)
+
+
+class LocalStorageBackend(StorageBackend):
+    """
+    Files on local disk, for self-hosting and load tests. Objects are
+    served by the /media endpoint (app/api/media.py) from URLs signed
+    with an HMAC, so they work as an <audio> src without auth headers.
+    """
+
+    def __init__(self, root: str, base_url: str, secret: str) -> None:
+        self.root = Path(root).resolve()
+        self.base_url = base_url.rstrip("/")
+        self._key = hmac.new(secret.encode(), b"local-media", hashlib.sha256).digest()
+
+    def path_for(self, name: str) -> Path:
+        """Absolute path of an object; rejects names escaping the root."""
+        path = (self.root / name).resolve()
+        if self.root not in path.parents:
+            raise ValueError(f"Invalid object name: {name!r}")
+        return path
+
+    @staticmethod
+    def _open_temp(path: Path):
+        path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=path.parent, prefix=".upload-")
+        return os.fdopen(fd, "wb"), tmp_path
+
+    async def upload_stream(self, chunks, name, content_type):
+        path = self.path_for(name)
+
+        # Write to a temp file and rename, so readers never see a partial
+        # object. All filesystem calls run off the event loop.
+        f, tmp_path = await asyncio.to_thread(self._open_temp, path)
+        total = 0
+        try:
+            try:
+                async for data in chunks:
+                    if data:
+                        await asyncio.to_thread(f.write, data)
+                        total += len(data)
+            finally:
+                await asyncio.shield(asyncio.to_thread(f.close))
+            if total == 0:
+                raise RuntimeError("No audio data generated (empty bytes)")
+            await asyncio.to_thread(os.replace, tmp_path, path)
+        except BaseException:
+            # Shielded so a cancelled upload still removes its temp file
+            await asyncio.shield(asyncio.to_thread(os.unlink, tmp_path))
+            raise
+
+        return total
+
+    async def object_size(self, name):
+        try:
+            return (await asyncio.to_thread(os.stat, self.path_for(name))).st_size
+        except FileNotFoundError:
+            return None
+
+    def _signature(self, name: str, expires: int) -> str:
+        return hmac.new(self._key, f"{name}\n{expires}".encode(), hashlib.sha256).hexdigest()
+
+    def signed_url(self, name, minutes_valid):
+        # Round expiry up to 5 minutes so repeat calls give the same URL
+        # (and the browser can reuse its cached copy)
+        expires = -(-(int(time.time()) + minutes_valid * 60) // 300) * 300
+        query = urlencode({"expires": expires, "sig": self._signature(name, expires)})
+        return f"{self.base_url}/media/{quote(name)}?{query}"
+
+    def verify(self, name: str, expires: int, sig: str) -> bool:
+        if expires < time.time():
+            return False
+        return hmac.compare_digest(self._signature(name, expires), sig)
+
+
+_backend: StorageBackend | None = None
+
+
+def get_storage() -> StorageBackend:
+    global _backend
+    if _backend is None:
+        if settings.STORAGE_BACKEND == "local":
+            _backend = LocalStorageBackend(
+                settings.LOCAL_STORAGE_DIR,
+                settings.LOCAL_STORAGE_BASE_URL,
+                settings.JWT_SECRET_KEY,
+            )
+        elif settings.STORAGE_BACKEND == "gcs":
+            _backend = GCSStorageBackend()
+        else:
+            raise ValueError(f"Unknown STORAGE_BACKEND: {settings.STORAGE_BACKEND!r}")
+    return _backend
+
+
+async def upload_audio_stream(
+    chunks: AsyncIterable[bytes],
+    filename: str,
+    content_type: str = "audio/mpeg",
+) -> int:
+    """
+    Store an async stream of audio bytes without buffering all of it.
+    Returns the number of bytes stored.
+    """
+    return await get_storage().upload_stream(chunks, filename, content_type)
+
+
+async def get_object_size(filename: str) -> int | None:
+    """Size in bytes of a stored object, or None if it doesn't exist."""
+    return await get_storage().object_size(filename)
+
+
+def get_audio_signed_url(filename: str, minutes_valid: int = 60) -> str:
+    """URL the player can load the stored audio from."""
+    return get_storage().signed_url(filename, minutes_valid)
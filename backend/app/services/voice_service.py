@@ -1,21 +1,120 @@
 # app/services/voice_service.py
 from __future__ import annotations
 
-import io
-import uuid
-from typing import Optional
+import asyncio
+import hashlib
+import json
+import re
+from typing import AsyncIterator, List, Optional
 
-from elevenlabs.client import ElevenLabs
+from elevenlabs.client import AsyncElevenLabs
 from elevenlabs import VoiceSettings
 
 from app.core.config import settings
+from app.services.mp3 import Mp3FrameFilter
 
 
 # The ElevenLabs client reads api_key from settings.ELEVENLABS_API_KEY
-client = ElevenLabs(api_key=settings.ELEVENLABS_API_KEY)
+async_client = AsyncElevenLabs(api_key=settings.ELEVENLABS_API_KEY)
 
+# Keep in sync with the keyword defaults below; part of the audio cache key
+TTS_DEFAULTS = {
+    "stability": 0.45,
+    "similarity_boost": 0.9,
+    "style": 0.4,
+    "use_speaker_boost": True,
+    "model_id": "eleven_multilingual_v2",
+    "output_format": "mp3_44100_128",
+}
 
-def synthesize_briefing_to_bytes(
+
+_PARAGRAPH_BREAK = re.compile(r"\n\s*\n")
+_SENTENCE_END = re.compile(r"(?<=[.!?])\s+")
+
+
+def _split_long(sentence: str, max_chars: int) -> List[str]:
+    # Last resort for a single sentence over the limit: break at spaces
+    parts: List[str] = []
+    while len(sentence) > max_chars:
+        cut = sentence.rfind(" ", 0, max_chars + 1)
+        if cut <= 0:
+            cut = max_chars
+        parts.append(sentence[:cut].strip())
+        sentence = sentence[cut:].strip()
+    if sentence:
+        parts.append(sentence)
+    return parts
+
+
+def split_script(text: str, max_chars: int) -> List[str]:
+    """
+    Split a script into chunks of at most max_chars, breaking at paragraph
+    boundaries where possible, then at sentence ends.
+    """
+    # (piece, starts_new_paragraph)
+    pieces: List[tuple[str, bool]] = []
+    for paragraph in _PARAGRAPH_BREAK.split(text.strip()):
+        paragraph = " ".join(paragraph.split())
+        if not paragraph:
+            continue
+        sentences = [paragraph] if len(paragraph) <= max_chars else _SENTENCE_END.split(paragraph)
+        first = True
+        for sentence in sentences:
+            for part in _split_long(sentence, max_chars):
+                pieces.append((part, first))
+                first = False
+
+    chunks: List[str] = []
+    for piece, new_paragraph in pieces:
+        joiner = "\n\n" if new_paragraph else " "
+        if chunks and len(chunks[-1]) + len(joiner) + len(piece) <= max_chars:
+            chunks[-1] += joiner + piece
+        else:
+            chunks.append(piece)
+    return chunks
+
+
+def _voice_settings(stability, similarity_boost, style, use_speaker_boost) -> VoiceSettings:
+    return VoiceSettings(
+        stability=stability,
+        similarity_boost=similarity_boost,
+        style=style,
+        use_speaker_boost=use_speaker_boost,
+    )
+
+
+async def _render_chunk(
+    queue: asyncio.Queue,
+    limit: asyncio.Semaphore,
+    text: str,
+    *,
+    previous_text: Optional[str],
+    next_text: Optional[str],
+    stitch_mp3: bool,
+    **request,
+) -> None:
+    """Stream one chunk's audio into `queue`, ending with None (or the error)."""
+    try:
+        async with limit:
+            frames = Mp3FrameFilter() if stitch_mp3 else None
+            audio_stream = async_client.text_to_speech.stream(
+                text=text,
+                # Neighbouring text keeps intonation continuous across chunks
+                previous_text=previous_text,
+                next_text=next_text,
+                **request,
+            )
+            async for data in audio_stream:
+                if frames is not None:
+                    data = frames.feed(data)
+                if data:
+                    queue.put_nowait(data)
+        queue.put_nowait(None)
+    except Exception as e:
+        queue.put_nowait(e)
+
+
+async def stream_briefing_audio(
     full_script: str,
     voice_id: str,
     *,
@@ -25,42 +124,84 @@ def synthesize_briefing_to_bytes(
     use_speaker_boost: bool = True,
     model_id: str = "eleven_multilingual_v2",
     output_format: str = "mp3_44100_128",
-) -> bytes:
+) -> AsyncIterator[bytes]:
     """
-    Convert a full briefing script (intro + narration) into audio bytes with ElevenLabs.
+    Convert a full briefing script (intro + narration) into audio with
+    ElevenLabs, yielding chunks as they are produced.
 
-    Returns raw MP3 bytes (or empty bytes if text is blank).
+    Scripts longer than TTS_CHUNK_MAX_CHARS are split at paragraph/sentence
+    boundaries and the pieces are synthesized concurrently (up to
+    TTS_MAX_PARALLEL_CHUNKS at once), then joined in order at MP3 frame
+    boundaries. Wall-clock time is then close to the slowest piece rather
+    than the whole script, and the first piece still plays right away.
     """
     text = (full_script or "").strip()
     if not text:
-        return b""
+        return
 
-    # Streaming generator from ElevenLabs API
-    audio_stream = client.text_to_speech.convert(
-        text=text,
+    request = dict(
         voice_id=voice_id,
         model_id=model_id,
-        output_format=output_format,  # 44.1kHz, 128kbps MP3
-        voice_settings=VoiceSettings(
-            stability=stability,
-            similarity_boost=similarity_boost,
-            style=style,
-            use_speaker_boost=use_speaker_boost,
-        ),
+        output_format=output_format,
+        voice_settings=_voice_settings(stability, similarity_boost, style, use_speaker_boost),
     )
 
-    # Collect chunks into a single bytes object
-    buf = io.BytesIO()
-    for chunk in audio_stream:
-        if chunk:
-            buf.write(chunk)
+    stitch_mp3 = output_format.startswith("mp3")
+    # Raw sample formats concatenate as-is; other containers (e.g. opus) don't
+    splittable = stitch_mp3 or output_format.startswith(("pcm", "ulaw", "alaw"))
+    chunks = split_script(text, settings.TTS_CHUNK_MAX_CHARS) if splittable else [text]
+
+    if len(chunks) <= 1:
+        async for data in async_client.text_to_speech.stream(text=text, **request):
+            if data:
+                yield data
+        return
 
-    return buf.getvalue()
+    limit = asyncio.Semaphore(max(1, settings.TTS_MAX_PARALLEL_CHUNKS))
+    queues: List[asyncio.Queue] = [asyncio.Queue() for _ in chunks]
+    # Created in order; the semaphore is FIFO, so earlier chunks start first
+    tasks = [
+        asyncio.create_task(_render_chunk(
+            queues[i],
+            limit,
+            chunk,
+            previous_text=chunks[i - 1] if i > 0 else None,
+            next_text=chunks[i + 1] if i + 1 < len(chunks) else None,
+            stitch_mp3=stitch_mp3,
+            **request,
+        ))
+        for i, chunk in enumerate(chunks)
+    ]
 
+    try:
+        for queue in queues:
+            while True:
+                item = await queue.get()
+                if item is None:
+                    break
+                if isinstance(item, Exception):
+                    raise item
+                yield item
+    finally:
+        for task in tasks:
+            task.cancel()
 
-def make_briefing_filename(prefix: str = "briefing", ext: str = "mp3") -> str:
+
+def audio_content_key(full_script: str, voice_id: str, **tts_options) -> str:
     """
-    Generate a unique filename for a synthesized briefing.
-    You can use this with S3 / GCS / local storage.
+    sha256 over everything that determines the rendered audio: script,
+    voice, model, output format and voice settings. Identical inputs give
+    identical MP3s, so the key can name the stored object.
     """
-    return f"{prefix}_{uuid.uuid4()}.{ext}"
+    params = {**TTS_DEFAULTS, **tts_options}
+    payload = json.dumps(
+        {
+            "text": (full_script or "").strip(),
+            "voice_id": voice_id,
+            # Chunked synthesis changes the audio too
+            "chunk_max_chars": settings.TTS_CHUNK_MAX_CHARS,
+            **params,
+        },
+        sort_keys=True,
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
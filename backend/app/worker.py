@@ -0,0 +1,86 @@
+# app/worker.py
+"""
+Audio rendering worker. Run one or more alongside the API:
+
+    python -m app.worker
+
+Each process renders up to AUDIO_WORKER_CONCURRENCY jobs at a time, so
+TTS throughput scales with the number of workers.
+"""
+from __future__ import annotations
+
+import asyncio
+import logging
+import signal
+
+import app.core.event_loop
+import app.models  # noqa: F401  (register all tables for foreign keys)
+
+from app.core.config import settings
+from app.core.db import dispose_engines
+from app.core.http import close_http_client
+from app.services.audio_jobs import claim_audio_job, run_audio_job
+
+
+logger = logging.getLogger(__name__)
+
+
+async def _run_job(job) -> None:
+    try:
+        await run_audio_job(job)
+    except Exception as e:
+        # Job stays "running" and is reclaimed once stale
+        logger.error("Audio job %s crashed: %s: %s", job.id, type(e).__name__, e)
+
+
+async def run_worker(concurrency: int) -> None:
+    stopping = asyncio.Event()
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        try:
+            loop.add_signal_handler(sig, stopping.set)
+        except NotImplementedError:  # Windows
+            pass
+
+    running: set[asyncio.Task] = set()
+    logger.info("Audio worker started (concurrency=%d)", concurrency)
+
+    while not stopping.is_set():
+        if len(running) >= concurrency:
+            await asyncio.wait(running, return_when=asyncio.FIRST_COMPLETED)
+            continue
+
+        try:
+            job = await claim_audio_job()
+        except Exception as e:
+            logger.warning("Claiming audio job failed: %s: %s", type(e).__name__, e)
+            job = None
+
+        if job is None:
+            # Queue empty (or DB unavailable): wait, but wake up on shutdown
+            try:
+                await asyncio.wait_for(stopping.wait(), settings.AUDIO_WORKER_POLL_SECONDS)
+            except asyncio.TimeoutError:
+                pass
+            continue
+
+        task = asyncio.create_task(_run_job(job))
+        running.add(task)
+        task.add_done_callback(running.discard)
+
+    # Let in-flight jobs finish; anything killed mid-way is reclaimed later
+    if running:
+        logger.info("Audio worker stopping, waiting for %d job(s)", len(running))
+        await asyncio.gather(*running, return_exceptions=True)
+
+    await close_http_client()
+    await dispose_engines()
+
+
+def main() -> None:
+    logging.basicConfig(level=settings.LOG_LEVEL, format="%(asctime)s %(levelname)s %(name)s: %(message)s")
+    asyncio.run(run_worker(settings.AUDIO_WORKER_CONCURRENCY))
+
+
+if __name__ == "__main__":
+    main()
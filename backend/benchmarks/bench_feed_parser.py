@@ -0,0 +1,119 @@
+# benchmarks/bench_feed_parser.py
+"""
+Microbenchmark: Google News RSS -> list[Article].
+
+Compares the old path (feedparser + datetime.strptime + validated Article)
+with app.services.feed_parser (fastfeedparser + cached RFC 822 parsing +
+unvalidated table-model Article) on a synthetic Google News feed.
+
+Run from backend/:
+
+    python -m benchmarks.bench_feed_parser --entries 100 --rounds 50
+"""
+from __future__ import annotations
+
+import argparse
+import os
+import random
+import time
+from datetime import datetime, timedelta, timezone
+from email.utils import format_datetime
+from html import escape
+
+# Settings are loaded on import of app.*; the parser doesn't use them
+for _var in ("JWT_SECRET_KEY", "DATABASE_URL", "GEMINI_API_KEY", "ELEVENLABS_API_KEY",
+             "GCS_BUCKET_NAME", "GCP_PROJECT_ID"):
+    os.environ.setdefault(_var, "bench")
+
+import feedparser  # noqa: E402
+
+from app.models.news_article import Article  # noqa: E402
+from app.services.feed_parser import parse_feed_date, parse_google_news_feed  # noqa: E402
+
+
+SOURCES = ["Punch Newspapers", "Premium Times", "Vanguard News", "BBC", "Reuters", "TheCable"]
+
+
+def make_feed(n_entries: int, seed: int = 7) -> bytes:
+    rng = random.Random(seed)
+    now = datetime(2026, 10, 17, 12, 0, tzinfo=timezone.utc)
+    items = []
+    for i in range(n_entries):
+        source = rng.choice(SOURCES)
+        title = f"Lagos story number {i} about traffic, markets and police - {source}"
+        link = f"https://news.google.com/rss/articles/CBMi{i:06d}?oc=5"
+        # Minute resolution, like real feeds: many entries share a timestamp
+        published = format_datetime(now - timedelta(minutes=rng.randint(0, 600)), usegmt=True)
+        desc = escape(f'<a href="{link}" target="_blank">{title}</a>&nbsp;&nbsp;<font color="#6f6f6f">{source}</font>')
+        items.append(
+            f"<item><title>{escape(title)}</title><link>{link}</link>"
+            f'<guid isPermaLink="false">CBMi{i:06d}</guid><pubDate>{published}</pubDate>'
+            f'<description>{desc}</description><source url="https://example.com">{source}</source></item>'
+        )
+    return (
+        '<?xml version="1.0" encoding="UTF-8"?><rss version="2.0"><channel>'
+        "<title>\"Lagos\" - Google News</title><link>https://news.google.com</link>"
+        + "".join(items)
+        + "</channel></rss>"
+    ).encode()
+
+
+def old_path(xml: bytes) -> list[Article]:
+    """The pre-feed_parser code path from news_service."""
+    articles = []
+    for entry in feedparser.parse(xml).get("entries", []):
+        published_at = datetime.now(timezone.utc)
+        published_raw = getattr(entry, "published", None)
+        if published_raw:
+            try:
+                published_at = datetime.strptime(
+                    published_raw, "%a, %d %b %Y %H:%M:%S %Z"
+                ).replace(tzinfo=timezone.utc)
+            except Exception:
+                pass
+        source = getattr(entry, "source", None)
+        source_title = source.get("title", "Google News") if isinstance(source, dict) else "Google News"
+        articles.append(Article(
+            title=entry.title,
+            url=entry.link,
+            source=source_title,
+            published_at=published_at,
+            snippet=getattr(entry, "summary", "") or "",
+        ))
+    return articles
+
+
+def bench(label: str, fn, xml: bytes, rounds: int) -> float:
+    fn(xml)  # warm-up
+    start = time.perf_counter()
+    for _ in range(rounds):
+        fn(xml)
+    elapsed = time.perf_counter() - start
+    per_round_ms = elapsed / rounds * 1000
+    print(f"{label:<28} {per_round_ms:8.2f} ms/feed")
+    return per_round_ms
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--entries", type=int, default=100, help="entries per feed (Google News returns up to 100)")
+    parser.add_argument("--rounds", type=int, default=50)
+    args = parser.parse_args()
+
+    xml = make_feed(args.entries)
+
+    old = old_path(xml)
+    new = parse_google_news_feed(xml)
+    assert len(old) == len(new), (len(old), len(new))
+    assert [a.published_at for a in old] == [a.published_at for a in new]
+    assert [a.source for a in old] == [a.source for a in new]
+
+    print(f"{args.entries} entries/feed, {args.rounds} rounds")
+    old_ms = bench("feedparser + strptime", old_path, xml, args.rounds)
+    parse_feed_date.cache_clear()
+    new_ms = bench("fastfeedparser fast path", parse_google_news_feed, xml, args.rounds)
+    print(f"speedup: {old_ms / new_ms:.1f}x  ({args.entries * 1000 / new_ms:,.0f} entries/s)")
+
+
+if __name__ == "__main__":
+    main()
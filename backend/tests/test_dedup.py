@@ -0,0 +1,87 @@
+from datetime import datetime, timedelta, timezone
+
+from app.models.news_article import Article
+from app.services.dedup import article_words, collapse_near_duplicates
+
+
+NOW = datetime(2026, 10, 17, 12, 0, tzinfo=timezone.utc)
+
+
+def make_article(title, source, snippet, hours_ago=0, url=None):
+    return Article(
+        title=f"{title} - {source}",
+        url=url or f"https://{source.lower().replace(' ', '')}.example/{'-'.join(title.lower().split())}",
+        source=source,
+        published_at=NOW - timedelta(hours=hours_ago),
+        snippet=snippet,
+    )
+
+
+WIRE_SNIPPET = (
+    "The central bank raised its benchmark interest rate by a quarter point "
+    "on Thursday, citing persistent inflation in housing and services."
+)
+
+
+def test_article_words_drops_publisher_suffix_markup_and_source():
+    article = make_article(
+        "Central bank raises rates", "Daily Planet",
+        "<b>Daily Planet</b> reports the central bank &amp; rates",
+    )
+    words = article_words(article)
+
+    assert words[:4] == ["central", "bank", "raises", "rates"]
+    assert "daily" not in words and "planet" not in words
+    assert "b" not in words and "amp" not in words
+
+
+def test_syndicated_copies_collapse_to_freshest():
+    articles = [
+        make_article("Central bank raises interest rate by quarter point", "Wire One", WIRE_SNIPPET, hours_ago=3),
+        make_article("Central bank raises interest rate a quarter point", "Wire Two", WIRE_SNIPPET, hours_ago=1),
+        make_article("Central bank raises its interest rate by quarter point", "Wire Three", WIRE_SNIPPET, hours_ago=2),
+    ]
+
+    kept = collapse_near_duplicates(articles)
+
+    assert kept == [articles[1]]
+
+
+def test_distinct_stories_are_kept_in_order():
+    articles = [
+        make_article("Storm closes coastal highways", "Paper A",
+                     "Flooding shut roads along the coast as the storm moved inland."),
+        make_article("Local team wins championship", "Paper B",
+                     "Fans celebrated downtown after the final whistle."),
+        make_article("City council approves new budget", "Paper C",
+                     "The spending plan adds money for transit and parks."),
+    ]
+
+    assert collapse_near_duplicates(articles) == articles
+
+
+def test_threshold_above_one_keeps_everything():
+    articles = [
+        make_article("Central bank raises interest rate", "Wire One", WIRE_SNIPPET, hours_ago=1),
+        make_article("Central bank raises interest rate", "Wire Two", WIRE_SNIPPET, hours_ago=2),
+    ]
+
+    assert collapse_near_duplicates(articles, threshold=1.01) == articles
+    assert len(collapse_near_duplicates(articles, threshold=0.5)) == 1
+
+
+def test_tie_on_published_at_breaks_by_url():
+    a = make_article("Central bank raises interest rate", "Wire One", WIRE_SNIPPET, url="https://a.example/1")
+    b = make_article("Central bank raises interest rate", "Wire Two", WIRE_SNIPPET, url="https://b.example/1")
+
+    assert collapse_near_duplicates([a, b]) == [b]
+    assert collapse_near_duplicates([b, a]) == [b]
+
+
+def test_fewer_than_two_articles_returned_as_copy():
+    single = [make_article("Anything", "Somewhere", "text")]
+
+    result = collapse_near_duplicates(single)
+
+    assert result == single and result is not single
+    assert collapse_near_duplicates([]) == []
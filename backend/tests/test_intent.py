@@ -0,0 +1,152 @@
+import asyncio
+from collections import Counter
+
+import pytest
+
+from app.core.cache import TTLCache
+from app.core.config import settings
+from app.schemas.intent import Intent
+from app.services import intent_creator
+from app.services.intent_creator import create_intent_from_query, normalize_query
+from app.services.intent_parser import parse_intent_locally
+
+
+def run(coro):
+    return asyncio.run(coro)
+
+
+THRESHOLD = settings.INTENT_FAST_PATH_MIN_CONFIDENCE
+
+
+# --- parse_intent_locally: high-confidence parses ---
+
+def test_city_and_focus_is_confident():
+    parse = parse_intent_locally("lagos crime")
+    assert parse is not None
+    assert parse.confidence >= THRESHOLD
+    intent = parse.intent
+    assert (intent.city, intent.country, intent.country_code) == ("Lagos", "Nigeria", "NG")
+    assert intent.focus == "crime"
+    assert intent.timeframe == "1m"
+    assert intent.raw_query == "lagos crime"
+
+
+@pytest.mark.parametrize("query, timeframe", [
+    ("Weather in Berlin this week", "7d"),
+    ("crime in Lagos today", "1d"),
+    ("Berlin weather this month", "1m"),
+])
+def test_timeframe_keywords(query, timeframe):
+    parse = parse_intent_locally(query)
+    assert parse is not None
+    assert parse.confidence >= THRESHOLD
+    assert parse.intent.timeframe == timeframe
+
+
+def test_multi_word_city_matches_whole_name():
+    parse = parse_intent_locally("crime in port harcourt today")
+    assert parse is not None
+    assert parse.intent.city == "Port Harcourt"
+    assert parse.confidence >= THRESHOLD
+
+
+def test_city_alias_resolves_to_canonical_name():
+    parse = parse_intent_locally("NYC sports")
+    assert parse is not None
+    assert (parse.intent.city, parse.intent.country_code) == ("New York", "US")
+    assert parse.intent.topic == "sports"
+
+
+def test_country_alias_without_city():
+    parse = parse_intent_locally("news from the UK")
+    assert parse is not None
+    assert parse.intent.city is None
+    assert (parse.intent.country, parse.intent.country_code) == ("United Kingdom", "GB")
+    assert parse.intent.focus == "general"
+
+
+# --- parse_intent_locally: no parse / low confidence ---
+
+@pytest.mark.parametrize("query", ["crime", "what is going on", ""])
+def test_no_place_is_not_parsed(query):
+    assert parse_intent_locally(query) is None
+
+
+def test_two_places_are_not_parsed():
+    assert parse_intent_locally("lagos vs abuja") is None
+
+
+@pytest.mark.parametrize("query", [
+    "lagos crime and sports",   # conflicting foci
+    "lagos crime blah zork",    # unknown words
+    "Kenya",                    # no focus word at all
+])
+def test_ambiguous_queries_fall_below_threshold(query):
+    parse = parse_intent_locally(query)
+    assert parse is not None
+    assert 0.0 <= parse.confidence < THRESHOLD
+
+
+# --- normalize_query ---
+
+@pytest.mark.parametrize("variant", [
+    "lagos crime",
+    "Lagos Crime",
+    "  lagos   crime  ",
+    "Lagos, crime?!",
+    "What's the news in Lagos crime",
+])
+def test_normalize_query_is_stable_across_variants(variant):
+    assert normalize_query(variant) == "lagos crime"
+
+
+def test_normalize_query_keeps_word_order():
+    assert normalize_query("crime lagos") != normalize_query("lagos crime")
+
+
+def test_normalize_query_of_only_filler_words_is_not_empty():
+    key = normalize_query("What's happening?")
+    assert key
+    assert key == normalize_query("whats   HAPPENING")
+
+
+# --- create_intent_from_query ---
+
+@pytest.fixture
+def llm_calls(monkeypatch):
+    """Fresh cache/counters and a fake LLM that records the queries it sees."""
+    calls = []
+
+    async def fake_llm(raw_query):
+        calls.append(raw_query)
+        return Intent(raw_query=raw_query, city="Lagos", country="Nigeria",
+                      country_code="NG", focus="general",
+                      intent_label="local_news_overview", topic="general")
+
+    monkeypatch.setattr(intent_creator, "_intent_cache", TTLCache(maxsize=16, ttl=60))
+    monkeypatch.setattr(intent_creator, "_resolution_counts", Counter())
+    monkeypatch.setattr(intent_creator, "_create_intent_with_llm", fake_llm)
+    return calls
+
+
+def test_confident_query_skips_the_llm(llm_calls):
+    intent = run(create_intent_from_query("lagos crime"))
+    assert intent.focus == "crime"
+    assert llm_calls == []
+    assert intent_creator._resolution_counts["fast_path"] == 1
+
+
+def test_ambiguous_query_falls_through_to_the_llm(llm_calls):
+    run(create_intent_from_query("lagos crime blah zork"))
+    assert llm_calls == ["lagos crime blah zork"]
+    assert intent_creator._resolution_counts["llm"] == 1
+
+
+def test_query_variants_share_one_cached_llm_result(llm_calls):
+    first = run(create_intent_from_query("Lagos crime blah zork?"))
+    second = run(create_intent_from_query("  lagos CRIME blah  zork "))
+    assert len(llm_calls) == 1
+    assert intent_creator._resolution_counts["cache"] == 1
+    # Each caller gets its own copy carrying its own raw query
+    assert second.raw_query == "  lagos CRIME blah  zork "
+    assert first is not second
@@ -0,0 +1,100 @@
+import pytest
+
+from app.services.mp3 import Mp3FrameFilter, frame_length
+
+
+# MPEG1 Layer III, 128 kbps, 44.1 kHz, no padding / padding
+HEADER = b"\xff\xfb\x90\x00"
+HEADER_PADDED = b"\xff\xfb\x92\x00"
+
+
+def frame(fill: int, header: bytes = HEADER, body: bytes = b"") -> bytes:
+    length = frame_length(header)
+    return header + body + bytes([fill]) * (length - 4 - len(body))
+
+
+def id3v2_tag(payload_size: int, footer: bool = False) -> bytes:
+    syncsafe = bytes((payload_size >> shift) & 0x7F for shift in (21, 14, 7, 0))
+    flags = 0x10 if footer else 0x00
+    tag = b"ID3\x04\x00" + bytes([flags]) + syncsafe + b"\x00" * payload_size
+    return tag + (b"3DI" + b"\x00" * 7 if footer else b"")
+
+
+def feed_all(chunks) -> bytes:
+    frames = Mp3FrameFilter()
+    return b"".join(frames.feed(chunk) for chunk in chunks)
+
+
+def test_frame_length():
+    assert frame_length(HEADER) == 417
+    assert frame_length(HEADER_PADDED) == 418
+    # MPEG2, 64 kbps, 24 kHz
+    assert frame_length(b"\xff\xf3\x84\x00") == 192
+
+
+@pytest.mark.parametrize("header", [
+    b"\xff\xfd\x90\x00",  # Layer II
+    b"\xff\xeb\x90\x00",  # reserved version
+    b"\xff\xfb\xf0\x00",  # bad bitrate index
+    b"\xff\xfb\x9c\x00",  # reserved sample rate
+    b"\x00\xfb\x90\x00",  # no sync
+    b"\xff\xfb",          # too short
+])
+def test_frame_length_rejects_invalid_headers(header):
+    assert frame_length(header) is None
+
+
+def test_whole_frames_pass_through():
+    audio = frame(1) + frame(2, HEADER_PADDED) + frame(3)
+
+    assert feed_all([audio]) == audio
+
+
+def test_header_split_across_feeds():
+    first, second = frame(1), frame(2)
+    frames = Mp3FrameFilter()
+
+    assert frames.feed(first + second[:2]) == first
+    assert frames.feed(second[2:]) == second
+
+
+def test_byte_by_byte_feeding():
+    audio = frame(1) + frame(2)
+
+    assert feed_all(audio[i:i + 1] for i in range(len(audio))) == audio
+
+
+def test_id3v2_tag_is_stripped_even_when_split():
+    tag = id3v2_tag(300)
+    audio = frame(1) + frame(2)
+    data = tag + audio
+
+    assert feed_all([data]) == audio
+    # Split inside the 10-byte tag header and inside the tag body
+    assert feed_all([data[:5], data[5:150], data[150:]]) == audio
+
+
+def test_id3v2_tag_with_footer_is_stripped():
+    audio = frame(1)
+
+    assert feed_all([id3v2_tag(20, footer=True) + audio]) == audio
+
+
+@pytest.mark.parametrize("tag", [b"Xing", b"Info", b"VBRI"])
+def test_leading_vbr_header_frame_is_dropped(tag):
+    header_frame = frame(0, body=b"\x00" * 32 + tag)
+    audio = frame(1) + frame(2)
+
+    assert feed_all([header_frame + audio]) == audio
+
+
+def test_vbr_tag_bytes_in_later_frames_are_kept():
+    audio = frame(1) + frame(0, body=b"\x00" * 32 + b"Xing")
+
+    assert feed_all([audio]) == audio
+
+
+def test_resyncs_after_garbage_and_drops_incomplete_tail():
+    first, second = frame(1), frame(2)
+
+    assert feed_all([b"\x12\x34\xff\x00" + first + b"junk" + second + HEADER + b"\x00" * 10]) == first + second
@@ -0,0 +1,253 @@
+import asyncio
+import copy
+import uuid
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.sql.dml import Insert
+
+from app.core.config import settings
+from app.services import quota_service
+from app.services.quota_service import (
+    AUDIO_BRIEFINGS, Quota, QuotaExceeded, QuotaReservation,
+    consume_quota, quotas_for, release_quota, reserve_quota,
+)
+
+
+def run(coro):
+    return asyncio.run(coro)
+
+
+def _now():
+    return datetime.now(timezone.utc)
+
+
+class FakeStore:
+    """UserUsage rows by (user_id, metric, period), with commit/rollback."""
+
+    def __init__(self):
+        self.rows = {}
+        self.statements = []
+
+    def session(self):
+        return FakeSession(self)
+
+
+class FakeSession:
+    def __init__(self, store):
+        self.store = store
+        self.rows = copy.deepcopy(store.rows)
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+    async def execute(self, stmt):
+        self.store.statements.append(stmt)
+        if isinstance(stmt, Insert):
+            params = stmt.compile(dialect=postgresql.dialect()).params
+            key = (params["user_id"], params["metric"], params["period"])
+            # ON CONFLICT DO NOTHING
+            self.rows.setdefault(key, {"used": params["used"], "reserved": 0})
+
+    async def commit(self):
+        self.store.rows = copy.deepcopy(self.rows)
+
+    async def rollback(self):
+        self.rows = copy.deepcopy(self.store.rows)
+
+
+@pytest.fixture
+def store(monkeypatch):
+    store = FakeStore()
+    history = {"calls": 0, "used": 0}
+
+    async def take_credit(db, user_id, quota, period_key, now):
+        row = db.rows.get((user_id, quota.metric, period_key))
+        if row is None or row["used"] + row["reserved"] >= quota.limit:
+            return False
+        row["reserved"] += 1
+        return True
+
+    async def counter_exists(db, user_id, metric, period_key):
+        return (user_id, metric, period_key) in db.rows
+
+    async def count_history(db, user_id, since):
+        history["calls"] += 1
+        return history["used"]
+
+    monkeypatch.setattr(quota_service, "async_session_factory", store.session)
+    monkeypatch.setattr(quota_service, "_take_credit", take_credit)
+    monkeypatch.setattr(quota_service, "_counter_exists", counter_exists)
+    monkeypatch.setitem(quota_service._HISTORY_COUNTERS, AUDIO_BRIEFINGS, count_history)
+    monkeypatch.setattr(settings, "FREE_AUDIO_BRIEFING_LIMIT", 3)
+    monkeypatch.setattr(settings, "AUDIO_BRIEFINGS_PER_DAY", None)
+    monkeypatch.setattr(settings, "AUDIO_BRIEFINGS_PER_MONTH", None)
+    store.history = history
+    return store
+
+
+def test_quotas_for(monkeypatch):
+    monkeypatch.setattr(settings, "FREE_AUDIO_BRIEFING_LIMIT", 3)
+    monkeypatch.setattr(settings, "AUDIO_BRIEFINGS_PER_DAY", None)
+    monkeypatch.setattr(settings, "AUDIO_BRIEFINGS_PER_MONTH", None)
+    assert quotas_for(AUDIO_BRIEFINGS) == [Quota(AUDIO_BRIEFINGS, 3)]
+
+    monkeypatch.setattr(settings, "AUDIO_BRIEFINGS_PER_DAY", 5)
+    monkeypatch.setattr(settings, "AUDIO_BRIEFINGS_PER_MONTH", 50)
+    assert [q.period for q in quotas_for(AUDIO_BRIEFINGS)] == ["all", "month", "day"]
+
+    assert quotas_for("something_else") == []
+
+
+def test_period_keys_and_starts():
+    now = datetime(2026, 10, 17, 15, 30, tzinfo=timezone.utc)
+
+    assert quota_service._period_key("all", now) == "all"
+    assert quota_service._period_key("month", now) == "2026-10"
+    assert quota_service._period_key("day", now) == "2026-10-17"
+    assert quota_service._period_start("all", now) is None
+    assert quota_service._period_start("month", now) == datetime(2026, 10, 1, tzinfo=timezone.utc)
+    assert quota_service._period_start("day", now) == datetime(2026, 10, 17, tzinfo=timezone.utc)
+
+
+def test_reserve_seeds_counter_from_history_once(store):
+    user_id = uuid.uuid4()
+    store.history["used"] = 1
+
+    first = run(reserve_quota(user_id, AUDIO_BRIEFINGS))
+    second = run(reserve_quota(user_id, AUDIO_BRIEFINGS))
+
+    assert first.reserved_at is not None and first.is_live()
+    assert first.counters == [(AUDIO_BRIEFINGS, "all")]
+    assert second.counters == [(AUDIO_BRIEFINGS, "all")]
+    assert store.history["calls"] == 1
+    assert store.rows[(user_id, AUDIO_BRIEFINGS, "all")] == {"used": 1, "reserved": 2}
+
+
+def test_reserve_counts_live_reservations_against_the_limit(store):
+    user_id = uuid.uuid4()
+
+    for _ in range(3):
+        run(reserve_quota(user_id, AUDIO_BRIEFINGS))
+
+    with pytest.raises(QuotaExceeded) as exc:
+        run(reserve_quota(user_id, AUDIO_BRIEFINGS))
+    assert exc.value.quota == Quota(AUDIO_BRIEFINGS, 3)
+
+
+def test_exceeded_quota_holds_nothing(store, monkeypatch):
+    monkeypatch.setattr(settings, "AUDIO_BRIEFINGS_PER_DAY", 1)
+    user_id = uuid.uuid4()
+    run(reserve_quota(user_id, AUDIO_BRIEFINGS))
+    lifetime = (user_id, AUDIO_BRIEFINGS, "all")
+    assert store.rows[lifetime]["reserved"] == 1
+
+    with pytest.raises(QuotaExceeded) as exc:
+        run(reserve_quota(user_id, AUDIO_BRIEFINGS))
+
+    assert exc.value.quota.period == "day"
+    # The lifetime credit taken before the day quota failed was rolled back
+    assert store.rows[lifetime]["reserved"] == 1
+
+
+def test_consume_settles_and_release_is_then_a_no_op(store):
+    user_id = uuid.uuid4()
+    reservation = QuotaReservation(user_id=user_id, counters=[(AUDIO_BRIEFINGS, "all")], reserved_at=_now())
+    db = store.session()
+
+    run(consume_quota(db, reservation))
+
+    assert reservation.settled
+    sql = str(store.statements[-1].compile(dialect=postgresql.dialect()))
+    assert "used=(user_usage.used +" in sql
+    assert "reserved=greatest(" in sql
+
+    count = len(store.statements)
+    run(release_quota(reservation))
+    assert len(store.statements) == count
+
+
+def test_release_gives_back_credits_once(store):
+    user_id = uuid.uuid4()
+    reservation = QuotaReservation(
+        user_id=user_id,
+        counters=[(AUDIO_BRIEFINGS, "all"), (AUDIO_BRIEFINGS, "2026-10")],
+        reserved_at=_now(),
+    )
+
+    run(release_quota(reservation))
+    run(release_quota(reservation))
+
+    assert reservation.settled
+    assert len(store.statements) == 2
+    assert all("reserved=greatest(" in str(s.compile(dialect=postgresql.dialect())) for s in store.statements)
+
+
+def _expired_reservation():
+    age = timedelta(seconds=settings.QUOTA_RESERVATION_TTL_SECONDS + 1)
+    return QuotaReservation(
+        user_id=uuid.uuid4(),
+        counters=[(AUDIO_BRIEFINGS, "all")],
+        reserved_at=_now() - age,
+    )
+
+
+def test_expired_reservation_consumes_without_touching_reserved(store):
+    # Its hold may have been dropped and the slot taken by another
+    # request; decrementing would cancel that request's hold
+    reservation = _expired_reservation()
+    assert not reservation.is_live()
+
+    run(consume_quota(store.session(), reservation))
+
+    sql = str(store.statements[-1].compile(dialect=postgresql.dialect()))
+    assert "used=(user_usage.used +" in sql
+    assert "reserved=" not in sql
+    assert reservation.settled
+
+
+def test_expired_reservation_release_gives_nothing_back(store):
+    reservation = _expired_reservation()
+
+    run(release_quota(reservation))
+
+    assert reservation.settled
+    assert store.statements == []
+
+
+def test_release_failure_is_swallowed(monkeypatch):
+    def broken_session():
+        raise ConnectionError("database is down")
+
+    monkeypatch.setattr(quota_service, "async_session_factory", broken_session)
+    reservation = QuotaReservation(user_id=uuid.uuid4(), counters=[(AUDIO_BRIEFINGS, "all")], reserved_at=_now())
+
+    run(release_quota(reservation))
+
+    assert reservation.settled
+
+
+def test_take_credit_is_a_conditional_update():
+    class RecordingSession:
+        async def execute(self, stmt):
+            self.stmt = stmt
+
+            class Result:
+                def first(self):
+                    return None
+            return Result()
+
+    db = RecordingSession()
+    now = datetime(2026, 10, 17, tzinfo=timezone.utc)
+
+    taken = run(quota_service._take_credit(db, uuid.uuid4(), Quota(AUDIO_BRIEFINGS, 3), "all", now))
+
+    assert taken is False
+    sql = str(db.stmt.compile(dialect=postgresql.dialect()))
+    # Only counts reservations younger than the TTL, and only succeeds under the limit
+    assert "user_usage.used + CASE WHEN (user_usage.reserved_at >" in sql
+    assert "RETURNING user_usage.used" in sql
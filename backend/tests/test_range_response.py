@@ -0,0 +1,38 @@
+import pytest
+
+from app.core.range_response import parse_range
+
+
+@pytest.mark.parametrize("header, expected", [
+    ("bytes=0-99", (0, 99)),
+    ("bytes=100-", (100, 999)),
+    ("bytes=900-5000", (900, 999)),
+    ("bytes=-200", (800, 999)),
+    ("bytes=-5000", (0, 999)),
+    (" bytes=10-20 ", (10, 20)),
+])
+def test_single_range(header, expected):
+    assert parse_range(header, 1000) == expected
+
+
+@pytest.mark.parametrize("header", [
+    None,
+    "",
+    "bytes=0-10,20-30",
+    "items=0-10",
+    "bytes=abc-",
+    "bytes=-",
+])
+def test_whole_file(header):
+    assert parse_range(header, 1000) is None
+
+
+@pytest.mark.parametrize("header", ["bytes=1000-", "bytes=50-10", "bytes=5000-6000"])
+def test_unsatisfiable(header):
+    with pytest.raises(ValueError):
+        parse_range(header, 1000)
+
+
+def test_suffix_range_of_empty_file_is_unsatisfiable():
+    with pytest.raises(ValueError):
+        parse_range("bytes=-10", 0)
@@ -0,0 +1,99 @@
+from datetime import datetime, timedelta, timezone
+
+import numpy as np
+import pytest
+
+from app.core.config import settings
+from app.models.news_article import Article
+from app.schemas.intent import Intent
+from app.services.ranking import bm25_scores, intent_query_terms, rank_articles
+
+
+NOW = datetime(2026, 10, 17, 12, 0, tzinfo=timezone.utc)
+
+
+def make_intent(**fields):
+    values = dict(focus="general", raw_query="news", intent_label="other")
+    values.update(fields)
+    return Intent(**values)
+
+
+def make_article(slug, title, snippet, hours_ago=0):
+    return Article(
+        title=title,
+        url=f"https://news.example/{slug}",
+        source="Example News",
+        published_at=NOW - timedelta(hours=hours_ago),
+        snippet=snippet,
+    )
+
+
+def test_intent_query_terms_weights_and_skips_or():
+    intent = make_intent(topic="Transit Strike", tags=["transit", "unions"], city="Lisbon", focus="economy")
+
+    terms = intent_query_terms(intent)
+
+    # A word in both topic and tags keeps the higher (topic) weight
+    assert terms["transit"] == 1.5
+    assert terms["strike"] == 1.5
+    assert terms["unions"] == 1.0
+    assert terms["lisbon"] == 1.0
+    assert terms["inflation"] == 0.5
+    assert "or" not in terms
+
+
+def test_general_topic_adds_no_terms():
+    assert intent_query_terms(make_intent(topic="general")) == {}
+
+
+def test_bm25_prefers_matching_and_rarer_terms():
+    docs = [
+        ["storm", "storm", "coast"],
+        ["storm", "city"],
+        ["football", "match"],
+    ]
+
+    scores = bm25_scores(docs, {"storm": 1.0, "coast": 1.0})
+
+    assert scores[2] == 0.0
+    assert scores[0] > scores[1] > 0.0
+
+
+def test_bm25_term_weight_scales_score():
+    docs = [["storm"], ["coast"]]
+
+    scores = bm25_scores(docs, {"storm": 2.0, "coast": 1.0})
+
+    assert scores[0] == pytest.approx(2 * scores[1])
+
+
+def test_bm25_empty_inputs():
+    assert bm25_scores([], {"storm": 1.0}).shape == (0,)
+    assert np.array_equal(bm25_scores([["storm"]], {}), np.zeros(1))
+
+
+def test_relevant_article_outranks_fresher_unrelated_one():
+    intent = make_intent(topic="transit strike", city="Lisbon")
+    relevant = make_article("strike", "Lisbon transit strike halts metro", "Unions call a transit strike in Lisbon.", hours_ago=6)
+    unrelated = make_article("cats", "Cat show draws crowds", "Hundreds of cats on display.", hours_ago=0)
+
+    assert rank_articles([unrelated, relevant], intent, now=NOW) == [relevant, unrelated]
+
+
+def test_recency_breaks_equal_relevance(monkeypatch):
+    monkeypatch.setattr(settings, "RANKING_RECENCY_WEIGHT", 0.3)
+    intent = make_intent(topic="budget")
+    older = make_article("old", "Council budget vote", "The budget passed.", hours_ago=48)
+    newer = make_article("new", "Council budget vote", "The budget passed.", hours_ago=1)
+
+    assert rank_articles([older, newer], intent, now=NOW) == [newer, older]
+
+
+def test_ranking_is_deterministic_for_full_ties():
+    intent = make_intent()
+    a = make_article("a", "Same", "Same text.", hours_ago=2)
+    b = make_article("b", "Same", "Same text.", hours_ago=2)
+
+    assert rank_articles([b, a], intent, now=NOW) == [a, b]
+    assert rank_articles([a, b], intent, now=NOW) == [a, b]
+    assert rank_articles([], intent, now=NOW) == []
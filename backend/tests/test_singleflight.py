@@ -0,0 +1,117 @@
+import asyncio
+
+import pytest
+
+from app.core.singleflight import SingleFlight
+
+
+def run(coro):
+    return asyncio.run(coro)
+
+
+def test_concurrent_callers_share_one_execution():
+    async def main():
+        flight = SingleFlight()
+        calls = 0
+        release = asyncio.Event()
+
+        async def work():
+            nonlocal calls
+            calls += 1
+            await release.wait()
+            return "result"
+
+        callers = [asyncio.create_task(flight.do("key", work)) for _ in range(5)]
+        await asyncio.sleep(0)
+        assert len(flight) == 1
+        release.set()
+
+        results = await asyncio.gather(*callers)
+        return flight, calls, results
+
+    flight, calls, results = run(main())
+
+    assert calls == 1
+    assert results == ["result"] * 5
+    assert len(flight) == 0
+    assert flight.stats() == {"in_flight": 0, "executions": 1, "coalesced": 4, "coalesced_share": 0.8}
+
+
+def test_different_keys_run_separately():
+    async def main():
+        flight = SingleFlight()
+
+        async def work(value):
+            await asyncio.sleep(0)
+            return value
+
+        return await asyncio.gather(flight.do("a", lambda: work(1)), flight.do("b", lambda: work(2))), flight
+
+    results, flight = run(main())
+
+    assert results == [1, 2]
+    assert flight.executions == 2 and flight.coalesced == 0
+
+
+def test_nothing_is_kept_after_the_call_finishes():
+    async def main():
+        flight = SingleFlight()
+        calls = 0
+
+        async def work():
+            nonlocal calls
+            calls += 1
+            return calls
+
+        return await flight.do("key", work), await flight.do("key", work)
+
+    assert run(main()) == (1, 2)
+
+
+def test_error_reaches_every_waiting_caller():
+    async def main():
+        flight = SingleFlight()
+        release = asyncio.Event()
+
+        async def work():
+            await release.wait()
+            raise ValueError("boom")
+
+        callers = [asyncio.create_task(flight.do("key", work)) for _ in range(3)]
+        await asyncio.sleep(0)
+        release.set()
+        results = await asyncio.gather(*callers, return_exceptions=True)
+
+        # A failed call isn't remembered either: the next caller retries
+        retried = await flight.do("key", lambda: asyncio.sleep(0, result="ok"))
+        return results, retried, flight
+
+    results, retried, flight = run(main())
+
+    assert all(isinstance(r, ValueError) and str(r) == "boom" for r in results)
+    assert retried == "ok"
+    assert len(flight) == 0
+
+
+def test_cancelled_caller_does_not_cancel_the_work_for_others():
+    async def main():
+        flight = SingleFlight()
+        release = asyncio.Event()
+
+        async def work():
+            await release.wait()
+            return "done"
+
+        first = asyncio.create_task(flight.do("key", work))
+        second = asyncio.create_task(flight.do("key", work))
+        await asyncio.sleep(0)
+
+        first.cancel()
+        await asyncio.sleep(0)
+        release.set()
+
+        with pytest.raises(asyncio.CancelledError):
+            await first
+        return await second
+
+    assert run(main()) == "done"
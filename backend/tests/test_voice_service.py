@@ -0,0 +1,56 @@
+from app.services.voice_service import split_script
+
+
+def test_short_script_is_one_chunk_with_normalized_spaces():
+    assert split_script("  Good   morning.\n Here is   the news.  ", 100) == [
+        "Good morning. Here is the news."
+    ]
+
+
+def test_paragraphs_are_merged_up_to_the_limit():
+    script = "First paragraph.\n\nSecond paragraph.\n\n\nThird paragraph."
+
+    assert split_script(script, 40) == ["First paragraph.\n\nSecond paragraph.", "Third paragraph."]
+
+
+def test_long_paragraph_splits_at_sentence_ends():
+    script = "One two three. Four five six! Seven eight nine? Ten eleven."
+
+    chunks = split_script(script, 30)
+
+    assert chunks == ["One two three. Four five six!", "Seven eight nine? Ten eleven."]
+
+
+def test_script_without_sentence_breaks_splits_at_spaces():
+    words = [f"word{i}" for i in range(60)]
+    script = " ".join(words)
+    assert len(script) > 100
+
+    chunks = split_script(script, 100)
+
+    assert len(chunks) > 1
+    assert all(len(chunk) <= 100 for chunk in chunks)
+    assert " ".join(chunks).split() == words
+
+
+def test_word_longer_than_the_limit_is_cut():
+    script = "short " + "x" * 25 + " end"
+
+    chunks = split_script(script, 10)
+
+    assert all(len(chunk) <= 10 for chunk in chunks)
+    assert "".join(chunks).replace(" ", "") == script.replace(" ", "")
+
+
+def test_every_chunk_respects_the_limit_on_a_long_script():
+    paragraph = "The council met on Tuesday. " * 30
+    script = "\n\n".join([paragraph] * 4)
+
+    chunks = split_script(script, 200)
+
+    assert all(len(chunk) <= 200 for chunk in chunks)
+    assert " ".join(chunks).split() == script.split()
+
+
+def test_blank_script_has_no_chunks():
+    assert split_script("  \n\n  ", 100) == []
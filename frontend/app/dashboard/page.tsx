@@ -78,12 +78,19 @@ export default function DashboardPage() {
     enabled: !!user?.id,
   })
 
+  const { data: audioUsage } = useQuery({
+    queryKey: ['usage', user?.id],
+    queryFn: () => briefingsAPI.getAudioUsage(),
+    enabled: !!user?.id,
+  })
+
   const createMutation = useMutation({
     mutationFn: briefingsAPI.createBriefing,
     onSuccess: (newBriefing) => {
       setCreateError(null)
       addBriefing(newBriefing)
       queryClient.invalidateQueries({ queryKey: ['briefings'] })
+      queryClient.invalidateQueries({ queryKey: ['usage'] })
       setQuery('')
       router.push(`/player/${newBriefing.id}`)
     },
@@ -104,8 +111,11 @@ export default function DashboardPage() {
   }
 
   const selectedPersonaData = PERSONAS.find(p => p.id === selectedPersona) || PERSONAS[0]
-  // Only audio/both briefings count toward the free cap; summaries are always free
-  const audioUsedCount = briefings.filter(b => b.output_mode === 'audio' || b.output_mode === 'both').length
+  // Only audio/both briefings count toward the free cap; summaries are always free.
+  // The history list is paginated, so the count comes from the server's counter
+  const freeTier = audioUsage?.find(q => q.period === 'all')
+  const audioUsedCount = freeTier?.used
+    ?? briefings.filter(b => b.output_mode === 'audio' || b.output_mode === 'both').length
   const atAudioLimit = audioUsedCount >= FREE_AUDIO_LIMIT
   // Block the form when audio is requested and the cap is hit
   const atLimit = atAudioLimit && selectedOutputMode !== 'summary'
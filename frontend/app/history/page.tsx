@@ -27,6 +27,8 @@ export default function HistoryPage() {
   const { briefings, setBriefings } = useBriefingStore()
   const [searchQuery, setSearchQuery] = useState('')
   const [selectedPersona, setSelectedPersona] = useState<string | null>(null)
+  const [nextCursor, setNextCursor] = useState<string | null>(null)
+  const [isLoadingMore, setIsLoadingMore] = useState(false)
 
   useEffect(() => {
     initAuth()
@@ -36,20 +38,32 @@ export default function HistoryPage() {
     queryKey: ['briefings', user?.id],
     queryFn: async () => {
       if (!user?.id) return []
-      const data = await briefingsAPI.getBriefings(user.id)
-      console.log(data);
-      setBriefings(data)
-      return data
+      const data = await briefingsAPI.getBriefingsPage(user.id)
+      setBriefings(data.briefings)
+      setNextCursor(data.next_cursor)
+      return data.briefings
     },
     enabled: !!user?.id,
   })
 
+  const loadMore = async () => {
+    if (!user?.id || !nextCursor) return
+    setIsLoadingMore(true)
+    try {
+      const data = await briefingsAPI.getBriefingsPage(user.id, nextCursor)
+      setBriefings([...briefings, ...data.briefings])
+      setNextCursor(data.next_cursor)
+    } finally {
+      setIsLoadingMore(false)
+    }
+  }
+
   // Filter briefings
   const filteredBriefings = briefings.filter((briefing) => {
     const matchesSearch =
       searchQuery === '' ||
       briefing.query.toLowerCase().includes(searchQuery.toLowerCase()) ||
-      briefing.script.toLowerCase().includes(searchQuery.toLowerCase())
+      (briefing.preview ?? briefing.script ?? '').toLowerCase().includes(searchQuery.toLowerCase())
 
     const matchesPersona = !selectedPersona || briefing.persona === selectedPersona
 
@@ -193,6 +207,15 @@ export default function HistoryPage() {
               ))}
             </div>
           )}
+
+          {/* Older briefings are fetched a page at a time */}
+          {!isLoading && nextCursor && (
+            <div className="flex justify-center mt-6">
+              <Button variant="outline" onClick={loadMore} disabled={isLoadingMore}>
+                {isLoadingMore ? 'Loading...' : 'Load more'}
+              </Button>
+            </div>
+          )}
         </div>
       </main>
     </div>
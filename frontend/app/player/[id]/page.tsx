@@ -3,7 +3,7 @@
 import { useEffect, useState } from 'react'
 import { useRouter, useParams } from 'next/navigation'
 import { motion } from 'framer-motion'
-import { ArrowLeft, Share2, Download, SkipBack, SkipForward, Volume2, FileText, Layers, AlertCircle, RefreshCw } from 'lucide-react'
+import { ArrowLeft, Share2, Download, SkipBack, SkipForward, Volume2, FileText, Layers, AlertCircle, RefreshCw, Loader2 } from 'lucide-react'
 import { Button } from '@/components/ui/button'
 import { Card } from '@/components/ui/card'
 import { Sidebar } from '@/components/Sidebar'
@@ -43,13 +43,28 @@ export default function PlayerPage() {
     enabled: !!user?.id,
   })
 
+  // History pages don't carry scripts; load the full briefing for the transcript
+  const { data: fullBriefing, isLoading: isBriefingLoading } = useQuery({
+    queryKey: ['briefing', params.id],
+    queryFn: () => briefingsAPI.getBriefing(params.id as string),
+    enabled: !!user?.id && !!params.id,
+    // Poll while the audio job is queued or rendering
+    refetchInterval: (query) => {
+      const status = query.state.data?.audio_status
+      return status === 'queued' || status === 'running' ? 3000 : false
+    },
+  })
+
   useEffect(() => {
-    if (briefings.length > 0 && params.id) {
+    if (fullBriefing) {
+      setCurrentBriefing(fullBriefing)
+      setAudioError(false)
+    } else if (briefings.length > 0 && params.id) {
       const briefing = briefings.find((b) => b.id === params.id)
       setCurrentBriefing(briefing || null)
       setAudioError(false) // reset on every navigation
     }
-  }, [briefings, params.id])
+  }, [briefings, fullBriefing, params.id])
 
   const handleNext = () => {
     if (!currentBriefing) return
@@ -120,7 +135,7 @@ export default function PlayerPage() {
     )
   }
 
-  if (briefings.length > 0 && !currentBriefing) {
+  if (briefings.length > 0 && !currentBriefing && !isBriefingLoading) {
     return (
       <div className="flex h-screen">
         <Sidebar currentPage="dashboard" />
@@ -154,6 +169,9 @@ export default function PlayerPage() {
   const personaColor = getPersonaColor(currentBriefing.persona)
   const personaEmoji = getPersonaEmoji(currentBriefing.persona)
   const hasAudio = !!currentBriefing.audio_url
+  const audioPending = !hasAudio &&
+    (currentBriefing.audio_status === 'queued' || currentBriefing.audio_status === 'running')
+  const audioFailed = !hasAudio && currentBriefing.audio_status === 'failed'
   const hasSummary = !!currentBriefing.script
   // Default to "both" for old records that predate output_mode
   const outputMode = currentBriefing.output_mode || 'both'
@@ -286,6 +304,18 @@ export default function PlayerPage() {
                       )}
                     </div>
                   </div>
+                ) : audioPending ? (
+                  <div className="flex items-center gap-3 p-4 rounded-xl bg-muted/50 text-muted-foreground text-sm">
+                    <Loader2 className="h-5 w-5 flex-shrink-0 animate-spin" />
+                    <span>Generating audio — it will appear here in a moment.</span>
+                  </div>
+                ) : audioFailed ? (
+                  <div className="flex items-start gap-3 p-4 rounded-xl border border-destructive/30 bg-destructive/5 text-sm">
+                    <AlertCircle className="h-5 w-5 text-destructive flex-shrink-0 mt-0.5" />
+                    <span className="text-muted-foreground leading-snug">
+                      {currentBriefing.audio_error ?? 'Audio generation failed.'}
+                    </span>
+                  </div>
                 ) : (
                   /* Summary-only: explain there's no audio */
                   <div className="flex items-center gap-3 p-4 rounded-xl bg-muted/50 text-muted-foreground text-sm">
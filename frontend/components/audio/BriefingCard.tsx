@@ -58,7 +58,7 @@ export function BriefingCard({ briefing, index = 0 }: BriefingCardProps) {
 
             {/* Script preview */}
             <p className="text-sm text-muted-foreground mb-4 line-clamp-2">
-              {truncate(briefing.script, 120)}
+              {truncate(briefing.preview ?? briefing.script ?? '', 120)}
             </p>
 
             {/* Open button — label and icon adapt to output mode */}
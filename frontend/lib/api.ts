@@ -97,7 +97,10 @@ export interface Briefing {
   search_history_id: string
   city: string | null
   country: string
-  script: string
+  // Full text; only on single-briefing responses (not history pages)
+  script?: string
+  // Start of the script, on history pages
+  preview?: string
   query: string
   persona: string
   user_id: string
@@ -106,25 +109,59 @@ export interface Briefing {
   audio_url: string | null
   audio_filename: string | null
   created_at: string
+  // Single-briefing responses: where audio rendering stands
+  audio_status?: 'queued' | 'running' | 'streaming' | 'done' | 'failed' | null
+  audio_error?: string | null
 }
 
 export interface BriefingsResponse {
   briefings: Briefing[]
+  // Pass back to get the next (older) page; null on the last page
+  next_cursor: string | null
+}
+
+// One quota on audio briefings ("all" is the lifetime free tier)
+export interface AudioQuotaUsage {
+  period: 'all' | 'month' | 'day'
+  limit: number
+  used: number
 }
 
 export interface CreateBriefingRequest {
   query: string
   persona: string
   output_mode: OutputMode
+  // Opt in to audio_url playing while the voice is still being generated
+  // (served by the API process that created it). By default audio is
+  // rendered by the job queue and the player polls until it is ready.
+  stream_audio?: boolean
 }
 
 export const briefingsAPI = {
+  // Newest briefings first, one page at a time
+  async getBriefingsPage(userId: string, cursor?: string | null): Promise<BriefingsResponse> {
+    const { data } = await api.get<BriefingsResponse>(`/users/${userId}/briefings`, {
+      params: cursor ? { cursor } : undefined,
+    })
+    return data
+  },
+
   async getBriefings(userId: string): Promise<Briefing[]> {
-    const { data } = await api.get<BriefingsResponse>(`/users/${userId}/briefings`)
-    console.log(data)
+    const data = await this.getBriefingsPage(userId)
     return data.briefings
   },
 
+  async getAudioUsage(): Promise<AudioQuotaUsage[]> {
+    const { data } = await api.get<{ audio_briefings: AudioQuotaUsage[] }>('/users/me/usage')
+    return data.audio_briefings
+  },
+
+  // Full briefing including its script and a fresh audio URL
+  async getBriefing(briefingId: string): Promise<Briefing> {
+    const { data } = await api.get<Briefing>(`/briefings/${briefingId}`)
+    return data
+  },
+
   async createBriefing(request: CreateBriefingRequest): Promise<Briefing> {
     const { data } = await api.post('/breakdown/narration', request)
     return data